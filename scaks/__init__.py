@@ -1,5 +1,6 @@
 import time
 import sys
+from contextlib import contextmanager
 
 from .functions import *
 from .errors.error import *
@@ -29,10 +30,12 @@ class ModelShell(object):
     def __init__(self, owner):
         self._owner = owner
         self._archived_data_dict = {}
+        self._archive_suppressed = False
 
     def archive_data(self, data_name, data):
         """
-        Update data dict and dump it to data file.
+        Update data dict and the archive of model, the archive is
+        written to data file in batches.
 
         :param data_name: key in data dict
         :type data_name: str
@@ -40,13 +43,26 @@ class ModelShell(object):
         :param data: value in data dict
         :type data: any
         """
-        # Update data dict.
+        # Intermediate data is not archived.
+        if self._archive_suppressed:
+            return
+
+        # Update data dict and buffer it in model's archive.
         if data_name in self._owner.archived_variables:
             self._archived_data_dict[data_name] = data
-            # Dump data dict to data file
-            if self._archived_data_dict:
-                with open(self._owner.data_file, 'wb') as f:
-                    pickle.dump(self._archived_data_dict, f)
+            self._owner.archive.update(data_name, data)
+
+    @contextmanager
+    def suppress_archive(self):
+        """
+        Context manager in which data would not be archived,
+        used for intermediate calculations.
+        """
+        suppressed, self._archive_suppressed = self._archive_suppressed, True
+        try:
+            yield
+        finally:
+            self._archive_suppressed = suppressed
 
     @staticmethod
     def write2file(filename, line):
@@ -3,6 +3,7 @@
 """
 Module for wrap functions for compatibility of Python2 and Python3
 """
+import os
 import sys
 
 # Check version for current python interpreter.
@@ -45,3 +46,62 @@ def merge_two_dicts(dict1, dict2):
 
     return merged
 
+
+
+
+def move_to_end(ordered_dict, key):
+    """
+    Compatible function to move an existing key to the end of an OrderedDict.
+    """
+    if PY2:
+        ordered_dict[key] = ordered_dict.pop(key)
+    else:
+        ordered_dict.move_to_end(key)
+
+
+def replace(src, dst):
+    """
+    Compatible function to rename a file, the destination is overwritten atomically.
+    """
+    if PY2:
+        # NOTE: os.rename overwrites the destination atomically on POSIX.
+        os.rename(src, dst)
+    else:
+        os.replace(src, dst)
+
+
+def makedirs(dirname):
+    """
+    Compatible function to create a directory recursively, no error if it exists.
+    """
+    try:
+        os.makedirs(dirname)
+    except OSError:
+        if not os.path.isdir(dirname):
+            raise
+
+
+def cpu_count():
+    """
+    Compatible function to get the number of CPUs, 1 if it is undetermined.
+    """
+    import multiprocessing
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError:
+        return 1
+
+
+def fork_context():
+    """
+    Compatible function to get the multiprocessing context forking worker
+    processes, None if fork is not supported on current platform.
+    """
+    import multiprocessing
+    if PY2:
+        # Processes are always forked on POSIX in Python 2.
+        return multiprocessing if hasattr(os, "fork") else None
+    elif "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    else:
+        return None
@@ -4,7 +4,10 @@ Definitions of attribute descriptors.
 
 import numpy as np
 import copy
+from collections import namedtuple, OrderedDict
+from functools import update_wrapper
 
+from ..compatutil import move_to_end
 from ..utilities.check_utilities import check_species_definitions
 from ..utilities.check_utilities import check_ref_energies
 from ..utilities.check_utilities import check_analysis_interval
@@ -372,29 +375,121 @@ def make_hashable(var):
         return var
 
 
-class Memoized(object):
-    """ Descriptor for returned value memoization.
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class MemoizedMethod(object):
+    """ Memoized method bound to an instance, returned values are stored in
+    a bounded LRU cache owned by the instance.
+
+    :param func: The function to be memoized
+    :type func: function
+
+    :param instance: The instance the method is bound to
+    :type instance: any
+
+    :param maxsize: Max number of cached values, None for unlimited cache
+    :type maxsize: int
+
+    :param key: Function receiving the instance and all arguments to return
+                the cache key, all arguments are used if not provided.
+    :type key: function
+
+    .. note::
+        Cached values are dropped when the instance is pickled or copied.
     """
-    def __init__(self, func):
+    def __init__(self, func, instance, maxsize=128, key=None):
         self.func = func
-        self.results = {}
-
-    def __get__(self, instance, cls):
         self.instance = instance
-        return self
+        self.maxsize = maxsize
+        self.key = key
+        update_wrapper(self, func)
 
-    def __call__(self, **kwargs):
-        # Make all arguments hashable.
-        key = make_hashable(kwargs)
+        self.__results = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
 
-        # NOTE: if relative_energies is None, then we should
-        #       search the model's relative energies.
-        if "relative_energies" in key and key["relative_energies"] is None:
-            key["relative_energies"] = make_hashable(self.instance._owner.relative_energies)
+    def __call__(self, *args, **kwargs):
+        if self.key is None:
+            key = (make_hashable(args), make_hashable(kwargs))
+        else:
+            key = self.key(self.instance, *args, **kwargs)
 
+        results = self.__results
         try:
-            return self.results[key]
+            value = results[key]
         except KeyError:
-            self.results[key] = self.func(self.instance, **kwargs)
-            return self.results[key]
+            self.__misses += 1
+            value = self.func(self.instance, *args, **kwargs)
+            results[key] = value
+            # Evict the least recently used value.
+            if self.maxsize is not None and len(results) > self.maxsize:
+                results.popitem(last=False)
+        else:
+            self.__hits += 1
+            move_to_end(results, key)
+
+        return value
+
+    def cache_info(self):
+        """ Get the statistics of the cache.
+
+        :return: Hits, misses, max size and current size of the cache
+        :rtype: CacheInfo
+        """
+        return CacheInfo(self.__hits, self.__misses, self.maxsize, len(self.__results))
+
+    def cache_clear(self):
+        """ Drop all cached values and reset the statistics.
+        """
+        self.__results.clear()
+        self.__hits = 0
+        self.__misses = 0
+
+    def __reduce__(self):
+        # Cached values and the key function are not pickled, the method is
+        # bound to the instance again with an empty cache when unpickling.
+        return (_bind_memoized, (self.instance, self.__name__))
+
+
+def _bind_memoized(instance, name):
+    """
+    Private helper function to bind the memoized method to an unpickled instance.
+    """
+    return getattr(type(instance), name).__get__(instance, type(instance))
+
+
+class Memoized(object):
+    """ Descriptor for returned value memoization.
+
+    Each instance owns its bounded LRU cache, see :obj:`MemoizedMethod`.
+
+    Example::
+        >>> class Solver(object):
+        ...     @Memoized
+        ...     def get_value(self, a=1): ...
+        ...
+        ...     @Memoized(maxsize=16, key=lambda self, a=1: a)
+        ...     def get_other_value(self, a=1): ...
+    """
+    def __init__(self, func=None, maxsize=128, key=None):
+        self.func = func
+        self.maxsize = maxsize
+        self.key = key
+        if func is not None:
+            update_wrapper(self, func)
+
+    def __call__(self, func):
+        # Used as a decorator with parameters.
+        return Memoized(func, maxsize=self.maxsize, key=self.key)
+
+    def __get__(self, instance, cls):
+        if instance is None:
+            return self
+
+        # Bind to the instance, the bound method would be found directly
+        # in instance dict in following attribute lookups.
+        method = MemoizedMethod(self.func, instance, self.maxsize, self.key)
+        instance.__dict__[self.func.__name__] = method
 
+        return method
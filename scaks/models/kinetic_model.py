@@ -4,6 +4,7 @@ import os
 from operator import add
 
 
+from .. import __version__
 from ..compatutil import reduce
 from ..descriptors.descriptors import *
 from ..descriptors.component_descriptors import Component
@@ -11,6 +12,7 @@ from ..mpicommons import mpi
 from ..database.thermo_data import kB_eV, h_eV
 from ..errors.error import *
 from ..functions import *
+from ..utilities.cache_utilities import ModelCache
 from ..utilities.profiling_utitlities import do_cprofile
 from ..solvers.solver_base import SolverBase
 from ..correctors.corrector_base import CorrectorBase
@@ -71,6 +73,10 @@ class KineticModel(object):
         rate_algo(:obj:`str`): Algorithm for rate calculation, could be 'TST' for
         transition state theory or 'CT' for collision theory, default value is 'TST'
 
+        model_cache_dir(:obj:`str`): Directory of on-disk cache for data derived from the
+        reaction network (parsed reactions, stoichiometry matrices and compiled kernels),
+        empty string for no cache, default is ''
+
     '''
 
     # Attribute descriptors.
@@ -127,6 +133,9 @@ class KineticModel(object):
     # Ratio of active area.
     active_ratio = Float("active_ratio", default=1.0)
 
+    # Directory of on-disk cache of reaction network data.
+    model_cache_dir = String("model_cache_dir", default="")
+
     # }}}
 
     def __init__(self, **kwargs):
@@ -174,6 +183,12 @@ class KineticModel(object):
         self._has_relative_energy = False
         self._relative_energies = {}
 
+        # Version of relative energies, updated once they are set.
+        self._relative_energies_version = 0
+
+        # Cache of reaction network data.
+        self.__model_cache = None
+
         # Load setup file.
         self._load(self.setup_dict)
         if self.log_allowed:
@@ -322,7 +337,8 @@ class KineticModel(object):
              self.__site_names,
              self.__transition_state_names,
              self.__elementary_rxns_list) = \
-                self.parser.parse_elementary_rxns(self.rxn_expressions)
+                self.model_cache.get("elementary_rxns",
+                                     lambda: self.parser.parse_elementary_rxns(self.rxn_expressions))
 
         # Instantialize solver.
         if "solver" in setup_dict:
@@ -437,6 +453,26 @@ class KineticModel(object):
         """
         return self._logger
 
+    @Property
+    def model_cache(self):
+        """
+        Query function for the cache of reaction network data.
+
+        .. note::
+            Cached data is keyed on scaks version, parser type, reaction expressions
+            and site definitions, which are all the data derived from the network depends on.
+        """
+        if self.__model_cache is None:
+            species_definitions = self.species_definitions
+            site_definitions = tuple((name, tuple(sorted(definition.items())))
+                                     for name, definition in sorted(species_definitions.items())
+                                     if name.startswith("*_"))
+            key = (__version__, self.parser.__class__.__name__,
+                   tuple(self.rxn_expressions), site_definitions)
+            self.__model_cache = ModelCache(self.model_cache_dir, key)
+
+        return self.__model_cache
+
     @Property
     def elementary_rxns_list(self):
         """
@@ -500,6 +536,17 @@ class KineticModel(object):
         """
         return self._relative_energies
 
+    def _set_relative_energies(self, relative_energies):
+        """
+        Protected helper function to set relative energies of the model.
+
+        :param relative_energies: Relative energies with keys "Gaf", "Gar" and "dG"
+        :type relative_energies: dict
+        """
+        self._relative_energies = relative_energies
+        self._has_relative_energy = True
+        self._relative_energies_version += 1
+
     @Property
     def absolute_energies(self):
         """
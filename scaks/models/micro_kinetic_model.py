@@ -6,12 +6,20 @@ import logging
 import os
 from functools import wraps
 
+import numpy as np
+
 from .kinetic_model import KineticModel
 from ..errors.error import ParameterError
+from ..functions import mangled_name
 from ..mpicommons import mpi
 from ..descriptors.descriptors import *
 from ..utilities.profiling_utitlities import do_cprofile
-from ..compatutil import pickle
+from ..utilities.archive_utilities import ArchiveWriter, load_archive
+from ..utilities.checkpoint_utilities import CheckpointWriter, checkpoint_filename
+from ..utilities.checkpoint_utilities import load_checkpoints, fingerprint
+from ..utilities.checkpoint_utilities import write_checkpoint_header, match_checkpoint_header
+from ..utilities.grid_utilities import snake_path, split_path
+from ..utilities.parallel_utilities import get_processes
 from ..plugins.analysis import OnTheFlyAnalysis
 from ..plugins.hybrid_methods import ODE_integration
 
@@ -55,20 +63,59 @@ class MicroKineticModel(KineticModel):
         'initial_guess', 'steady_state_coverages', 'steady_state_error', 'rates',
         'net_rates', 'reversibilities', 'tofs'
 
+        archive_mode (:obj:`str`): 'snapshot' to keep only the latest values of archived
+        variables in data file, or 'append' to append all values, default is 'snapshot'
+
+        archive_interval (:obj:`float`): Interval in seconds to flush archived variables
+        to data file in background, 0 for no background flush, default is 1.0
+
+        archive_count (:obj:`int`): Number of archived values to trigger a flush,
+        0 for no limit, default is 0
+
         numerical_representation (:obj:`str`): Numerical representation method,
-        value could be 'mpmath' or 'sympy'.
+        value could be 'mpmath', 'numpy' or 'sympy'. 'numpy' uses native float64
+        arithmetics which is much faster but less precise than 'mpmath'.
+
+        sym_kernel_dir (:obj:`str`): Directory to store generated code of compiled
+        symbolic expressions used by the `*_by_sym` functions, default is '' for no
+        on-disk store. Stored code is executed when loaded, only use a directory
+        writable by trusted users
 
         rootfinding(:obj:`str`): Rootfinding iterator type, default value is 'MDNewton',
-        possible value can be 'MDNewton' or 'ConstrainedNewton'
+        possible value can be 'MDNewton', 'ConstrainedNewton' or 'Broyden'
+
+        line_search (:obj:`str`): Line search method of ConstrainedNewton iterator,
+        'golden' or 'backtracking', default is 'golden'
+
+        max_line_search_probes (:obj:`int`): Max probes of backtracking line search, default is 10
 
         tolerance (:obj:`float`): Iteration tolerance, default is 1e-8
 
         max_rootfinding_iterations (:obj:`int`): Max iteraction steps, default is 100
 
+        mixed_precision (:obj:`bool`): Do float64 Newton iterations before the
+        iterations in decimal precision or not, default is `False`
+
+        coarse_tolerance (:obj:`float`): Tolerance of float64 Newton iterations
+        in mixed precision mode and of max absolute dtheta/dt relative to rates
+        to stop ODE integration, default is 1e-8
+
+        multistart (:obj:`int`): Number of candidate initial coverages solved
+        concurrently when searching steady state coverages, default is 0 (no multi-start)
+
+        processes (:obj:`int`): Number of worker processes for parallel solving
+        (multi-start, finite difference XRC and sweeps), default is 0 (the number of CPUs)
+
         ode_buffer_size (:obj:`int`): Ode integration buffer size, default is 500
 
         ode_output_interval (:obj:`int`): Ode ouptut interval, default is 200
 
+        ode_steady_state_window (:obj:`float`): Time window, as a fraction of integration time,
+        in which the steady state criterion must hold to stop ODE integration, default is 0.01
+
+        ode_steady_state_rtol (:obj:`float`): Threshold of relative change of max absolute
+        dtheta/dt in the window to stop ODE integration, default is 1e-6
+
         data_file (:obj:`str`): Filename for data store, default is 'data.pkl'
 
         log_allowed (:obj:`bool`): If log output is allowed, default is `True`
@@ -97,23 +144,51 @@ class MicroKineticModel(KineticModel):
                                   default=["steady_state_coverages"],
                                   entry_type=str)
 
+    archive_mode = String("archive_mode",
+                          default="snapshot",
+                          candidates=["snapshot", "append"])
+
+    archive_interval = Float("archive_interval", default=1.0)
+
+    archive_count = Integer("archive_count", default=0)
+
     numerical_representation = String("numerical_representation",
                                       default="mpmath",
-                                      candidates=["mpmath", "sympy"])
+                                      candidates=["mpmath", "numpy", "sympy"])
+
+    sym_kernel_dir = String("sym_kernel_dir", default="")
 
     rootfinding = String("rootfinding",
                          default="MDNewton",
-                         candidates=["MDNewton", "ConstrainedNewton"])
+                         candidates=["MDNewton", "ConstrainedNewton", "Broyden"])
+
+    line_search = String("line_search",
+                         default="golden",
+                         candidates=["golden", "backtracking"])
+
+    max_line_search_probes = Integer("max_line_search_probes", default=10)
 
     tolerance = Float("tolerance", default=1e-8)
 
     max_rootfinding_iterations = Integer("max_rootfinding_iterations",
                                          default=100)
 
+    mixed_precision = Bool("mixed_precision", default=False)
+
+    coarse_tolerance = Float("coarse_tolerance", default=1e-8)
+
+    multistart = Integer("multistart", default=0)
+
+    processes = Integer("processes", default=0)
+
     ode_buffer_size = Integer("ode_buffer_size", default=500)
 
     ode_output_interval = Integer("ode_output_interval", default=200)
 
+    ode_steady_state_window = Float("ode_steady_state_window", default=0.01)
+
+    ode_steady_state_rtol = Float("ode_steady_state_rtol", default=1e-6)
+
     # Reference energies used to calculate formation energy.
     ref_energies = RefEnergies("ref_energies", default={})
 
@@ -127,15 +202,16 @@ class MicroKineticModel(KineticModel):
         super(MicroKineticModel, self).__init__(**kwargs)
 
         # Create data directory if need.
-        if mpi.size != 1 and not os.path.exists("./data"):
-            mpi.barrier()
-            if mpi.is_master:
+        if mpi.size != 1:
+            if mpi.is_master and not os.path.exists("./data"):
                 os.mkdir("./data")
+            mpi.barrier()
 
         # Model attributes definitions.
         self.__ss_cvgs = None          # steady-state coverages
         self.__tofs = None              # turn-over frequencies
         self.__reversibilities = None  # reversibilities
+        self.__archive = None          # archive of data file
 
     def _set_logger(self, filename=None):
         super(MicroKineticModel, self)._set_logger(filename)
@@ -170,6 +246,10 @@ class MicroKineticModel(KineticModel):
         :param epsilon: the change of energy for XRC calculation, default is 10-5.
         :type epsilon: float
 
+        :param XRC_method: 'finite_difference' or 'analytical', default is 'finite_difference',
+            the same as :obj:`get_single_XRC` of the solver.
+        :type XRC_method: str
+
         :param product_name: Production name of the model. e.g. :obj:`'CH3OH_g'`
         :type product_name: str
 
@@ -183,6 +263,7 @@ class MicroKineticModel(KineticModel):
         coarse_guess = kwargs.pop("coarse_guess", True)
         XRC = kwargs.pop("XRC", False)
         epsilon = kwargs.pop("epsilon", 1e-5)
+        XRC_method = kwargs.pop("XRC_method", "finite_difference")
         product_name = kwargs.pop("product_name", None)
 
         if kwargs:
@@ -215,8 +296,7 @@ class MicroKineticModel(KineticModel):
                 self._logger.info('use user-defined coverages as initial guess...')
 
         elif os.path.exists(self.data_file):
-            with open(self.data_file, 'rb') as f:
-                data = pickle.load(f)
+            data = load_archive(self.data_file)
             init_guess = 'steady_state_coverage'
             if init_guess in data:
                 if self.log_allowed:
@@ -227,7 +307,7 @@ class MicroKineticModel(KineticModel):
             else:
                 if self.log_allowed:
                     self._logger.info('Do ODE integration to get initial guess...')
-                ode_traj = solver.solve_ode()
+                ode_traj = solver.solve_ode(algo="BDF")
                 init_cvgs = ode_traj[-1]
 
         else:
@@ -277,7 +357,271 @@ class MicroKineticModel(KineticModel):
 
             solver.get_single_XRC(product_name,
                                   epsilon=epsilon,
-                                  relative_energies=relative_energies)
+                                  relative_energies=relative_energies,
+                                  method=XRC_method)
+
+        # Write all archived data.
+        self.archive.flush()
+        # }}}
+
+    def sweep(self, pressures=None, temperatures=None, relative_energies=None,
+              init_cvgs=None, processes=None, checkpoint=None):
+        """
+        Solve steady states of the model over a grid of conditions, the grid is
+        the product of all axes provided. Grid points are solved along a snake
+        path in which every point is warm-started from its neighbour.
+
+        :param pressures: Pressures of gases, one axis for each gas.
+            e.g. :obj:`{"O2_g": [0.1, 0.2], "CO_g": [0.5, 1.0]}`
+        :type pressures: dict of list of float
+
+        :param temperatures: Temperatures in K
+        :type temperatures: list of float
+
+        :param relative_energies: Relative energies dicts overriding the model's,
+            each must have keys :obj:`Gaf` and :obj:`Gar`.
+        :type relative_energies: list of dict
+
+        :param init_cvgs: Initial guess for the first point, default is None,
+            use model's hybrid method to get it.
+        :type init_cvgs: list of float
+
+        :param processes: Number of worker processes, default is None,
+            use model's processes. Points are distributed over MPI processes
+            instead when running under MPI.
+        :type processes: int
+
+        :param checkpoint: Directory of checkpoint files, default is None (no checkpoint).
+            Completed points are appended to a checkpoint file of each process,
+            points completed in a previous run with the same checkpoint are skipped.
+            The model and the conditions not swept are stored in the checkpoint,
+            a checkpoint written for another model or conditions is refused.
+        :type checkpoint: str
+
+        :return: Dict of axes and results arrays, the shape of results arrays is
+            the grid shape followed by the number of adsorbates, gases or reactions.
+            Axes are pairs of name and values in order of grid dimensions, pressure
+            axes are named by gas names in alphabetical order, followed by
+            'temperature' and 'relative_energies'. Points not converged are NaN.
+        :rtype: dict
+
+        Example::
+            >>> results = model.sweep(pressures={"O2_g": [0.1, 0.2, 0.3]},
+            ...                       temperatures=[450.0, 500.0])
+            >>> results["TOFs"].shape
+            (3, 2, 3)
+        """
+        # {{{
+        # Build grid axes.
+        axes = []
+        for gas_name in sorted(pressures or {}):
+            if gas_name not in self.gas_names:
+                msg = "{} is not a gas in the model.".format(gas_name)
+                raise ParameterError(msg)
+            axes.append((gas_name, [float(p) for p in pressures[gas_name]]))
+
+        if temperatures is not None:
+            axes.append(("temperature", [float(T) for T in temperatures]))
+
+        if relative_energies is not None:
+            axes.append(("relative_energies", list(relative_energies)))
+
+        for name, values in axes:
+            if not values:
+                msg = "No values for {} in sweep.".format(name)
+                raise ParameterError(msg)
+
+        shape = tuple(len(values) for _, values in axes)
+        path = snake_path(shape)
+
+        if processes is None:
+            processes = self.processes
+
+        if self.log_allowed:
+            self._logger.info('--- Sweep {} points of Micro-kinetic model ---'.format(len(path)))
+            for name, values in axes:
+                self._logger.info('{}: {} points'.format(name, len(values)))
+
+        # Conditions of the model to be restored.
+        species_definitions = getattr(self, mangled_name(self, "species_definitions"))
+        temperature = self.temperature
+        gas_pressures = {gas_name: species_definitions[gas_name]["pressure"]
+                         for gas_name in self.gas_names}
+
+        def condition_of(idx):
+            """
+            Nested function to get the condition of a grid point.
+            """
+            condition = dict(pressures=dict(gas_pressures),
+                             temperature=temperature,
+                             relative_energies=None)
+            for i, (name, values) in zip(idx, axes):
+                if name == "temperature":
+                    condition["temperature"] = values[i]
+                elif name == "relative_energies":
+                    condition["relative_energies"] = values[i]
+                else:
+                    condition["pressures"][name] = values[i]
+            return condition
+
+        def key_of(idx):
+            """
+            Nested function to get the checkpoint key of a grid point, relative
+            energies are identified by their contents.
+            """
+            return tuple(fingerprint(values[i]) if name == "relative_energies" else values[i]
+                         for i, (name, values) in zip(idx, axes))
+
+        # Points completed in previous runs.
+        completed = {}
+        if checkpoint is not None:
+            # Model and conditions not swept, shared by all points.
+            swept_names = [name for name, _ in axes]
+            fixed_species = {name: dict(definition)
+                             for name, definition in species_definitions.items()}
+            for name in swept_names:
+                if name in self.gas_names:
+                    del fixed_species[name]["pressure"]
+
+            header = dict(axes=swept_names,
+                          rxn_expressions=self.rxn_expressions,
+                          species_definitions=fixed_species)
+            if "temperature" not in swept_names:
+                header["temperature"] = temperature
+            if "relative_energies" not in swept_names and self.has_relative_energy:
+                header["relative_energies"] = self.relative_energies
+
+            if mpi.is_master:
+                if not os.path.exists(checkpoint):
+                    os.makedirs(checkpoint)
+                if match_checkpoint_header(checkpoint, header):
+                    write_checkpoint_header(checkpoint, header)
+            mpi.barrier()
+
+            if not match_checkpoint_header(checkpoint, header):
+                msg = ("Checkpoint {} is written for another model or conditions, " +
+                       "use a new checkpoint directory.").format(checkpoint)
+                raise ParameterError(msg)
+
+            records = load_checkpoints(checkpoint)
+            completed = {idx: records[key_of(idx)] for idx in path if key_of(idx) in records}
+            if self.log_allowed and completed:
+                msg = '{} points are completed in checkpoint {}'.format(len(completed), checkpoint)
+                self._logger.info(msg)
+
+        def distance(idx1, idx2):
+            return sum(abs(i - j) for i, j in zip(idx1, idx2))
+
+        def solve_segment(segment):
+            """
+            Nested function to solve points in a segment of the path, every point
+            is warm-started from the previous one or the nearest completed one.
+            """
+            if checkpoint is not None:
+                writer = CheckpointWriter(checkpoint_filename(checkpoint, mpi.rank))
+
+            records = []
+            previous, cvgs = None, init_cvgs
+            try:
+                for idx in segment:
+                    if previous is None or distance(idx, previous) > 1:
+                        candidates = [(distance(idx, previous), cvgs)] if previous is not None else []
+                        candidates += [(distance(idx, other), record["coverages"])
+                                       for other, record in completed.items()]
+                        if candidates:
+                            cvgs = min(candidates, key=lambda candidate: candidate[0])[1]
+
+                    ss_cvgs, record = self.__solve_condition(condition_of(idx), cvgs)
+                    records.append(record)
+                    if record is None:
+                        continue
+                    previous, cvgs = idx, ss_cvgs
+
+                    if checkpoint is not None:
+                        writer.append(key_of(idx), record)
+            finally:
+                if checkpoint is not None:
+                    writer.close()
+
+            return records
+
+        # Distribute contiguous segments of the unfinished path, segments are
+        # shorter in MPI environment for dynamic load balancing.
+        if mpi.size > 1:
+            nsegments = 4*mpi.size
+        else:
+            nsegments = get_processes(processes)
+        unfinished_path = [idx for idx in path if idx not in completed]
+        segments = split_path(unfinished_path, nsegments)
+
+        try:
+            with self.solver.suppress_archive():
+                results = mpi.task_farm(solve_segment, segments, processes=processes)
+        finally:
+            self.__set_conditions(temperature, gas_pressures)
+
+        # Collect results to arrays.
+        n_ads, n_gas = len(self.adsorbate_names), len(self.gas_names)
+        n_rxns = len(self.rxn_expressions)
+        sweep_results = dict(axes=axes,
+                             coverages=np.full(shape + (n_ads, ), np.nan),
+                             TOFs=np.full(shape + (n_gas, ), np.nan),
+                             reversibilities=np.full(shape + (n_rxns, ), np.nan),
+                             errors=np.full(shape, np.nan))
+
+        records = dict(completed)
+        records.update(zip(unfinished_path,
+                           [record for segment_records in results for record in segment_records]))
+        for idx, record in records.items():
+            if record is None:
+                continue
+            for key, value in record.items():
+                sweep_results[key][idx] = value
+
+        n_failures = list(records.values()).count(None)
+        if n_failures:
+            msg = "Steady state of {} points are not converged in sweep.".format(n_failures)
+            self._logger.warning(msg)
+
+        return sweep_results
+        # }}}
+
+    def __set_conditions(self, temperature, pressures):
+        """
+        Private helper function to set temperature and gas pressures of model.
+        """
+        setattr(self, mangled_name(self, "temperature"), temperature)
+        species_definitions = getattr(self, mangled_name(self, "species_definitions"))
+        for gas_name, pressure in pressures.items():
+            species_definitions[gas_name]["pressure"] = pressure
+        self.solver.get_data()
+
+    def __solve_condition(self, condition, init_cvgs=None):
+        """
+        Private helper function to solve steady state under a condition.
+
+        :return: Steady state coverages and the record of results, both are None
+            if the steady state is not converged.
+        """
+        # {{{
+        solver = self.solver
+        self.__set_conditions(condition["temperature"], condition["pressures"])
+        relative_energies = condition["relative_energies"]
+
+        cvgs = solver.get_steady_state_cvgs(c0=init_cvgs, relative_energies=relative_energies)
+        if cvgs is None:
+            return None, None
+
+        rfs, rrs = solver.get_rates(cvgs_tuple=cvgs, relative_energies=relative_energies)
+        tofs = solver.get_tof(cvgs=cvgs, relative_energies=relative_energies)
+        reversibilities = solver.get_reversibilities(rfs, rrs)
+
+        record = dict(coverages=[float(cvg) for cvg in cvgs],
+                      TOFs=[float(tof) for tof in tofs],
+                      reversibilities=[float(r) for r in reversibilities],
+                      errors=float(solver.error))
+
+        return cvgs, record
         # }}}
 
     def hybrid_method_register(self, fn):
@@ -333,6 +677,17 @@ class MicroKineticModel(KineticModel):
         else:
             return "./data/data_{}.pkl".format(mpi.rank)
 
+    @Property
+    def archive(self):
+        ''' Get the archive writer of data file.
+        '''
+        if self.__archive is None:
+            self.__archive = ArchiveWriter(self.data_file,
+                                           mode=self.archive_mode,
+                                           interval=self.archive_interval,
+                                           count=self.archive_count)
+        return self.__archive
+
     @Property
     def log_allowed(self):
         """
@@ -3,16 +3,33 @@ Module for wrapped MPI interfaces used in scaks.
 """
 
 import logging
+import os
+import time
 from itertools import chain
 from functools import wraps
 
-try:
-    from mpi4py import MPI
-    MPI_INSTALLED = True
-except ImportError:
-    MPI_INSTALLED = False
-
 from .descriptors.descriptors import Property
+from .utilities.import_utilities import import_optional
+from .utilities.parallel_utilities import imap_unordered
+
+# Message tags of task farm.
+TAG_RESULTS, TAG_TASKS, TAG_STOP = 11, 12, 13
+
+# Environment variables set by MPI launchers (Open MPI, MPICH/Intel MPI, PMIx, MVAPICH).
+MPI_LAUNCHER_VARS = ("OMPI_COMM_WORLD_SIZE", "PMI_SIZE", "PMIX_RANK", "MV2_COMM_WORLD_SIZE")
+
+
+def mpi_requested():
+    """
+    Function to check if MPI is requested, i.e. the process is started by an
+    MPI launcher or environment variable SCAKS_MPI is set to 1. MPI can be
+    disabled by setting SCAKS_MPI to 0.
+    """
+    flag = os.environ.get("SCAKS_MPI")
+    if flag is not None:
+        return flag.strip() not in ("", "0")
+
+    return any(var in os.environ for var in MPI_LAUNCHER_VARS)
 
 
 class MPIUtil(object):
@@ -22,8 +39,31 @@ class MPIUtil(object):
         logger_name = 'scaks.{}'.format(self.__class__.__name__)
         self._logger = logging.getLogger(logger_name)
 
+        # mpi4py.MPI module, imported at first use since it initializes MPI.
+        self.__MPI = None
+        self.__MPI_loaded = False
+
+    @Property
+    def MPI(self):
+        """ Query function for mpi4py.MPI module, None if MPI is not requested
+        or mpi4py is not installed.
+
+        .. note::
+            mpi4py.MPI is never imported unless MPI is requested, since MPI
+            initialization disables forked process pools, see
+            :obj:`fork_available`. Set SCAKS_MPI to 1 if the process is started
+            by an MPI launcher not listed in MPI_LAUNCHER_VARS.
+        """
+        if not self.__MPI_loaded:
+            if mpi_requested():
+                self.__MPI = import_optional("mpi4py.MPI", "MPI parallelization")
+            self.__MPI_loaded = True
+
+        return self.__MPI
+
     def bcast(self, data):
-        if MPI_INSTALLED:
+        MPI = self.MPI
+        if MPI is not None:
             mpi_comm = MPI.COMM_WORLD
             bdata = mpi_comm.bcast(data, root=0)
         else:
@@ -31,13 +71,15 @@ class MPIUtil(object):
         return bdata
 
     def barrier(self):
-        if MPI_INSTALLED:
+        MPI = self.MPI
+        if MPI is not None:
             mpi_comm = MPI.COMM_WORLD
             mpi_comm.barrier()
 
     @Property
     def rank(self):
-        if MPI_INSTALLED:
+        MPI = self.MPI
+        if MPI is not None:
             mpi_comm = MPI.COMM_WORLD
             return mpi_comm.Get_rank()
         else:
@@ -45,7 +87,8 @@ class MPIUtil(object):
 
     @Property
     def size(self):
-        if MPI_INSTALLED:
+        MPI = self.MPI
+        if MPI is not None:
             mpi_comm = MPI.COMM_WORLD
             return mpi_comm.Get_size()
         else:
@@ -61,10 +104,14 @@ class MPIUtil(object):
 
         :param sequence: The data sequence to be divided for parallel processing
         :type sequence: list
+
+        .. note::
+            Lengths of sub-sequences differ by one at most, processes with
+            rank not less than the sequence length get empty sub-sequences.
         '''
-        starts = [i for i in range(0, len(sequence), len(sequence)//self.size)]
-        ends = starts[1: ] + [len(sequence)]
-        start, end = list(zip(starts, ends))[self.rank]
+        size, residual = divmod(len(sequence), self.size)
+        start = self.rank*size + min(self.rank, residual)
+        end = start + size + (1 if self.rank < residual else 0)
 
         return sequence[start: end]
 
@@ -99,10 +146,121 @@ class MPIUtil(object):
         if self.size == 1:
             return seq
 
-        mpi_comm = MPI.COMM_WORLD
+        mpi_comm = self.MPI.COMM_WORLD
         merged_seq= mpi_comm.allgather(seq)
         return list(chain(*merged_seq))
 
+    def task_farm(self, func, tasks, chunk_size=1, processes=0, full_output=False):
+        ''' Map a function over tasks with dynamic load balancing.
+
+        In MPI environment, the master process dispatches chunks of tasks to other
+        processes once they finish their previous chunks, so processes with cheap
+        tasks are not left idle. Without MPI (or with only one MPI process),
+        tasks are mapped in a local process pool.
+
+        :param func: The function to be mapped
+        :type func: function
+
+        :param tasks: Tasks passed to the function, must be picklable
+        :type tasks: list
+
+        :param chunk_size: Number of tasks dispatched at a time in MPI environment,
+            default is 1
+        :type chunk_size: int
+
+        :param processes: Number of processes in local process pool,
+            0 for the number of CPUs, default is 0
+        :type processes: int
+
+        :param full_output: Return timing information or not, default is False
+        :type full_output: bool
+
+        :return: Results in order of tasks in all processes, and information of
+            tasks dict with keys 'times' (wall time in seconds of each task) and
+            'ranks' (rank of process each task ran in) if full_output is True.
+
+        Example::
+            >>> results = mpi.task_farm(lambda x: x**2, range(100), chunk_size=4)
+        '''
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive.")
+
+        tasks = list(tasks)
+
+        def timed_func(task):
+            start = time.time()
+            return func(task), time.time() - start
+
+        if self.size == 1:
+            records = {}
+            for idx, (result, elapsed) in imap_unordered(timed_func, tasks, processes):
+                records[idx] = (result, elapsed, 0)
+            error = None
+        else:
+            records, error = self.__farm(timed_func, tasks, chunk_size)
+
+        if error is not None:
+            raise error
+
+        results = [records[idx][0] for idx in range(len(tasks))]
+        if not full_output:
+            return results
+
+        info = dict(times=[records[idx][1] for idx in range(len(tasks))],
+                    ranks=[records[idx][2] for idx in range(len(tasks))])
+
+        return results, info
+
+    def __farm(self, timed_func, tasks, chunk_size):
+        '''
+        Private helper function to run task farm in MPI processes, the master
+        dispatches tasks and workers compute them.
+        '''
+        MPI = self.MPI
+        mpi_comm = MPI.COMM_WORLD
+        chunks = [list(range(len(tasks)))[i: i+chunk_size]
+                  for i in range(0, len(tasks), chunk_size)]
+        records, error = {}, None
+
+        if self.is_master:
+            chunks.reverse()
+            nworkers = self.size - 1
+            status = MPI.Status()
+            while nworkers:
+                # Collect results of a worker and give it a new chunk.
+                worker_records, worker_error = mpi_comm.recv(source=MPI.ANY_SOURCE,
+                                                             tag=TAG_RESULTS,
+                                                             status=status)
+                records.update(worker_records)
+                error = error or worker_error
+
+                worker = status.Get_source()
+                if chunks and error is None:
+                    mpi_comm.send(chunks.pop(), dest=worker, tag=TAG_TASKS)
+                else:
+                    mpi_comm.send(None, dest=worker, tag=TAG_STOP)
+                    nworkers -= 1
+        else:
+            worker_records, worker_error = {}, None
+            status = MPI.Status()
+            while True:
+                mpi_comm.send((worker_records, worker_error), dest=0, tag=TAG_RESULTS)
+                chunk = mpi_comm.recv(source=0, tag=MPI.ANY_TAG, status=status)
+                if status.Get_tag() == TAG_STOP:
+                    break
+
+                worker_records = {}
+                for idx in chunk:
+                    try:
+                        result, elapsed = timed_func(tasks[idx])
+                    except Exception as e:
+                        worker_error = e
+                        break
+                    worker_records[idx] = (result, elapsed, self.rank)
+
+        # Results are gathered in master and shared with all processes.
+        return mpi_comm.bcast((records, error), root=0)
+
 mpi = MPIUtil()
 
 def master_only(func):
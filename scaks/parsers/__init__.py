@@ -1,4 +1,4 @@
 from .relative_energy_parser import RelativeEnergyParser
 from .absolute_energy_parser import AbsoluteEnergyParser
 from .kmc_parser import KMCParser
-
+from .reaction_network import ReactionNetwork
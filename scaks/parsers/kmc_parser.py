@@ -5,17 +5,6 @@ from operator import mul
 
 import numpy as np
 
-# KMCLibX.
-try:
-    from KMCLib import *
-except ImportError:
-    print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-    print("!!!                                                   !!!")
-    print("!!!          WARNING: KMCLib is not installed         !!!")
-    print("!!! Any kMC calculation using KMCLib will be disabled !!!")
-    print("!!!                                                   !!!")
-    print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-
 from ..compatutil import reduce
 from ..database.thermo_data import kB_eV
 from ..errors.error import *
@@ -24,6 +13,7 @@ from ..functions import mangled_name
 from .rxn_parser import *
 from .relative_energy_parser import RelativeEnergyParser
 from ..utilities.check_utilities import *
+from ..utilities.import_utilities import import_optional
 
 
 class KMCParser(RelativeEnergyParser):
@@ -38,6 +28,9 @@ class KMCParser(RelativeEnergyParser):
         # Set logger.
         self.__logger = logging.getLogger('model.parsers.KMCParser')
 
+        # KMCLib is only imported when kMC parser is used.
+        import_optional("KMCLib", "any kMC calculation using KMCLib")
+
     def parse_data(self,
                    energy_file="./rel_energy.py",
                    processes_file=None,
@@ -79,6 +72,8 @@ class KMCParser(RelativeEnergyParser):
         :rtype: :obj:`KMCSitesMap`
         """
         # {{{
+        from KMCLib import KMCSitesMap
+
         # Load data.
         if filename is None:
             filename = "kmc_sites.py"
@@ -139,6 +134,8 @@ class KMCParser(RelativeEnergyParser):
         :return: A kMC lattice grid
         :rtype: :obj:`KMCLattice`
         """
+        from KMCLib import KMCUnitCell, KMCLattice
+
         # Construct unitcell.
         cell_vectors = np.array(self._owner.cell_vectors)
         basis_sites = np.array(self._owner.basis_sites)
@@ -164,6 +161,8 @@ class KMCParser(RelativeEnergyParser):
         :rtype: :obj:`KMCConfiguration`
         """
         # {{{
+        from KMCLib import KMCConfiguration
+
         # Inner function to initialize emtpy lattice.
         def init_empty_types():
             repetitions = self._owner.repetitions
@@ -10,6 +10,7 @@ from ..functions import *
 from ..errors.error import *
 from ..database.elements_data import *
 from .rxn_parser import *
+from .reaction_network import ReactionNetwork
 
 
 class ParserBase(ModelShell):
@@ -117,6 +118,7 @@ class ParserBase(ModelShell):
                 elementary_rxns_list)
         # }}}
 
+    @Memoized(maxsize=1, key=lambda self: tuple(self._owner.rxn_expressions))
     def get_stoichiometry_matrices(self):
         """
         Go through elementary_rxns_list, return sites stoichiometry matrix,
@@ -125,63 +127,121 @@ class ParserBase(ModelShell):
         :returns site_matrix: coefficients matrix for intermediates, if species
             is on the left of arrow, the entry will be positive, vice-versa.
             row vector: :obj:`[self.adsorbate_names]`
-        :rtype: numpy.matrix
+        :rtype: numpy.ndarray
 
         :returns reapro_matrix: coefficients matrix for reactants and product,
             if species is on the left of arrow, the entry will be positive,
             vice-versa.  row vector: :obj:`[self.gas_names]`
-        :rtype: numpy.matrix
+        :rtype: numpy.ndarray
+
+        .. note::
+            The matrices are built only once for the reaction expressions
+            and are read-only, copy them before modification.
+        """
+        # {{{
+        matrices = self._owner.model_cache.get("stoichiometry_matrices",
+                                               self.__build_stoichiometry_matrices)
+
+        # Arrays are writable after being loaded from cache.
+        for matrix in matrices:
+            matrix.setflags(write=False)
+
+        return matrices
+        # }}}
+
+    def __build_stoichiometry_matrices(self):
+        """
+        Private helper function to build stoichiometry matrices from elementary_rxns_list.
         """
         # {{{
         # Site and adsorbate names.
-        sites_names = list(self._owner.site_names + self._owner.adsorbate_names)
+        sites_names = self._owner.site_names + self._owner.adsorbate_names
+        sites_indices = {name: j for j, name in enumerate(sites_names)}
 
         # Reactant and product names.
-        reapro_names = list(self._owner.gas_names + self._owner.liquid_names)
+        reapro_names = self._owner.gas_names + self._owner.liquid_names
+        reapro_indices = {name: j for j, name in enumerate(reapro_names)}
 
         # Initialize matrices.
         m = len(self._owner.elementary_rxns_list)
         n_s, n_g = len(sites_names), len(reapro_names)
-        site_matrix = np.matrix(np.zeros((m, n_s)))
-        reapro_matrix = np.matrix(np.zeros((m, n_g)))
+        site_matrix = np.zeros((m, n_s))
+        reapro_matrix = np.zeros((m, n_g))
 
         rxns_list = self._owner.elementary_rxns_list
 
-        # Go through all elementary equations.
+        # Go through all elementary equations, species in initial state
+        # are positive and species in final state are negative.
         for i, rxn_list in enumerate(rxns_list):
-            # Initial state.
-            for formula in rxn_list[0]:
-                stoich = formula.stoichiometry()
-                species_site = formula.species_site()
-
-                # Empty site.
-                if species_site in sites_names:
-                    j = sites_names.index(species_site)
-                    site_matrix[i, j] += stoich
-
-                # Adsorbate.
-                if species_site in reapro_names:
-                    j = reapro_names.index(species_site)
-                    reapro_matrix[i, j] += stoich
-
-            # Final state.
-            for formula in rxn_list[-1]:
-                stoich = formula.stoichiometry()
-                species_site = formula.species_site()
-
-                # Empty site.
-                if species_site in sites_names:
-                    j = sites_names.index(species_site)
-                    site_matrix[i, j] -= stoich
-
-                # Adsorbate.
-                if species_site in reapro_names:
-                    j = reapro_names.index(species_site)
-                    reapro_matrix[i, j] -= stoich
+            for sign, formula_list in [(1, rxn_list[0]), (-1, rxn_list[-1])]:
+                for formula in formula_list:
+                    stoich = sign*formula.stoichiometry()
+                    species_site = formula.species_site()
+
+                    # Empty site or adsorbate.
+                    if species_site in sites_indices:
+                        site_matrix[i, sites_indices[species_site]] += stoich
+
+                    # Reactant or product.
+                    if species_site in reapro_indices:
+                        reapro_matrix[i, reapro_indices[species_site]] += stoich
 
         return site_matrix, reapro_matrix
         # }}}
 
+    def get_reaction_network(self):
+        """
+        Get the reaction network of the kinetic model which contains reactant
+        order matrices and stoichiometry matrix for vectorized rates calculation.
+
+        :return: The reaction network
+        :rtype: :obj:`scaks.parsers.reaction_network.ReactionNetwork`
+        """
+        return self._owner.model_cache.get("reaction_network",
+                                           self.__build_reaction_network)
+
+    def __build_reaction_network(self):
+        """
+        Private helper function to build reaction network from elementary_rxns_list.
+        """
+        # {{{
+        adsorbate_names = self._owner.adsorbate_names
+        site_names = self._owner.site_names
+        gas_names = self._owner.gas_names
+        liquid_names = self._owner.liquid_names
+        species_names = adsorbate_names + site_names + gas_names + liquid_names
+
+        # Reactant orders of forward and reverse reactions.
+        rxns_list = self._owner.elementary_rxns_list
+        m, n = len(rxns_list), len(species_names)
+        forward_orders = np.zeros((m, n), dtype=int)
+        reverse_orders = np.zeros((m, n), dtype=int)
+
+        for i, rxn_list in enumerate(rxns_list):
+            for orders, formula_list in zip([forward_orders, reverse_orders],
+                                            [rxn_list[0], rxn_list[-1]]):
+                for formula in formula_list:
+                    j = species_names.index(formula.species_site())
+                    orders[i, j] += formula.stoichiometry()
+
+        # Net stoichiometry of adsorbates, positive for production.
+        site_matrix, _ = self.get_stoichiometry_matrices()
+        stoichiometry_matrix = -np.asarray(site_matrix)[:, len(site_names):]
+
+        # Site membership of adsorbates.
+        membership_matrix = np.zeros((len(site_names), len(adsorbate_names)))
+        for j, adsorbate_name in enumerate(adsorbate_names):
+            site_name = "*_{}".format(ChemFormula(adsorbate_name).site())
+            membership_matrix[site_names.index(site_name), j] = 1.0
+
+        site_totals = [self.__species_definitions[site_name]['total']
+                       for site_name in site_names]
+
+        return ReactionNetwork(adsorbate_names, site_names, gas_names, liquid_names,
+                               forward_orders, reverse_orders, stoichiometry_matrix,
+                               membership_matrix, site_totals)
+        # }}}
+
     def get_total_rxn_equation(self):
         """ Function to get total reaction expression of the kinetic model.
         """
@@ -201,9 +261,8 @@ class ParserBase(ModelShell):
         x = [abs(i) for i in x.T.tolist()[0]]
         #convert entries of x to integer
         min_x = min(x)
-        x = [round(i/min_x, 1) for i in x]
-        x = np.matrix(x)
-        total_coefficients = (x*reapro_matrix).tolist()[0]
+        x = np.array([round(i/min_x, 1) for i in x])
+        total_coefficients = x.dot(reapro_matrix).tolist()
 
         # cope with small differences between coeffs
         abs_total_coefficients = list(map(abs, total_coefficients))
@@ -278,7 +337,7 @@ class ParserBase(ModelShell):
             return molecular_mass
         # }}}
 
-    def _get_state_energy(self, state):
+    def _get_state_energy(self, state, absolute_energies=None):
         """
         Protected helper function to get state energy.
 
@@ -286,6 +345,9 @@ class ParserBase(ModelShell):
         -----------
         state: An object of ChemState.
 
+        absolute_energies: Absolute energies of species, model's absolute
+                           energies are used if not provided, dict.
+
         Returns:
         --------
         Absolute free energy of the state, float.
@@ -296,7 +358,10 @@ class ParserBase(ModelShell):
         site_dict = state.get_sites_dict()
         formula_list = state.tolist()
 
-        abs_energies = self._owner.absolute_energies
+        if absolute_energies is None:
+            abs_energies = self._owner.absolute_energies
+        else:
+            abs_energies = absolute_energies
         energy = 0.0
 
         for formula in formula_list:
@@ -314,7 +379,7 @@ class ParserBase(ModelShell):
         return energy
         # }}}
 
-    def _get_single_relative_energies(self, rxn_expression):
+    def _get_single_relative_energies(self, rxn_expression, absolute_energies=None):
         """
         Function to get relative energies for an elementary reaction:
             forward barrier,
@@ -325,6 +390,9 @@ class ParserBase(ModelShell):
         -----------
         rxn_expression: elementary reaction expression, str.
 
+        absolute_energies: Absolute energies of species, model's absolute
+                           energies are used if not provided, dict.
+
         Returns:
         --------
         f_barrier: forward barrier.
@@ -347,17 +415,17 @@ class ParserBase(ModelShell):
         states = rxn_equation.tolist()
 
         # IS energy.
-        G_IS = self._get_state_energy(states[0])
+        G_IS = self._get_state_energy(states[0], absolute_energies)
 
         # FS energy.
-        G_FS = self._get_state_energy(states[-1])
+        G_FS = self._get_state_energy(states[-1], absolute_energies)
 
         # TS energy.
         if len(states) == 2:
             G_TS = max(G_IS, G_FS)
 
         if len(states) == 3:
-            G_TS = self._get_state_energy(states[1])
+            G_TS = self._get_state_energy(states[1], absolute_energies)
 
         # Get relative energies.
         f_barrier = G_TS - G_IS
@@ -367,15 +435,21 @@ class ParserBase(ModelShell):
         return f_barrier, r_barrier, reaction_energy
         # }}}
 
-    def _get_relative_from_absolute(self):
+    def _get_relative_from_absolute(self, absolute_energies=None):
         """
-        Function to set relative energies from absolute energies.
+        Function to get relative energies from absolute energies.
+
+        Parameters:
+        -----------
+        absolute_energies: Absolute energies of species, model's absolute
+                           energies are used if not provided, dict.
         """
         # {{{
         Gafs, Gars, dGs = [], [], []
 
         for rxn_expression in self._owner.rxn_expressions:
-            Gaf, Gar, dG = self._get_single_relative_energies(rxn_expression)
+            Gaf, Gar, dG = self._get_single_relative_energies(rxn_expression,
+                                                              absolute_energies)
             Gafs.append(Gaf)
             Gars.append(Gar)
             dGs.append(dG)
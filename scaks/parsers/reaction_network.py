@@ -0,0 +1,371 @@
+'''
+Module for compact reaction network representation of a kinetic model.
+'''
+
+import numpy as np
+
+from ..utilities.import_utilities import LazyModule
+
+# Heavy packages imported when used.
+sparse = LazyModule("scipy.sparse")
+
+
+class ReactionNetwork(object):
+    ''' Reaction network described by reactant order matrices and stoichiometry
+    matrix, rates of all elementary reactions are calculated using mass-action
+    law in a vectorized way.
+
+    Species in order matrices are ordered as
+    :obj:`adsorbate_names + site_names + gas_names + liquid_names`.
+
+    :param adsorbate_names: Names of adsorbates
+    :type adsorbate_names: tuple of str
+
+    :param site_names: Names of free sites
+    :type site_names: tuple of str
+
+    :param gas_names: Names of gas species
+    :type gas_names: tuple of str
+
+    :param liquid_names: Names of liquid species
+    :type liquid_names: tuple of str
+
+    :param forward_orders: Reactant orders of forward reactions, m x n matrix,
+        m is the number of elementary reactions and n is the number of species.
+    :type forward_orders: numpy.ndarray
+
+    :param reverse_orders: Reactant orders of reverse reactions, m x n matrix.
+    :type reverse_orders: numpy.ndarray
+
+    :param stoichiometry_matrix: Net stoichiometry of adsorbates, m x n_ads matrix,
+        the entry is positive if the adsorbate is produced in forward direction.
+    :type stoichiometry_matrix: numpy.ndarray
+
+    :param site_matrix: Site membership of adsorbates, n_sites x n_ads matrix.
+    :type site_matrix: numpy.ndarray
+
+    :param site_totals: Total coverages of all sites.
+    :type site_totals: tuple of float
+
+    Example::
+        >>> network = model.parser.get_reaction_network()
+        >>> x = network.species_vector(cvgs, pressures, concentrations)
+        >>> rfs, rrs = network.rates(kf, kr, x)
+        >>> dtheta_dt = network.dtheta_dt(rfs, rrs)
+    '''
+    def __init__(self, adsorbate_names, site_names, gas_names, liquid_names,
+                 forward_orders, reverse_orders, stoichiometry_matrix,
+                 site_matrix, site_totals):
+        self.adsorbate_names = tuple(adsorbate_names)
+        self.site_names = tuple(site_names)
+        self.gas_names = tuple(gas_names)
+        self.liquid_names = tuple(liquid_names)
+        self.species_names = (self.adsorbate_names + self.site_names +
+                              self.gas_names + self.liquid_names)
+
+        self.forward_orders = self.__readonly(forward_orders, int)
+        self.reverse_orders = self.__readonly(reverse_orders, int)
+        self.stoichiometry_matrix = self.__readonly(stoichiometry_matrix, int)
+        self.site_matrix = self.__readonly(site_matrix, float)
+        self.site_totals = self.__readonly(site_totals, float)
+
+        # Gather the nonzero orders to evaluate products with only O(nnz) operations.
+        self.__forward_terms = self.__gather(self.forward_orders)
+        self.__reverse_terms = self.__gather(self.reverse_orders)
+
+        # Sparse transposed stoichiometry matrix for dtheta/dt.
+        self.__stoichiometry_T = sparse.csr_matrix(self.stoichiometry_matrix.T.astype(float))
+
+        # Contributions of all partial derivatives to the Jacobian matrices.
+        self.__jacobian_terms = self.__jacobian_structure()
+        self.__rates_jacobian_terms = self.__rates_jacobian_structure()
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+        # Arrays are writable after unpickling.
+        for array in (self.forward_orders, self.reverse_orders,
+                      self.stoichiometry_matrix, self.site_matrix, self.site_totals):
+            array.setflags(write=False)
+
+    @staticmethod
+    def __readonly(array, dtype):
+        """
+        Private helper function to get a read-only copy of an array.
+        """
+        array = np.array(array, dtype=dtype)
+        array.flags.writeable = False
+        return array
+
+    @staticmethod
+    def __gather(orders):
+        """
+        Private helper function to get reaction indices, species indices and
+        orders of all nonzero entries of an order matrix.
+        """
+        rxn_indices, species_indices = np.nonzero(orders)
+        nonzero_orders = orders[rxn_indices, species_indices]
+
+        # Indices of the other entries in the same reaction for partial derivatives,
+        # padded with the index of an extra unit factor.
+        nnz = len(rxn_indices)
+        groups = {}
+        for entry, rxn_idx in enumerate(rxn_indices):
+            groups.setdefault(rxn_idx, []).append(entry)
+        width = max([len(group) for group in groups.values()] + [1]) - 1
+        other_entries = np.full((nnz, width), nnz, dtype=int)
+        for group in groups.values():
+            for entry in group:
+                others = [i for i in group if i != entry]
+                other_entries[entry, :len(others)] = others
+
+        # Python integers are used for arbitrary precision float types.
+        return (rxn_indices, species_indices, nonzero_orders,
+                nonzero_orders.astype(object), other_entries)
+
+    def __chain_matrix(self):
+        """
+        Private helper function to get derivatives of species vector wrt
+        coverages of adsorbates.
+
+        .. note::
+            Coverages of free sites are expressed as (site_total - sum(theta)),
+            the derivatives of free sites are taken into consideration by chain rule.
+        """
+        n_ads, n_sites = len(self.adsorbate_names), len(self.site_names)
+
+        chain_matrix = np.zeros((len(self.species_names), n_ads), dtype=int)
+        chain_matrix[:n_ads, :] = np.eye(n_ads, dtype=int)
+        chain_matrix[n_ads:n_ads+n_sites, :] = -np.rint(self.site_matrix).astype(int)
+
+        return chain_matrix
+
+    def __jacobian_structure(self):
+        """
+        Private helper function to get the contributions of partial derivatives
+        of all rates to the entries of the Jacobian matrix.
+        """
+        n_ads = len(self.adsorbate_names)
+        chain_matrix = self.__chain_matrix()
+
+        entries, targets, coefficients = [], [], []
+        offset = 0
+        for sign, terms in [(1, self.__forward_terms), (-1, self.__reverse_terms)]:
+            rxn_indices, species_indices = terms[:2]
+            for entry, (j, s) in enumerate(zip(rxn_indices, species_indices)):
+                for a in np.nonzero(self.stoichiometry_matrix[j])[0]:
+                    for b in np.nonzero(chain_matrix[s])[0]:
+                        entries.append(offset + entry)
+                        targets.append(a*n_ads + b)
+                        coefficients.append(sign*self.stoichiometry_matrix[j, a]*chain_matrix[s, b])
+            offset += len(rxn_indices)
+
+        entries = np.array(entries, dtype=int)
+        targets = np.array(targets, dtype=int)
+        coefficients = np.array(coefficients, dtype=int)
+
+        return entries, targets, coefficients.astype(float), coefficients.astype(object)
+
+    def __rates_jacobian_structure(self):
+        """
+        Private helper function to get the contributions of partial derivatives
+        of all rates to the entries of the net rates Jacobian matrix.
+        """
+        n_ads = len(self.adsorbate_names)
+        chain_matrix = self.__chain_matrix()
+
+        entries, targets, coefficients = [], [], []
+        offset = 0
+        for sign, terms in [(1, self.__forward_terms), (-1, self.__reverse_terms)]:
+            rxn_indices, species_indices = terms[:2]
+            for entry, (j, s) in enumerate(zip(rxn_indices, species_indices)):
+                for b in np.nonzero(chain_matrix[s])[0]:
+                    entries.append(offset + entry)
+                    targets.append(j*n_ads + b)
+                    coefficients.append(sign*chain_matrix[s, b])
+            offset += len(rxn_indices)
+
+        entries = np.array(entries, dtype=int)
+        targets = np.array(targets, dtype=int)
+        coefficients = np.array(coefficients, dtype=int)
+
+        return entries, targets, coefficients.astype(float), coefficients.astype(object)
+
+    @property
+    def shape(self):
+        """ Query function for numbers of elementary reactions and adsorbates.
+        """
+        return self.stoichiometry_matrix.shape
+
+    def species_vector(self, cvgs, pressures, concentrations):
+        """ Function to get the vector of all species in the network.
+
+        :param cvgs: Coverages of adsorbates
+        :type cvgs: tuple of float
+
+        :param pressures: Pressures of gases in order of gas_names
+        :type pressures: list of float
+
+        :param concentrations: Concentrations of liquids in order of liquid_names
+        :type concentrations: list of float
+
+        :return: Coverages of adsorbates and free sites, pressures and concentrations
+        :rtype: numpy.ndarray
+        """
+        if not isinstance(cvgs, np.ndarray):
+            cvgs = np.array(tuple(cvgs))
+        free_site_cvgs = self.site_totals - self.site_matrix.dot(cvgs)
+
+        return np.concatenate((cvgs, free_site_cvgs,
+                               np.array(pressures), np.array(concentrations)))
+
+    def __rates(self, k, x, terms):
+        """
+        Private helper function to get k*prod(x**orders) for all reactions.
+        """
+        rxn_indices, species_indices, orders, object_orders, _ = terms
+        if x.dtype == object:
+            rates = np.array(k, dtype=object)
+            factors = x[species_indices]**object_orders
+        else:
+            rates = np.array(k, dtype=np.float64)
+            factors = x[species_indices]**orders
+        np.multiply.at(rates, rxn_indices, factors)
+
+        return rates
+
+    def __partials(self, k, x, terms):
+        """
+        Private helper function to get partial derivatives of k*prod(x**orders)
+        wrt the species for all nonzero orders.
+        """
+        rxn_indices, species_indices, orders, object_orders, other_entries = terms
+        if x.dtype == object:
+            k, orders = np.array(k, dtype=object), object_orders
+        else:
+            k = np.array(k, dtype=np.float64)
+
+        bases = x[species_indices]
+        factors = np.append(bases**orders, 1)
+
+        return (k[rxn_indices]*orders*bases**(orders - 1) *
+                np.prod(factors[other_entries], axis=1))
+
+    def rates(self, kf, kr, x):
+        """ Function to get forward and reverse rates of all elementary reactions.
+
+        :param kf: Forward rate constants
+        :type kf: list of float
+
+        :param kr: Reverse rate constants
+        :type kr: list of float
+
+        :param x: The species vector returned by `species_vector()`
+        :type x: numpy.ndarray
+
+        :return: Forward rates and reverse rates
+        :rtype: tuple of numpy.ndarray
+        """
+        return (self.__rates(kf, x, self.__forward_terms),
+                self.__rates(kr, x, self.__reverse_terms))
+
+    def dtheta_dt(self, rfs, rrs):
+        """ Function to get the time derivatives of adsorbate coverages.
+
+        :param rfs: Forward rates
+        :type rfs: numpy.ndarray
+
+        :param rrs: Reverse rates
+        :type rrs: numpy.ndarray
+
+        :return: dtheta/dt of all adsorbates
+        :rtype: numpy.ndarray
+        """
+        net_rates = rfs - rrs
+        if net_rates.dtype == object:
+            return self.stoichiometry_matrix.T.astype(object).dot(net_rates)
+        else:
+            return self.__stoichiometry_T.dot(net_rates)
+
+    @property
+    def jacobian_pattern(self):
+        """ Query function for sparsity pattern of the Jacobian matrix.
+
+        :return: Flags for structurally nonzero entries, n_ads x n_ads matrix
+        :rtype: numpy.ndarray of bool
+        """
+        n_ads = len(self.adsorbate_names)
+        _, targets, coefficients, _ = self.__jacobian_terms
+        pattern = np.zeros(n_ads*n_ads, dtype=bool)
+        pattern[targets[coefficients != 0]] = True
+
+        return pattern.reshape(n_ads, n_ads)
+
+    def jacobian(self, kf, kr, x, dense=True):
+        """ Function to get the Jacobian matrix of dtheta/dt wrt adsorbate coverages.
+
+        :param kf: Forward rate constants
+        :type kf: list of float
+
+        :param kr: Reverse rate constants
+        :type kr: list of float
+
+        :param x: The species vector returned by `species_vector()`
+        :type x: numpy.ndarray
+
+        :param dense: Return dense matrix or sparse matrix, default is True.
+            Sparse matrix is only available for native floats.
+        :type dense: bool
+
+        :return: The Jacobian matrix, n_ads x n_ads
+        :rtype: numpy.ndarray or scipy.sparse.csr_matrix
+        """
+        n_ads = len(self.adsorbate_names)
+        return self.__assemble(kf, kr, x, self.__jacobian_terms, (n_ads, n_ads), dense)
+
+    def rates_jacobian(self, kf, kr, x, dense=True):
+        """ Function to get the Jacobian matrix of net rates of elementary
+        reactions wrt adsorbate coverages.
+
+        :param kf: Forward rate constants
+        :type kf: list of float
+
+        :param kr: Reverse rate constants
+        :type kr: list of float
+
+        :param x: The species vector returned by `species_vector()`
+        :type x: numpy.ndarray
+
+        :param dense: Return dense matrix or sparse matrix, default is True.
+            Sparse matrix is only available for native floats.
+        :type dense: bool
+
+        :return: The Jacobian matrix, n_rxns x n_ads
+        :rtype: numpy.ndarray or scipy.sparse.csr_matrix
+        """
+        return self.__assemble(kf, kr, x, self.__rates_jacobian_terms, self.shape, dense)
+
+    def __assemble(self, kf, kr, x, jacobian_terms, shape, dense):
+        """
+        Private helper function to assemble a Jacobian matrix from partial
+        derivatives of all rates.
+        """
+        partials = np.concatenate((self.__partials(kf, x, self.__forward_terms),
+                                   self.__partials(kr, x, self.__reverse_terms)))
+        entries, targets, coefficients, object_coefficients = jacobian_terms
+        size = shape[0]*shape[1]
+
+        if partials.dtype == object:
+            if not dense:
+                raise ValueError("Sparse Jacobian is only available for native floats.")
+            J = np.zeros(size, dtype=object)
+            np.add.at(J, targets, object_coefficients*partials[entries])
+            return J.reshape(shape)
+
+        values = coefficients*partials[entries]
+        if dense:
+            J = np.bincount(targets, weights=values, minlength=size)
+            return J.reshape(shape)
+        else:
+            rows, cols = np.divmod(targets, shape[1])
+            return sparse.csr_matrix((values, (rows, cols)), shape=shape)
@@ -1,8 +1,6 @@
 import os
 import logging
 
-from scipy.linalg import solve
-
 from .parser_base import *
 from ..functions import *
 
@@ -91,10 +89,7 @@ class RelativeEnergyParser(ParserBase):
 
         # Get relative energies and pass it to model.
         relative_energies = self.__get_relative_energies(energy_data)
-        self._owner._relative_energies = relative_energies
-
-        # Set flags in model.
-        self._owner._has_relative_energy = True
+        self._owner._set_relative_energies(relative_energies)
 
         return
         # }}}
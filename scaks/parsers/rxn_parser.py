@@ -3,8 +3,57 @@ import re
 
 from ..errors.error import *
 
+# Compiled regular expressions shared by all objects.
+STATES_REGEX = re.compile(r'([^\<\>]*)(?:\<?\-\>)' +
+                          r'(?:([^\<\>]*)(?:\<?\-\>))?([^\<\>]*)')
+FORMULA_REGEX = re.compile(r'(\d*)(([\w\*-]*)_(\d*)([a-zA-Z\*]+))')
+SPECIES_REGEX = re.compile(r'([a-zA-Z\*])(\d*)')
 
-class RxnEquation(object):
+
+class InternedObject(object):
+    """ Base class for immutable objects parsed from strings, each distinct
+    string is parsed only once per process and the same object is returned
+    for the same string.
+
+    .. note::
+        Sub-classes must define their own :obj:`_interned` dict, parse the string
+        in :obj:`_parse` and return the string in :obj:`__getnewargs__`.
+    """
+    __slots__ = ()
+
+    def __new__(cls, string):
+        interned = cls._interned
+        try:
+            return interned[string]
+        except KeyError:
+            obj = super(InternedObject, cls).__new__(cls)
+            obj._parse(string)
+            # The same object would be kept if interned by another thread.
+            return interned.setdefault(string, obj)
+
+    def __setattr__(self, name, value):
+        # Attributes can only be set once in parsing.
+        if hasattr(self, name):
+            msg = "Changing attribute of {} is not allowed".format(self.__class__.__name__)
+            raise AttributeError(msg)
+        super(InternedObject, self).__setattr__(name, value)
+
+    def __delattr__(self, name):
+        msg = "Deleting attribute of {} is not allowed".format(self.__class__.__name__)
+        raise AttributeError(msg)
+
+    def __reduce__(self):
+        # Unpickled objects are interned too.
+        return (self.__class__, self.__getnewargs__())
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class RxnEquation(InternedObject):
     """ Class to create reaction equation object.
 
     :param rxn_equation: Elementary reaction expression that follows *scaks* reaction
@@ -17,41 +66,39 @@ class RxnEquation(object):
         >>> rxn = RxnEquation('O2_g + 2*_s <-> O-O_2s -> 2O_s')
 
     """
-    def __init__(self, rxn_equation):
+    __slots__ = ("__rxn_equation", "__states")
+
+    _interned = {}
+
+    def _parse(self, rxn_equation):
         """
-        Constructor.
+        Protected helper function to split reaction equation to chemical states.
         """
         self.__rxn_equation = rxn_equation
 
+        m = STATES_REGEX.search(rxn_equation)
+        if not m:
+            msg = 'Unexpected reaction expression: {}'.format(rxn_equation)
+            raise ValueError(msg)
+
+        self.__states = tuple(ChemState(m.group(idx).strip())
+                              for idx in range(1, 4) if m.group(idx))
+
+    def __getnewargs__(self):
+        return (self.__rxn_equation, )
+
     def tolist(self):
         """ Convert rxn_equation string to rxn_list (chem_state objects).
 
         :return: a list of chemical states
         :rtype: :obj:`list` of :obj:`rxn_equation.ChemState`
         """
-        states_regex = re.compile(r'([^\<\>]*)(?:\<?\-\>)' +
-                                  r'(?:([^\<\>]*)(?:\<?\-\>))?([^\<\>]*)')
-        m = states_regex.search(self.__rxn_equation)
-        state_list = []
-        for idx in range(1, 4):
-            if m.group(idx):
-                chem_state_obj = ChemState(m.group(idx).strip())
-                state_list.append(chem_state_obj)
-
-        return state_list
+        return list(self.__states)
 
     def to_formula_list(self):
         """ Function to get list of formulas for the reaction equation.
         """
-        state_list = []
-
-        for state in self.tolist():
-            formula_list = []
-            for formula in state.tolist():
-                formula_list.append(formula)
-            state_list.append(formula_list)
-
-        return state_list
+        return [state.tolist() for state in self.__states]
 
     def check_conservation(self):
         """ Function to check reaction equation conservation.
@@ -138,14 +185,25 @@ class RxnEquation(object):
         return self.__rxn_equation
 
 
-class ChemState(object):
+class ChemState(InternedObject):
     """
     Class to generate chemical state object.
     """
-    def __init__(self, chem_state):
-        """ Constructor.
+    __slots__ = ("__chem_state", "__formulas", "__elements_dict", "__sites_dict")
+
+    _interned = {}
+
+    def _parse(self, chem_state):
+        """
+        Protected helper function to split state to chemical formulas.
         """
         self.__chem_state = chem_state
+        self.__formulas = tuple(ChemFormula(formula) for formula in self.split())
+        self.__elements_dict = self.__merge_elements_dicts()
+        self.__sites_dict = self.__merge_sites_dicts()
+
+    def __getnewargs__(self):
+        return (self.__chem_state, )
 
     def split(self):
         """ Function to split state to formula string list.
@@ -155,35 +213,34 @@ class ChemState(object):
     def tolist(self):
         """ Function to split state string to chemical formula list.
         """
-        formula_str_list = self.split()
-        formula_list = [ChemFormula(formula) for formula in formula_str_list]
-        return formula_list
+        return list(self.__formulas)
 
     def get_species_site_list(self):
         """ Function to get species_site list of the state.
         """
-        formula_list = self.tolist()
-
-        species_site_list = [formula.species_site() for formula in formula_list]
+        species_site_list = [formula.species_site() for formula in self.__formulas]
 
         return species_site_list
 
     def get_species_site_dict(self):
         """ Function to get species_site dictionary of the state.
         """
-        formula_list = self.tolist()
-
         species_site_dict = {formula.species_site(): formula.stoichiometry()
-                             for formula in formula_list}
+                             for formula in self.__formulas}
 
         return species_site_dict
 
     def get_elements_dict(self):
         """ Function to get element dictionary of the state.
         """
+        return dict(self.__elements_dict)
+
+    def __merge_elements_dicts(self):
+        """
+        Private helper function to merge element dictionaries of all formulas.
+        """
         # Get elements dict of all species.
-        formula_list = self.tolist()
-        elements_dicts = (formula.get_elements_dict() for formula in formula_list)
+        elements_dicts = (formula.get_elements_dict() for formula in self.__formulas)
 
         # Merge all elements dicts.
         merged_dict = {}
@@ -199,9 +256,14 @@ class ChemState(object):
     def get_sites_dict(self):
         """ Function to get sites dictionary of the state.
         """
+        return dict(self.__sites_dict)
+
+    def __merge_sites_dicts(self):
+        """
+        Private helper function to merge site dictionaries of all formulas.
+        """
         # Get sites dict of all formulas.
-        formula_list = self.tolist()
-        sites_dicts = (formula.get_sites_dict() for formula in formula_list)
+        sites_dicts = (formula.get_sites_dict() for formula in self.__formulas)
 
         # Site types that are not included.
         exclusive_sites = ("g", "l")
@@ -261,7 +323,7 @@ class ChemState(object):
         """
         Get tex string.
         """
-        formula_list = self.tolist()
+        formula_list = self.__formulas
         first_sp = formula_list[0]
         tex_str = first_sp.texen()
         for formula in formula_list[1:]:
@@ -284,68 +346,70 @@ class ChemFormulaError(Exception):
     pass
 
 
-class ChemFormula(object):
+class ChemFormula(InternedObject):
     """ Class to generate chemical formula object.
 
     :param formula: A formula for a specific species
     :type formula: str
     """
-    def __init__(self, formula):
+    __slots__ = ("__formula", "__stoich", "__species_site", "__species", "__site",
+                 "__nsite", "__type", "__elements_dict", "__sites_dict")
+
+    _interned = {}
+
+    def _parse(self, formula):
         """
-        Constructor.
+        Protected helper function to split whole formual to
+        stoichiometry, species name, site number, site name.
         """
+        m = FORMULA_REGEX.search(formula)
+        if not m:
+            msg = 'Unexpected chemical formula: {}'.format(formula)
+            raise ChemFormulaError(msg)
+
         self.__formula = formula
-        self.__formula_regex = re.compile(r'(\d*)(([\w\*-]*)_(\d*)([a-zA-Z\*]+))')
-        self.__sp_regex = re.compile(r'([a-zA-Z\*])(\d*)')
+        self.__stoich = int(m.group(1)) if m.group(1) else 1
+        self.__species_site = m.group(2)
+        self.__species = m.group(3)
+        self.__site = m.group(5)
+        self.__nsite = int(m.group(4)) if m.group(4) else 1
+
+        # Species type.
+        if self.__site == "g":
+            self.__type = "gas"
+        elif self.__site == "l":
+            self.__type = "liquid"
+        elif "*" in self.__species_site:
+            self.__type = "site"
+        else:
+            self.__type = "adsorbate"
+
+        # Total elements dict.
+        self.__elements_dict = {elem: self.__stoich*num for elem, num
+                                in self.get_species_elements_dict().items()}
+
+        # Sites dict.
+        self.__sites_dict = {self.__site: self.__nsite*self.__stoich}
 
-        self.__split()
+    def __getnewargs__(self):
+        return (self.__formula, )
 
     def __add__(self, formula_inst):
         """ Overload + operation function.
         """
-        chem_state = self.formula + ' + ' + formula_inst.formula
+        chem_state = self.formula() + ' + ' + formula_inst.formula()
         return ChemState(chem_state)
 
-    def __split(self):
-        """
-        Private helper function to split whole formual to
-        stoichiometry, species name, site number, site name.
-        """
-        m = self.__formula_regex.search(self.__formula)
-        if not m:
-            msg = 'Unexpected chemical formula: {}'.format(self.__formula)
-            raise ChemFormulaError(msg)
-        else:
-            self.__stoich = int(m.group(1)) if m.group(1) else 1
-            self.__species_site = m.group(2)
-            self.__species = m.group(3)
-            self.__site = m.group(5)
-            self.__nsite = int(m.group(4)) if m.group(4) else 1
-
     def type(self):
         """ Function to get species type:  'gas' | 'liquid' | 'adsorbate'
         """
-        if self.__site == "g":
-            return "gas"
-        elif self.__site == "l":
-            return "liquid"
-        else:
-            if "*" in self.__species_site:
-                return "site"
-            else:
-                return "adsorbate"
+        return self.__type
 
     def get_elements_dict(self):
         """
         Function to get elements dictionary of formula.
         """
-        sp_elements_dict = self.get_species_elements_dict()
-
-        # Get total elements dict.
-        elements_dict = {elem: self.__stoich*num
-                         for elem, num in sp_elements_dict.items()}
-
-        return elements_dict
+        return dict(self.__elements_dict)
 
     def get_species_elements_dict(self, species=None):
         """ Split elements of species to element dict.
@@ -363,7 +427,7 @@ class ChemFormula(object):
         if species == "*":
             return {}
 
-        element_list = self.__sp_regex.findall(species)
+        element_list = SPECIES_REGEX.findall(species)
 
         element_dict = {}
         for element, number in element_list:
@@ -378,10 +442,7 @@ class ChemFormula(object):
     def get_sites_dict(self):
         """ Function to get site dictionary of formula.
         """
-        single_dict = dict([(self.__site, self.__nsite)])
-        sites_dict = {site: num*self.__stoich for site, num in single_dict.items()}
-
-        return sites_dict
+        return dict(self.__sites_dict)
 
     def conserve(self, another):
         """ Function to check conservation.
@@ -424,7 +485,7 @@ class ChemFormula(object):
         Private helper function to get tex string of sub-species.
         """
         tex_str = r''
-        splited_tuples = self.__sp_regex.findall(sub_species)
+        splited_tuples = SPECIES_REGEX.findall(sub_species)
 
         for element, n in splited_tuples:
             if n:
@@ -4,8 +4,6 @@ import os
 from ..parsers.rxn_parser import RxnEquation
 from ..errors.error import *
 from .plotter_base import *
-from catplot.ep_components.ep_canvas import EPCanvas
-from catplot.ep_components.ep_lines import ElementaryLine
 
 
 class EnergyProfilePlotter(PlotterBase):
@@ -53,6 +51,10 @@ class EnergyProfilePlotter(PlotterBase):
         :param shadow_depth: shadow depth of the line, default is 0, no shadow.
         :type shadow_depth: int
         '''
+        # NOTE: catplot imports matplotlib, import it only when plotting.
+        from catplot.ep_components.ep_canvas import EPCanvas
+        from catplot.ep_components.ep_lines import ElementaryLine
+
         if not os.path.exists('energy_profile'):
             os.mkdir('energy_profile')
 
@@ -17,11 +17,14 @@ def ODE_integration(model, N):
     span = 1e-2
     init_cvgs = model.solver.coverages
 
-    new_cvgs = model.solver.solve_ode(time_end=end,
-                                      time_span=span,
-                                      initial_cvgs=init_cvgs)[-1]
+    t, new_cvgs, info = model.solver.solve_ode(algo="BDF",
+                                               time_end=end,
+                                               time_span=span,
+                                               initial_cvgs=init_cvgs,
+                                               full_output=True)
 
     if model.log_allowed:
+        model.logger.info('ODE integration stopped at t = %e (%s)', t, info['reason'])
         model.logger.info('generate new initial coverages - success')
 
     return new_cvgs
@@ -0,0 +1,285 @@
+'''
+Module for compiling generated rate expressions to reusable Python functions.
+'''
+
+import hashlib
+import logging
+import os
+
+from ..compatutil import makedirs, replace
+from ..utilities.import_utilities import LazyModule
+
+# Heavy packages imported when used.
+sym = LazyModule("sympy")
+
+
+def kernel_source(name, arguments, statements, returns):
+    """ Generate the source code of a function from a list of assignment statements.
+
+    :param name: The name of the generated function
+    :type name: str
+
+    :param arguments: Argument names of the generated function
+    :type arguments: list of str
+
+    :param statements: Statements executed in order in function body
+    :type statements: list of str
+
+    :param returns: The expression returned by the generated function
+    :type returns: str
+
+    :return: The source code of the function
+    :rtype: str
+    """
+    indent = " "*4
+    body = [indent + statement for statement in statements]
+    body.append(indent + "return " + returns)
+
+    return "def {}({}):\n{}\n".format(name, ", ".join(arguments), "\n".join(body))
+
+
+def load_kernel(name, source, namespace=None):
+    """ Compile the source code of a generated function.
+
+    :param name: The name of the function defined in source
+    :type name: str
+
+    :param source: The source code
+    :type source: str
+
+    :param namespace: Global names used in the function, e.g. {"mpmath": mpmath}
+    :type namespace: dict
+
+    :return: The compiled function
+    :rtype: function
+    """
+    code = compile(source, "<scaks-kernel:{}>".format(name), "exec")
+    global_namespace = dict(namespace) if namespace else {}
+    exec(code, global_namespace)
+
+    return global_namespace[name]
+
+
+def compile_kernel(name, arguments, statements, returns, namespace=None):
+    """ Compile a list of generated assignment statements to a function.
+
+    :param name: The name of the generated function
+    :type name: str
+
+    :param arguments: Argument names of the generated function
+    :type arguments: list of str
+
+    :param statements: Statements executed in order in function body
+    :type statements: list of str
+
+    :param returns: The expression returned by the generated function
+    :type returns: str
+
+    :param namespace: Global names used in the function, default is empty
+    :type namespace: dict
+
+    :return: The compiled function
+    :rtype: function
+
+    Example::
+        >>> f = compile_kernel("rates", ["kf", "theta"],
+                               ["rfs = [0]", "rfs[0] = kf[0]*theta['CO_s']"],
+                               "rfs")
+    """
+    source = kernel_source(name, arguments, statements, returns)
+    return load_kernel(name, source, namespace)
+
+
+def sym_kernel_source(name, arguments, expressions, module):
+    """ Generate the source code of a function evaluating Sympy expressions,
+    common subexpressions are evaluated only once.
+
+    :param name: The name of the generated function
+    :type name: str
+
+    :param arguments: Argument names and the Sympy symbols packed in the arguments,
+        e.g. [("theta", (theta_CO_s, theta_O_s)), ("T", T)]
+    :type arguments: list of tuple
+
+    :param expressions: Sympy expressions to be evaluated
+    :type expressions: list of Sympy.Expr
+
+    :param module: 'mpmath' or 'numpy', the module used for math functions
+    :type module: str
+
+    :return: The source code of the function returning a list of expression values
+    :rtype: str
+    """
+    if module == "mpmath":
+        from sympy.printing.pycode import MpmathPrinter as Printer
+    elif module == "numpy":
+        from sympy.printing.numpy import NumPyPrinter as Printer
+    else:
+        raise ValueError("Unknown module '{}' for symbolic kernel".format(module))
+
+    printer = Printer()
+
+    # Replace symbols with valid variable names unpacked from arguments.
+    replacements = {}
+    statements = []
+    for argument, symbols in arguments:
+        if isinstance(symbols, sym.Basic):
+            replacements[symbols] = sym.Symbol(argument)
+            continue
+
+        if not symbols:
+            continue
+
+        variables = ["{}_{}".format(argument, i) for i in range(len(symbols))]
+        for symbol, variable in zip(symbols, variables):
+            replacements[symbol] = sym.Symbol(variable)
+        statements.append("{}, = {}".format(", ".join(variables), argument))
+
+    expressions = [sym.sympify(expression).xreplace(replacements)
+                   for expression in expressions]
+
+    # Eliminate common subexpressions.
+    subexpressions, expressions = sym.cse(expressions)
+    for variable, subexpression in subexpressions:
+        statements.append("{} = {}".format(printer.doprint(variable),
+                                           printer.doprint(subexpression)))
+
+    returns = "[{}]".format(", ".join(printer.doprint(e) for e in expressions))
+    argument_names = [argument for argument, _ in arguments]
+
+    return kernel_source(name, argument_names, statements, returns)
+
+
+class KernelCache(object):
+    ''' Cache for compiled kernels of a kinetic model.
+
+    Kernels are stored wrt their names and the numerical representation, all
+    cached kernels would be dropped once the signature of the model changes.
+    '''
+    def __init__(self):
+        self.__kernels = {}
+        self.__signature = None
+
+        # Set logger.
+        self.__logger = logging.getLogger("model.solvers.KernelCache")
+
+    def get(self, key, signature, builder):
+        """ Get the compiled kernel, build it if no valid kernel is cached.
+
+        :param key: The key for the kernel, e.g. ("dtheta_dt", "mpmath")
+        :type key: tuple
+
+        :param signature: The signature of the model that the kernel depends on
+        :type signature: any hashable object
+
+        :param builder: The function without argument to build the kernel
+        :type builder: function
+        """
+        if signature != self.__signature:
+            if self.__kernels:
+                self.__logger.debug("model signature changed, drop compiled kernels.")
+            self.__kernels = {}
+            self.__signature = signature
+
+        try:
+            return self.__kernels[key]
+        except KeyError:
+            self.__logger.debug("compiling kernel %s", str(key))
+            kernel = builder()
+            self.__kernels[key] = kernel
+            return kernel
+
+    def clear(self):
+        """ Drop all compiled kernels.
+        """
+        self.__kernels = {}
+        self.__signature = None
+
+    def __contains__(self, key):
+        return key in self.__kernels
+
+    def __len__(self):
+        return len(self.__kernels)
+
+
+class KernelStore(object):
+    ''' On-disk store for source code of generated kernels.
+
+    Source files are named by the kernel name and the digest of a key which
+    identifies everything the generated code depends on, so a stored kernel
+    could be reused by any model with the same key. The key is also written
+    in the first line of the file and checked before the code is loaded.
+
+    :param dirname: The directory for source files, created when needed
+    :type dirname: str
+    '''
+    def __init__(self, dirname):
+        self.dirname = dirname
+
+        # Set logger.
+        self.__logger = logging.getLogger("model.solvers.KernelStore")
+
+    def filename(self, name, key):
+        """ Get the source file name of a kernel.
+
+        :param name: The kernel name
+        :type name: str
+
+        :param key: The key of the kernel, must have a stable repr
+        :type key: any
+        """
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.dirname, "{}_{}.py".format(name, digest))
+
+    @staticmethod
+    def header(name, key):
+        """ Get the first line of the source file of a kernel.
+
+        :param name: The kernel name
+        :type name: str
+
+        :param key: The key of the kernel, must have a stable repr
+        :type key: any
+        """
+        return "# scaks kernel {}: {!r}\n".format(name, key)
+
+    def get(self, name, key, generator):
+        """ Get the source code of a kernel, generate and store it if not found
+        or if the stored file is not generated with the same key.
+
+        :param name: The kernel name
+        :type name: str
+
+        :param key: The key of the kernel, must have a stable repr
+        :type key: any
+
+        :param generator: The function without argument to generate the source code
+        :type generator: function
+
+        :return: The source code
+        :rtype: str
+        """
+        filename = self.filename(name, key)
+        header = self.header(name, key)
+        if os.path.exists(filename):
+            with open(filename, "r") as f:
+                stored_header = f.readline()
+                if stored_header == header:
+                    return stored_header + f.read()
+            self.__logger.warning("key mismatch in kernel source %s, regenerate it", filename)
+
+        self.__logger.debug("generating kernel source %s", filename)
+        source = header + generator()
+
+        # Write to a temporary file then rename it, other processes may write the same file.
+        try:
+            if not os.path.exists(self.dirname):
+                makedirs(self.dirname)
+            tmp_filename = "{}.{}.tmp".format(filename, os.getpid())
+            with open(tmp_filename, "w") as f:
+                f.write(source)
+            replace(tmp_filename, filename)
+        except OSError as e:
+            self.__logger.warning("failed to store kernel source %s: %s", filename, e)
+
+        return source
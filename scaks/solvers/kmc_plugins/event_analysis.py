@@ -2,25 +2,18 @@ import logging
 
 from prettytable import PrettyTable
 
-try:
-    from KMCLib import KMCAnalysisPlugin
-except ImportError:
-    print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-    print("!!!                                                    !!!")
-    print("!!!         WARNING: KMCLibX is not installed          !!!")
-    print("!!! Any kMC calculation using KMCLibX will be disabled !!!")
-    print("!!!                                                    !!!")
-    print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-
-try:
-    from .solvers.kmc_plugins.plugin_backends.kmc_functions import *
-except ImportError:
-    print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-    print("!!!   WARNING: plugin backends extension not found.   !!!")
-    print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-    from .kmc_functions import *
+# NOTE: plugins are imported only when kMC solver runs with analysis.
+from KMCLib import KMCAnalysisPlugin
 
 from ...mpicommons import mpi
+from ...utilities.import_utilities import import_optional
+
+# Use compiled plugin backends if available.
+if import_optional(".plugin_backends.kmc_functions", "compiled kMC plugin backends",
+                   package=__package__) is not None:
+    from .plugin_backends.kmc_functions import *
+else:
+    from .kmc_functions import *
 
 
 class EventAnalysis(KMCAnalysisPlugin):
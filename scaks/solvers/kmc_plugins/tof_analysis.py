@@ -1,15 +1,8 @@
 import logging
 from operator import mul
 
-try:
-    from KMCLib import KMCAnalysisPlugin
-except ImportError:
-    print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-    print("!!!                                                    !!!")
-    print("!!!         WARNING: KMCLibX is not installed          !!!")
-    print("!!! Any kMC calculation using KMCLibX will be disabled !!!")
-    print("!!!                                                    !!!")
-    print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
+# NOTE: plugins are imported only when kMC solver runs with analysis.
+from KMCLib import KMCAnalysisPlugin
 
 from ... import file_header
 from ...compatutil import reduce
@@ -3,16 +3,6 @@ import importlib
 import time
 from math import exp
 
-try:
-    from KMCLib import *
-except ImportError:
-    print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-    print("!!!                                                   !!!")
-    print("!!!          WARNING: KMCLib is not installed         !!!")
-    print("!!! Any kMC calculation using KMCLib will be disabled !!!")
-    print("!!!                                                   !!!")
-    print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-
 from ..descriptors.descriptors import Property
 from .. import __version__
 from ..errors.error import *
@@ -21,6 +11,7 @@ from ..database.lattice_data import *
 from .solver_base import SolverBase
 from ..utilities.profiling_utitlities import do_cprofile
 from ..utilities.check_utilities import check_process_dict
+from ..utilities.import_utilities import import_optional
 
 
 class KMCSolver(SolverBase):
@@ -33,6 +24,9 @@ class KMCSolver(SolverBase):
         # set logger
         self.__logger = logging.getLogger('model.solvers.KMCSolver')
 
+        # KMCLib is only imported when kMC solver is used.
+        import_optional("KMCLib", "any kMC calculation using KMCLib")
+
         # scripting header
         self.__script_header = (
             '# This file was automatically generated by scaks' +
@@ -59,6 +53,8 @@ class KMCSolver(SolverBase):
 
         """
         # {{{
+        from KMCLib import KMCInteractions, KMCLatticeModel
+
         # Get analysis.
         analysis_name = self._owner.analysis
         if analysis_name:
@@ -121,6 +117,8 @@ class KMCSolver(SolverBase):
         Private helper function to convert a process dict to KMCLibProcess object.
         """
         # {{{
+        from KMCLib import KMCProcess
+
         # Check process dict.
         process_dict = check_process_dict(process_dict)
 
@@ -262,6 +260,7 @@ class KMCSolver(SolverBase):
             control_params.update(redistribution_dict)
 
         # KMCLib control parameter instantiation
+        from KMCLib import KMCControlParameters
         control_parameters = KMCControlParameters(**control_params)
 
         return control_parameters
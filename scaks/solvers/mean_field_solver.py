@@ -1,16 +1,85 @@
 import copy
 import logging
+import re
 
 import mpmath as mp
 import numpy as np
-import sympy as sym
 
+from .. import __version__
 from ..compatutil import merge_two_dicts
 from ..descriptors.descriptors import Memoized, Property
 from ..functions import *
 from ..parsers.rxn_parser import RxnEquation, ChemFormula
+from ..utilities.import_utilities import LazyModule
+from .kernels import kernel_source, load_kernel, sym_kernel_source, KernelCache, KernelStore
 from .solver_base import SolverBase
 
+# Heavy packages imported when used.
+sym = LazyModule("sympy")
+linalg = LazyModule("scipy.linalg")
+
+
+def float_matrix(*args):
+    """ Create float64 NumPy array in the way of mpmath.matrix.
+
+    Example::
+        >>> float_matrix([0.1, 0.2])  # a vector
+        >>> float_matrix(2, 2)        # 2 x 2 zero matrix
+    """
+    if len(args) == 1:
+        return np.array(args[0], dtype=np.float64)
+    else:
+        return np.zeros(args, dtype=np.float64)
+
+
+def lapack_solve(A, b):
+    """ Solve linear equations Ax=b using LAPACK.
+
+    .. note::
+        ZeroDivisionError is raised for singular matrix just like mpmath.lu_solve.
+    """
+    try:
+        return linalg.solve(np.asarray(A, dtype=np.float64), np.asarray(b, dtype=np.float64))
+    except linalg.LinAlgError as e:
+        raise ZeroDivisionError(str(e))
+
+
+def lapack_lu_factor(A):
+    """ Get LU factorization of matrix A using LAPACK, the factorization
+    can be reused by :obj:`lapack_lu_solve` for different b.
+    """
+    lu, piv = linalg.lu_factor(np.asarray(A, dtype=np.float64))
+    if not np.all(np.diag(lu)):
+        raise ZeroDivisionError("matrix is singular")
+    return lu, piv
+
+
+def lapack_lu_solve(factorization, b):
+    """ Solve linear equations Ax=b using LU factorization of A from
+    :obj:`lapack_lu_factor`.
+    """
+    return linalg.lu_solve(factorization, np.asarray(b, dtype=np.float64))
+
+
+def mpmath_lu_factor(A):
+    """ Get LU factorization of matrix A using mpmath, the factorization
+    can be reused by :obj:`mpmath_lu_solve` for different b.
+    """
+    # NOTE: use extra precision just like mpmath.lu_solve.
+    with mp.extraprec(10):
+        return mp.mp.LU_decomp(mp.matrix(A))
+
+
+def mpmath_lu_solve(factorization, b):
+    """ Solve linear equations Ax=b using LU factorization of A from
+    :obj:`mpmath_lu_factor`.
+    """
+    LU, p = factorization
+    with mp.extraprec(10):
+        # NOTE: b is copied since L_solve swaps rows of b in place.
+        y = mp.mp.L_solve(LU, mp.matrix(b).copy(), p)
+        return mp.mp.U_solve(LU, y)
+
 
 class MeanFieldSolver(SolverBase):
     """ A class acts as a base class to be inherited by other solver classes,
@@ -37,18 +106,23 @@ class MeanFieldSolver(SolverBase):
         self._rxns_list = self._owner.elementary_rxns_list
         self._rxns_num = len(self._rxns_list)
 
-        # set constants symbol dict
-        self._kB_sym, self._h_sym, self._T_sym = sym.symbols('kB, h, T', is_real=True)
-
-        # Constant symbols substitution dict.
-        self._constants_subs_dict = {
-            self._kB_sym: self._mpf(self._owner.kB),
-            self._h_sym: self._mpf(self._owner.h),
-            self._T_sym: self._mpf(self._owner.temperature),
-        }
+        # Values of constants kB, h and T.
+        self._constants = [self._mpf(self._owner.kB),
+                           self._mpf(self._owner.h),
+                           self._mpf(self._owner.temperature)]
 
         # classify adsorbates according to site type
         self._classified_adsorbates = self.__classify_adsorbates()
+
+        # Index-based coverage state.
+        self.__set_coverage_indices()
+        self._set_site_totals()
+
+        # Compiled rate expression kernels.
+        self._kernels = KernelCache()
+
+        # Version of data got from model, updated by get_data().
+        self._data_version = 0
         # }}}
 
     def __set_numerical_representation(self):
@@ -64,7 +138,23 @@ class MeanFieldSolver(SolverBase):
             self._mpf = mp.mpf
             self._matrix = mp.matrix
             self._Axb_solver = mp.lu_solve
+            self._LU_factor = mpmath_lu_factor
+            self._LU_solve = mpmath_lu_solve
             self._norm = lambda x: mp.norm(x, p=2)
+            self._vectorized = False
+            self._cvg_dtype = object
+        # NumPy float64.
+        elif self._owner.numerical_representation == 'numpy':
+            self._math = np
+            self._linalg = np.linalg
+            self._mpf = np.float64
+            self._matrix = float_matrix
+            self._Axb_solver = lapack_solve
+            self._LU_factor = lapack_lu_factor
+            self._LU_solve = lapack_lu_solve
+            self._norm = lambda x: np.linalg.norm(x, ord=2)
+            self._vectorized = True
+            self._cvg_dtype = np.float64
 #        # Gmpy2.
 #        elif self._owner.numerical_representation == 'gmpy':
 #            gmpy2.get_context().precision = 3*self._owner.decimal_precision
@@ -128,32 +218,210 @@ class MeanFieldSolver(SolverBase):
 
         return classified_adsorbates
 
-    def _cvg_tuple2dict(self, cvgs_tuple):
+    def __set_coverage_indices(self):
         """
-        Protected function to convert coverages list to corresponding coverages dict.
+        Private helper function to set indices of coverages in the coverage vector,
+        which is ordered as :obj:`adsorbate_names + site_names`.
+        """
+        adsorbate_names = tuple(self._owner.adsorbate_names)
+        site_names = tuple(self._owner.site_names)
+
+        # Names in order of the coverage vector, dict iteration order is arbitrary in Python 2.
+        self._cvg_names = adsorbate_names + site_names
+        self._cvg_indices = {name: idx for idx, name in enumerate(self._cvg_names)}
+
+        # Indices of adsorbates on each type of site.
+        self._site_adsorbate_indices = [
+            np.array([self._cvg_indices[name] for name in self._classified_adsorbates[site_name]],
+                     dtype=int)
+            for site_name in site_names
+        ]
+
+        # Site type index of each adsorbate, for grouped sums over sites.
+        adsorbate_sites = np.zeros(len(adsorbate_names), dtype=int)
+        for site_idx, adsorbate_indices in enumerate(self._site_adsorbate_indices):
+            adsorbate_sites[adsorbate_indices] = site_idx
+        self._adsorbate_sites = adsorbate_sites
+
+    def _set_site_totals(self):
         """
+        Protected helper function to set total coverages of sites and upper
+        bounds of adsorbate coverages, called when site definitions are loaded.
+        """
+        species_definitions = self._owner.species_definitions
+        totals = [species_definitions[site_name]['total'] for site_name in self._owner.site_names]
+        self._site_totals = np.array(totals, dtype=self._cvg_dtype)
 
-        # NOTE: there are some small errors when convert tuple to dict
-        #       which is so small that we can ignore it
+        # Coverage of an adsorbate is not larger than 1.0 and total of its site.
+        self._cvg_upper_bounds = np.array([self._mpf(min(1.0, totals[site_idx]))
+                                           for site_idx in self._adsorbate_sites],
+                                          dtype=self._cvg_dtype)
 
-        # Create cvgs_dict containing adsorbates
-        cvgs_dict = {}
-        adsorbate_names = self._owner.adsorbate_names
-        for adsorbate_name in adsorbate_names:
-            idx = adsorbate_names.index(adsorbate_name)
-            cvgs_dict.setdefault(adsorbate_name, cvgs_tuple[idx])
+    def _get_site_cvgs(self, cvgs):
+        """
+        Protected helper function to get sums of adsorbate coverages on all sites.
 
-        # Add free site coverages
-        species_definitions = self._owner.species_definitions
-        for site_name in self._owner.site_names:
-            total_cvg = species_definitions[site_name]['total']
-            sum_cvg = 0.0
-            for sp in self._classified_adsorbates[site_name]:
-                sum_cvg += cvgs_dict[sp]
-            free_site_cvg = total_cvg - sum_cvg
-            cvgs_dict.setdefault(site_name, free_site_cvg)
+        :param cvgs: Coverages of adsorbates
+        :type cvgs: numpy.ndarray
+        """
+        site_cvgs = np.zeros(len(self._site_totals), dtype=cvgs.dtype)
+        np.add.at(site_cvgs, self._adsorbate_sites, cvgs)
+
+        return site_cvgs
+
+    def _get_cvg_vector(self, cvgs_tuple):
+        """
+        Protected helper function to get coverages of adsorbates and free sites
+        in order of :obj:`adsorbate_names + site_names`.
+
+        :param cvgs_tuple: Coverages of adsorbates
+        :type cvgs_tuple: tuple of float
+        """
+        cvgs = np.array(tuple(cvgs_tuple), dtype=self._cvg_dtype)
+        free_site_cvgs = self._site_totals - self._get_site_cvgs(cvgs)
+
+        return np.concatenate((cvgs, free_site_cvgs))
+
+    def _index_coverages(self, source):
+        """
+        Protected helper function to replace coverages dict items like
+        :obj:`theta['CO_s']` in kernel source by items of coverage vector.
+        """
+        def index(m):
+            return "theta[{}]".format(self._cvg_indices[m.group(1)])
+
+        return re.sub(r"theta\['([^']+)'\]", index, source)
+
+    def _kernel_signature(self):
+        """
+        Protected helper function to get the model signature which compiled kernels depend on.
+        """
+        species_definitions = self._owner.parser.species_definitions
+        site_totals = tuple(species_definitions[site_name]['total']
+                            for site_name in self._owner.site_names)
+
+        return (tuple(self._owner.rxn_expressions), site_totals)
+
+    def _get_kernel(self, name, builder):
+        """
+        Protected helper function to get a compiled kernel for current
+        numerical representation, the kernel would be compiled only once.
+
+        :param name: The kernel name
+        :type name: str
+
+        :param builder: The function without argument to compile the kernel
+        :type builder: function
+        """
+        key = (name, self._owner.numerical_representation)
+        return self._kernels.get(key, self._kernel_signature(), builder)
+
+    def _get_network(self):
+        """
+        Protected helper function to get the reaction network of the model.
+        """
+        return self._get_kernel("network", self._owner.parser.get_reaction_network)
+
+    def _get_sym_kernel(self, name, get_expressions):
+        """
+        Protected helper function to get a compiled kernel evaluating symbolic expressions,
+        the kernel takes the arguments returned by :obj:`_get_sym_arguments`.
+
+        The generated source code is stored in the directory :obj:`sym_kernel_dir`
+        of the model and reused by all models with the same reaction network.
+
+        :param name: The kernel name
+        :type name: str
+
+        :param get_expressions: The function without argument to get expressions to be evaluated
+        :type get_expressions: function
+        """
+        module = "numpy" if self._owner.numerical_representation == "numpy" else "mpmath"
+
+        def generate():
+            if not self._has_symbols:
+                self.get_data_symbols()
+            arguments = [("theta", self._ads_theta_sym), ("Ga", self._Ga_sym),
+                         ("dG", self._dG_sym), ("p", self._p_sym), ("c", self._c_sym),
+                         ("kB", self._kB_sym), ("h", self._h_sym), ("T", self._T_sym)]
+            return sym_kernel_source(name, arguments, get_expressions(), module)
+
+        def build():
+            if self._owner.sym_kernel_dir:
+                store = KernelStore(self._owner.sym_kernel_dir)
+                key = (__version__, sym.__version__, module, self._kernel_signature(),
+                       tuple(self._owner.adsorbate_names), tuple(self._owner.gas_names),
+                       tuple(self._owner.liquid_names), tuple(self._owner.site_names))
+                source = store.get(name, key, generate)
+            else:
+                source = generate()
+            return load_kernel(name, source, {"mpmath": mp, "numpy": np})
+
+        return self._get_kernel("sym_" + name, build)
+
+    def _get_sym_arguments(self, cvgs_tuple=None):
+        """
+        Protected helper function to get arguments of compiled symbolic kernels.
+
+        :param cvgs_tuple: optional, adsorbate coverages, zeros if not supplied
+        :type cvgs_tuple: tuple of float
+        """
+        if cvgs_tuple is None:
+            cvgs_tuple = [0.0]*len(self._owner.adsorbate_names)
+
+        relative_energies = self._owner.relative_energies
+        kB, h, T = self._constants
+
+        return ([self._mpf(cvg) for cvg in cvgs_tuple],
+                [self._mpf(Ga) for Ga in relative_energies["Gaf"]],
+                [self._mpf(dG) for dG in relative_energies["dG"]],
+                [self._mpf(self._p[gas_name]) for gas_name in self._owner.gas_names],
+                [self._mpf(self._c[liquid_name]) for liquid_name in self._owner.liquid_names],
+                self._mpf(kB), self._mpf(h), self._mpf(T))
+
+    def _get_tof_matrix(self):
+        """
+        Protected helper function to get the net stoichiometry matrix of gases
+        (and liquids), n_rxns x n_gases, positive for products.
+        """
+        def build():
+            _, reapro_matrix = self._owner.parser.get_stoichiometry_matrices()
+            tof_matrix = -np.rint(reapro_matrix).astype(int)
+            tof_matrix.setflags(write=False)
+            return tof_matrix
+
+        return self._get_kernel("tof_matrix", build)
+
+    def _get_network_species(self, cvgs_tuple):
+        """
+        Protected helper function to get the species vector of the reaction network.
+        """
+        network = self._get_network()
+        p = [self._p[gas_name] for gas_name in network.gas_names]
+        c = [self._c[liquid_name] for liquid_name in network.liquid_names]
+
+        return network.species_vector(cvgs_tuple, p, c)
+
+    def _get_network_rates(self, cvgs_tuple, relative_energies=None):
+        """
+        Protected helper function to get forward and reverse rates using
+        vectorized mass-action law of the reaction network.
+        """
+        x = self._get_network_species(cvgs_tuple)
+        kf, kr = self.get_rate_constants(relative_energies=relative_energies)
 
-        return cvgs_dict
+        return self._get_network().rates(kf, kr, x)
+
+    def _cvg_tuple2dict(self, cvgs_tuple):
+        """
+        Protected function to convert coverages list to corresponding coverages dict.
+
+        .. note::
+            Only for output, solver internals use the coverage vector from
+            :obj:`_get_cvg_vector`.
+        """
+        cvgs_vector = self._get_cvg_vector(cvgs_tuple)
+        return dict(zip(self._cvg_names, cvgs_vector))
 
     def _cvg_dict2tuple(self, cvgs_dict):
         """
@@ -183,7 +451,47 @@ class MeanFieldSolver(SolverBase):
             c_dict.setdefault(liquid_name, self._mpf(concentration))
         self._c = c_dict
 
-    @Memoized
+        # Temperature for symbolic expressions.
+        self._constants[2] = self._mpf(self._owner.temperature)
+
+        # Site totals for coverage vector.
+        self._set_site_totals()
+
+        # Memoized values depending on data are outdated.
+        self._data_version += 1
+
+    def _rate_constants_key(self, relative_energies=None, log=False):
+        """
+        Protected helper function to get the fingerprint of rate constants
+        wrt the energies, temperature and pressures.
+
+        .. note::
+            Energies of the model and data got by :obj:`get_data` are identified
+            by their versions, only energies passed in are compared by contents.
+        """
+        if relative_energies:
+            energies = tuple((key, tuple(value))
+                             for key, value in sorted(relative_energies.items()))
+        else:
+            energies = self._owner._relative_energies_version
+
+        return (energies, self._data_version, self._owner.temperature, log)
+
+    def clear_cache(self):
+        """ Drop all memoized values and compiled kernels of the solver.
+
+        .. note::
+            Memoized values are checked with the versions of energies and data,
+            and the temperature, this function is only needed to release memory
+            or after modification of the model's energies in place.
+        """
+        for name in ("get_rate_constants", "poly_adsorbate_derivation"):
+            method = getattr(self, name, None)
+            if method is not None:
+                method.cache_clear()
+        self._kernels.clear()
+
+    @Memoized(maxsize=256, key=lambda self, **kwargs: self._rate_constants_key(**kwargs))
     def get_rate_constants(self, relative_energies=None, log=False):
         """ Function to get rate constants for all elementary reactions
         using Transition State Theory.
@@ -382,6 +690,22 @@ class MeanFieldSolver(SolverBase):
 
         return f_rate_expressions, r_rate_expressions
 
+    def _compile_rates_kernel(self):
+        """
+        Protected helper function to compile rate expressions to a function.
+        """
+        def generate():
+            f_rate_expressions, r_rate_expressions = self.get_rate_expressions()
+            statements = (["rfs, rrs = [0]*{n}, [0]*{n}".format(n=self._rxns_num)] +
+                          f_rate_expressions + r_rate_expressions)
+            return kernel_source("rates", ["kf", "kr", "theta", "p", "c"],
+                                 statements, "rfs, rrs")
+
+        # Source code is cached with other reaction network data.
+        source = self._owner.model_cache.get("rates_kernel", generate)
+
+        return load_kernel("rates", self._index_coverages(source))
+
     def get_rates(self, cvgs_tuple, relative_energies=None, log=False):
         """ Function to get forward and reverse rates list.
 
@@ -400,28 +724,24 @@ class MeanFieldSolver(SolverBase):
         :return: Forward rates and reverse rates
         :rtype: tuple of float.
         """
-        # Coverages(theta).
-        theta = self._cvg_tuple2dict(cvgs_tuple)
-
-        # Rate constants(kf, kr).
-        kf, kr = self.get_rate_constants(relative_energies=relative_energies)
-
-        # Pressure.
-        p = self._p
+        if self._vectorized:
+            rfs, rrs = self._get_network_rates(cvgs_tuple, relative_energies)
+        else:
+            # Coverages(theta) of adsorbates and free sites, list is faster for item access.
+            theta = self._get_cvg_vector(cvgs_tuple).tolist()
 
-        # Concentration.
-        c = self._c
+            # Rate constants(kf, kr).
+            kf, kr = self.get_rate_constants(relative_energies=relative_energies)
 
-        # Rate list.
-        rfs, rrs = [0]*self._rxns_num, [0]*self._rxns_num
+            # Pressure.
+            p = self._p
 
-        # Rate expressions.
-        rate_expressions = self.get_rate_expressions()
+            # Concentration.
+            c = self._c
 
-        # Calculate rates.
-        for exprs_list in rate_expressions:
-            exprs_str = '\n'.join(exprs_list)
-            exec(exprs_str)
+            # Calculate rates.
+            rates_kernel = self._get_kernel("rates", self._compile_rates_kernel)
+            rfs, rrs = rates_kernel(kf, kr, theta, p, c)
 
         if self._owner.log_allowed and log:
             self.__log_rates(rfs, rrs, "R_forward", "R_reverse")
@@ -532,10 +852,7 @@ class MeanFieldSolver(SolverBase):
         net_rates = self.get_net_rates(cvgs, relative_energies)
 
         # Get turnover frequencies.
-        _, reapro_matrix = self._owner.parser.get_stoichiometry_matrices()
-        reapro_matrix *= -1
-        rate_vector = np.matrix(net_rates)  # get rate vector
-        tof_list = (rate_vector*reapro_matrix).tolist()[0]
+        tof_list = self.get_tofs([net_rates])[0].tolist()
 
         # log TOFs
         self.__log_tof(tof_list, self._owner.gas_names)
@@ -555,6 +872,28 @@ class MeanFieldSolver(SolverBase):
             idx = gas_names.index(gas_name)
             return tof_list[idx]
 
+    def get_tofs(self, net_rates):
+        """ Function to get the turnover frequencies(TOF) wrt all gas species
+        for a batch of net rates.
+
+        :param net_rates: Net rates of elementary reactions, n_points x n_rxns
+        :type net_rates: list of list of float or numpy.ndarray
+
+        :returns: TOFs for all gas species, n_points x n_gases
+        :rtype: numpy.ndarray
+
+        Example::
+            >>> net_rates = [solver.get_net_rates(cvgs) for cvgs in cvgs_list]
+            >>> tofs = solver.get_tofs(net_rates)
+        """
+        net_rates = np.asarray(net_rates)
+        if net_rates.ndim != 2 or net_rates.shape[1] != len(self._owner.rxn_expressions):
+            msg = "Shape of net rates must be (n_points, {}), but {} is supplied"
+            msg = msg.format(len(self._owner.rxn_expressions), net_rates.shape)
+            raise ParameterError(msg)
+
+        return net_rates.dot(self._get_tof_matrix())
+
     def __log_tof(self, tof_list, gas_names):
         """
         Private helper function to log TOF of every gas species.
@@ -619,6 +958,28 @@ class MeanFieldSolver(SolverBase):
     ######                                          ######
     ######################################################
 
+    # NOTE: symbols of constants are created when used to avoid importing
+    #       sympy for numerical calculations, sympy caches symbols, so
+    #       symbols of the same name are always equal.
+
+    @Property
+    def _kB_sym(self):
+        return sym.Symbol('kB', is_real=True)
+
+    @Property
+    def _h_sym(self):
+        return sym.Symbol('h', is_real=True)
+
+    @Property
+    def _T_sym(self):
+        return sym.Symbol('T', is_real=True)
+
+    @Property
+    def _constants_subs_dict(self):
+        """ Query function for substitution dict of constant symbols.
+        """
+        return dict(zip((self._kB_sym, self._h_sym, self._T_sym), self._constants))
+
     def get_data_symbols(self):
         """ Get Sympy Symbol objects for P, G, coverage.
 
@@ -896,51 +1257,43 @@ class MeanFieldSolver(SolverBase):
         # }}}
 
     def get_rate_constants_by_sym(self):
-        """ Function to get rate constants values by back substitution to symbol expressions.
+        """ Function to get rate constants values by compiled rate constant symbol expressions.
         """
-        # Rate constant symbols.
-        kf_syms, kr_syms = self.get_rate_constant_syms()
+        def get_expressions():
+            kf_syms, kr_syms = self.get_rate_constant_syms()
+            return list(kf_syms) + list(kr_syms)
 
-        # Substitution dict(need G_dict and constants dict)
-        subs_dict = self.get_subs_dict()
+        kernel = self._get_sym_kernel("rate_constants", get_expressions)
+        ks = kernel(*self._get_sym_arguments())
 
         # Collect kfs & krs values.
-        kfs, krs = [], []
-
-        for kf_sym in kf_syms:
-            kf = self._mpf(kf_sym.evalf(subs=subs_dict))
-            kfs.append(kf)
-
-        for kr_sym in kr_syms:
-            kr = self._mpf(kr_sym.evalf(subs=subs_dict))
-            krs.append(kr)
+        n = len(ks)//2
+        kfs = [self._mpf(k) for k in ks[: n]]
+        krs = [self._mpf(k) for k in ks[n:]]
 
         return kfs, krs
 
     def get_rates_by_sym(self, cvgs_tuple):
         """
-        Function to get forward and reverse rates for all elementary reactions.
+        Function to get forward and reverse rates for all elementary reactions
+        by compiled rate symbol expressions.
 
         :param cvgs_tuple: Coverages rate calculating
         :type cvgs_tuple: tuple of float
 
         :return: Forward rates and reverse rates
         """
-        # Get rate symbols.
-        rf_syms, rr_syms = self.get_rate_syms()
+        def get_expressions():
+            rf_syms, rr_syms = self.get_rate_syms()
+            return list(rf_syms) + list(rr_syms)
 
-        # Substitution dict(need G, theta, p, constants dicts).
-        subs_dict = self.get_subs_dict(coverages=cvgs_tuple)
+        kernel = self._get_sym_kernel("rates", get_expressions)
+        rates = kernel(*self._get_sym_arguments(cvgs_tuple))
 
         # Calculate rfs & rrs values.
-        rfs, rrs = [], []
-        for rf_sym in rf_syms:
-            rf = self._mpf(float(rf_sym.evalf(subs=subs_dict)))
-            rfs.append(rf)
-
-        for rr_sym in rr_syms:
-            rr = self._mpf(float(rr_sym.evalf(subs=subs_dict)))
-            rrs.append(rr)
+        n = len(rates)//2
+        rfs = [self._mpf(rate) for rate in rates[: n]]
+        rrs = [self._mpf(rate) for rate in rates[n:]]
 
         self.archive_data('rates', (rfs, rrs))
 
@@ -989,7 +1342,7 @@ class MeanFieldSolver(SolverBase):
         c_dict = {}
         liquid_names = self._owner.liquid_names
         for c_sym, liquid_name in zip(self._c_sym, liquid_names):
-            c_dict.setdefault(c_sym, self._c[liquid_names])
+            c_dict.setdefault(c_sym, self._c[liquid_name])
 
         return c_dict
 
@@ -1007,23 +1360,15 @@ class MeanFieldSolver(SolverBase):
     def get_net_rates_by_sym(self, cvgs_tuple):
         # {{{
         """
-        Function to get net rates for all elementary reactions by symbol derivation.
-        """
-
-        # Net rate symbols.
-        net_rate_syms = self.get_net_rate_syms()
-
-        # Substitution dict.
-        subs_dict = self.get_subs_dict(coverages=cvgs_tuple)
-
-        # Back substitution.
-        net_rate_syms_vect = sym.Matrix(net_rate_syms)
-        net_rates_vect = net_rate_syms_vect.evalf(subs=subs_dict)
+        Function to get net rates for all elementary reactions by compiled net rate symbol expressions.
 
-        # Keep precision.
-        net_rates_vect = [self._mpf(float(net_rate)) for net_rate in net_rates_vect]
+        :param cvgs_tuple: coverages for all adsorbates
+        :type cvgs_tuple: tuple of float
+        """
+        kernel = self._get_sym_kernel("net_rates", self.get_net_rate_syms)
+        net_rates = kernel(*self._get_sym_arguments(cvgs_tuple))
 
-        net_rates_tup = tuple(net_rates_vect)
+        net_rates_tup = tuple(self._mpf(net_rate) for net_rate in net_rates)
 
         # Archive.
         self.archive_data('net_rates', net_rates_tup)
@@ -1049,18 +1394,13 @@ class MeanFieldSolver(SolverBase):
         return tof_tup
 
     def get_tof_by_sym(self, cvgs_tuple):
-        """ Function to get TOFs for all gas species.
+        """ Function to get TOFs for all gas species by compiled TOF symbol expressions.
 
         :param cvgs_tuple: coverages for all adsorbates
         :type cvgs_tuple: tuple of float
         """
-        # Get tof vector.
-        tof_syms_vect = sym.Matrix(self.get_tof_syms())
-        subs_dict = self.get_subs_dict(coverages=cvgs_tuple)
-        tof_vect = tof_syms_vect.evalf(subs=subs_dict)
-
-        # Keep precision.
-        tof_vect = [self._mpf(float(tof)) for tof in tof_vect]
+        kernel = self._get_sym_kernel("tofs", self.get_tof_syms)
+        tof_vect = [self._mpf(tof) for tof in kernel(*self._get_sym_arguments(cvgs_tuple))]
 
         # log TOFs
         self.__log_tof(tof_vect, self._owner.gas_names)
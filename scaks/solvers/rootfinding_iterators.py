@@ -3,12 +3,16 @@
 '''
 
 import logging
+from collections import OrderedDict
 
 import mpmath as mp
-from scipy.optimize import golden
-import sympy as sym
 
+from ..compatutil import move_to_end
 from ..errors.error import *
+from ..utilities.import_utilities import LazyModule
+
+# Heavy packages imported when used.
+optimize = LazyModule("scipy.optimize")
 
 
 class RootfindingIterator(object):
@@ -67,8 +71,21 @@ class ConstrainedNewton(RootfindingIterator):
     :param Axb_solver: a function to solve system of linear equations by solving Ax=b
     :type Axb_solver: function
 
+    kwargs could contain:
+
+    :param line_search: line search method for step size, 'golden' or 'backtracking',
+                        default is 'golden'
+    :type line_search: str
+
+    :param max_probes: max number of probes in backtracking line search, default is 10
+    :type max_probes: int
+
     """
     def __init__(self, f, x0, **kwargs):
+        # Default optional parameters.
+        kwargs.setdefault('line_search', 'golden')
+        kwargs.setdefault('max_probes', 10)
+
         RootfindingIterator.__init__(self, f, x0, **kwargs)
 
         # check essential parameters reading
@@ -79,6 +96,10 @@ class ConstrainedNewton(RootfindingIterator):
                 msg = "parameter '{}' must be supplied.".format(param)
                 raise ParameterError(msg)
 
+        if self._line_search not in ('golden', 'backtracking'):
+            msg = "Unknown line search method '{}'".format(self._line_search)
+            raise ParameterError(msg)
+
         # set constraint function
         self.real_constraint = self._constraint
 
@@ -128,17 +149,14 @@ class ConstrainedNewton(RootfindingIterator):
                 #break
                 raise ValueError("ZeroDivisionError!")
 
-            #use golden method to get optimal step size
-            def fl(l):
-                x1 = self._matrix(x0) + l*s
-                fx = self._matrix(f(tuple(x1)))
-                return norm(fx)
-            l = golden(fl)
-#            print l
-#            l = mp.mpf('1.0')
+            # Get step size by line search.
+            if self._line_search == 'golden':
+                l = self.__golden_step(x0, s)
+            else:
+                l = self.__backtracking_step(x0, s, fxnorm)
             x1 = self._matrix(x0) + l*s  # matrix
             x1 = self.constraint(tuple(x1))
-            if x1 == x0:
+            if tuple(x1) == tuple(x0):
                 self.logger.info("Solver: Found stationary point.")
                 cancel = True
             fx = self._matrix(f(x1))
@@ -146,10 +164,53 @@ class ConstrainedNewton(RootfindingIterator):
 
             yield (x0, fxnorm, fx)
 
+    def __golden_step(self, x0, s):
+        """
+        Private helper function to get the optimal step size using golden method.
+        """
+        # NOTE: golden works with numpy scalars, convert the step size to the
+        #       float type of the iterator to avoid broadcasting by numpy.
+        def fl(l):
+            x1 = self._matrix(x0) + self._mpfloat(float(l))*s
+            fx = self._matrix(self.f(tuple(x1)))
+            return float(self._norm(fx))
 
-class MDNewton(RootfindingIterator):
+        return self._mpfloat(float(optimize.golden(fl)))
+
+    def __backtracking_step(self, x0, s, fxnorm, alpha=1e-4):
+        """
+        Private helper function to get the step size using backtracking line
+        search with Armijo condition ||f(x0 + l*s)|| <= (1 - alpha*l)*||f(x0)||.
+
+        The step size with the smallest norm is returned if the condition is
+        not satisfied after max probes.
+        """
+        l = self._mpfloat('1.0')
+        best_l, best_norm = l, None
+
+        for _ in range(self._max_probes):
+            x1 = self._matrix(x0) + l*s
+            fx1norm = self._norm(self._matrix(self.f(tuple(x1))))
+
+            if fx1norm <= (1 - alpha*l)*fxnorm:
+                return l
+
+            if best_norm is None or fx1norm < best_norm:
+                best_l, best_norm = l, fx1norm
+            l /= 2
+
+        return best_l
+
+
+class Broyden(RootfindingIterator):
     """
-    Find the root of a vector function numerically using Newton's method.
+    Find the root of a vector function using Broyden's method, the Jacobian
+    matrix is factorized only at refresh points and reused in following steps
+    with rank-1 updates.
+
+    The inverse of the updated Jacobian is applied using the factorization of
+    the last Jacobian and the stored steps by Sherman-Morrison formula, see
+    C. T. Kelley, Iterative Methods for Linear and Nonlinear Equations, chapter 7.
 
     :param f: a vector function representing a nonlinear equation system
     :type f: function
@@ -168,13 +229,210 @@ class MDNewton(RootfindingIterator):
     :param norm: a function to get a norm
     :type norm: function
 
-    :param mpfloat: high-precision float type, e.g. mpmath.mpfloat
+    :param mpfloat: float type, e.g. mpmath.mpf
     :type mpfloat: type
 
     :param matrix: matrix type, e.g. mpmath.matrix
     :type matrix: type
 
-    :param Axb_solver: a function to solve system of linear equations by solving Ax=b
+    :param LU_factor: a function returning the LU factorization of a matrix
+    :type LU_factor: function
+
+    :param LU_solve: a function to solve Ax=b using the LU factorization of A
+    :type LU_solve: function
+
+    kwargs could contain:
+
+    :param max_probes: max number of step size halving, default is 10
+    :type max_probes: int
+
+    :param max_updates: max number of rank-1 updates before the Jacobian
+                        is refreshed, default is 20
+    :type max_updates: int
+
+    :param stall_ratio: the Jacobian is refreshed if the norm of f(x) does not
+                        decrease by this ratio in a step, default is 0.9
+    :type stall_ratio: float
+
+    .. note::
+        The Jacobian is also refreshed if x is modified by the constraint.
+    """
+    def __init__(self, f, x0, **kwargs):
+        # Default optional parameters.
+        kwargs.setdefault('max_probes', 10)
+        kwargs.setdefault('max_updates', 20)
+        kwargs.setdefault('stall_ratio', 0.9)
+
+        RootfindingIterator.__init__(self, f, x0, **kwargs)
+
+        # check essential parameters reading
+        essential_params = ('J', 'constraint', 'norm', 'mpfloat',
+                            'matrix', 'LU_factor', 'LU_solve')
+        for param in essential_params:
+            if not hasattr(self, '_' + param):
+                msg = "parameter '{}' must be supplied.".format(param)
+                raise ParameterError(msg)
+
+        # Number of Jacobian evaluations and factorizations.
+        self.jacobian_evaluations = 0
+
+        # set logger
+        self.logger = logging.getLogger('model.solvers.Broyden')
+
+    def __refresh(self, x):
+        """
+        Private helper function to factorize the Jacobian at x and drop all updates.
+        """
+        self.jacobian_evaluations += 1
+        self.__factorization = self._LU_factor(self._J(tuple(x)))
+        self.__updates = []
+
+    def __apply_inverse(self, w):
+        """
+        Private helper function to get the product of the inverse of the
+        updated Jacobian and vector w.
+        """
+        q = self._LU_solve(self.__factorization, w)
+        for s, p, denominator in self.__updates:
+            q = q + (s - p)*(self.__dot(s, q)/denominator)
+        return q
+
+    @staticmethod
+    def __dot(a, b):
+        return sum(i*j for i, j in zip(a, b))
+
+    def __iter__(self):
+        '''
+        :return: x0, current x vector
+        :rtype: tuple of float
+
+        :return: fxnorm norm of f(x)
+        :rtype: float
+
+        :return: fx, value of f(x)
+        :rtype: list of float
+        '''
+        f = self.f
+        norm = self._norm
+        matrix = self._matrix
+
+        x0 = matrix(self.x0)
+        fx = matrix(f(tuple(x0)))
+        fxnorm = norm(fx)
+        self.__refresh(x0)
+        fresh = True
+
+        while True:
+            # Quasi-Newton direction.
+            d = -self.__apply_inverse(fx)
+
+            # Halve the step size until the norm decreases.
+            l = self._mpfloat('1.0')
+            accepted = False
+            for _ in range(self._max_probes):
+                x_trial = x0 + l*d
+                x1 = matrix(self._constraint(tuple(x_trial)))
+                fx1 = matrix(f(tuple(x1)))
+                fx1norm = norm(fx1)
+                if fx1norm < fxnorm:
+                    accepted = True
+                    break
+                l /= 2
+
+            if not accepted or tuple(x1) == tuple(x0):
+                # No progress even with a fresh Jacobian.
+                if fresh:
+                    self.logger.info("Found stationary point.")
+                    return
+                self.__refresh(x0)
+                fresh = True
+                continue
+
+            # Update the Jacobian or refresh it.
+            constrained = tuple(x1) != tuple(x_trial)
+            stalled = fx1norm > self._stall_ratio*fxnorm
+            s, y = x1 - x0, fx1 - fx
+            x0, fx, fxnorm = x1, fx1, fx1norm
+
+            if constrained or stalled or len(self.__updates) >= self._max_updates:
+                self.__refresh(x0)
+                fresh = True
+            else:
+                p = self.__apply_inverse(y)
+                denominator = self.__dot(s, p)
+                if denominator == 0:
+                    self.__refresh(x0)
+                    fresh = True
+                else:
+                    self.__updates.append((s, p, denominator))
+                    fresh = False
+
+            yield (tuple(x0), fxnorm, fx)
+
+
+class EvaluationCache(object):
+    """
+    Small LRU cache of recent evaluations of a vector function, which could be
+    shared by rootfinding iterators and the outer loop to avoid evaluating the
+    function at the same point repeatedly.
+
+    :param f: a vector function
+    :type f: function
+
+    :param maxsize: max number of cached evaluations, default is 8
+    :type maxsize: int
+    """
+    def __init__(self, f, maxsize=8):
+        self.f = f
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.__values = OrderedDict()
+
+    def __call__(self, x):
+        key = tuple(x)
+        values = self.__values
+        try:
+            fx = values[key]
+        except KeyError:
+            self.misses += 1
+            fx = self.f(x)
+            values[key] = fx
+            if len(values) > self.maxsize:
+                values.popitem(last=False)
+        else:
+            self.hits += 1
+            move_to_end(values, key)
+
+        return fx
+
+
+class MDNewton(RootfindingIterator):
+    """
+    Find the root of a vector function numerically using Newton's method.
+
+    :param f: a vector function representing a nonlinear equation system
+    :type f: function
+
+    :param x0: Starting point close to the root
+    :type x0: tuple of float
+
+    kwargs could contain:
+
+    :param J: a function returning the Jacobian matrix for a point
+    :type J: function
+
+    :param norm: a function to get a norm, default is mpmath.norm
+    :type norm: function
+
+    :param mpfloat: float type, default is mpmath.mpf
+    :type mpfloat: type
+
+    :param matrix: matrix type, default is mpmath.matrix
+    :type matrix: type
+
+    :param Axb_solver: a function to solve system of linear equations by solving Ax=b,
+                       default is mpmath.lu_solve
     :type Axb_solver: function
 
     .. note::
@@ -199,9 +457,12 @@ class MDNewton(RootfindingIterator):
 
     def __init__(self, f, x0, **kwargs):
         self.f = f
+        self.matrix = kwargs.get('matrix', mp.matrix)
+        self.mpfloat = kwargs.get('mpfloat', mp.mpf)
+        self.Axb_solver = kwargs.get('Axb_solver', mp.lu_solve)
         if isinstance(x0, (tuple, list)):
-            x0 = mp.matrix(x0)
-        assert x0.cols == 1, 'need a vector'
+            x0 = self.matrix(x0)
+        assert len(x0) == len(tuple(x0)), 'need a vector'
         self.x0 = x0
         if 'J' in kwargs:
             self.J = kwargs['J']
@@ -209,8 +470,8 @@ class MDNewton(RootfindingIterator):
             def J(*x):
                 return mp.jacobian(f, x)
             self.J = J
-        self.norm = mp.norm
-        self.verbose = kwargs['verbose']
+        self.norm = kwargs.get('norm', mp.norm)
+        self.verbose = kwargs.get('verbose', False)
 
         # set logger
         self.logger = logging.getLogger('model.solvers.MDNewton')
@@ -230,26 +491,26 @@ class MDNewton(RootfindingIterator):
         x0 = self.x0
         norm = self.norm
         J = self.J
-        fx = mp.matrix(f(x0))
+        fx = self.matrix(f(x0))
         fxnorm = norm(fx)
         cancel = False
         while not cancel:
             # get direction of descent
             fxn = -fx
             Jx = J(x0)
-            s = mp.lu_solve(Jx, fxn)
+            s = self.Axb_solver(Jx, fxn)
             if self.verbose:
                 self.logger.debug('Jx = \n%s', str(Jx))
                 self.logger.debug('s = \n%s', str(s))
             # damping step size TODO: better strategy (hard task)
-            l = mp.mpf('1.0')
+            l = self.mpfloat('1.0')
             x1 = x0 + s
             while True:
-                if x1 == x0:
+                if tuple(x1) == tuple(x0):
                     self.logger.info("Found stationary point.")
                     cancel = True
                     break
-                fx = mp.matrix(f(x1))
+                fx = self.matrix(f(x1))
                 newnorm = norm(fx)
                 if newnorm < fxnorm:
                     # new x accepted
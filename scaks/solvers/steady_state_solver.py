@@ -2,18 +2,26 @@ import copy
 import logging
 import random
 import re
+import time
+from collections import deque
 
-from scipy.integrate import odeint, ode
-from scipy.linalg import norm
-from scipy.optimize import fsolve
+import numpy as np
 
-from .. import file_header
 from ..descriptors.descriptors import Memoized, Property
 from ..errors.error import *
-from ..utilities.format_utilities import get_list_string
+from ..mpicommons import mpi
+from ..utilities.import_utilities import LazyModule
+from ..utilities.parallel_utilities import imap_unordered
+from ..utilities.trajectory_utilities import TrajectoryWriter
 from ..parsers.rxn_parser import *
+from .kernels import kernel_source, load_kernel
 from .rootfinding_iterators import *
-from .mean_field_solver import MeanFieldSolver
+from .mean_field_solver import MeanFieldSolver, float_matrix, lapack_solve
+
+# Heavy packages imported when used.
+sym = LazyModule("sympy")
+integrate = LazyModule("scipy.integrate")
+optimize = LazyModule("scipy.optimize")
 
 
 class SteadyStateSolver(MeanFieldSolver):
@@ -29,6 +37,9 @@ class SteadyStateSolver(MeanFieldSolver):
         # set logger
         self.__logger = logging.getLogger('model.solvers.SteadyStateSolver')
 
+        # Iterations and timings of all stages in last steady state solving.
+        self._stage_statistics = []
+
         # }}}
 
     def __constrain_coverages(self, cvgs_tuple):
@@ -37,64 +48,32 @@ class SteadyStateSolver(MeanFieldSolver):
         between 0.0 and 1.0 or total number.
         """
         # {{{
-        species_definitions = self._owner.species_definitions
-        adsorbate_names = self._owner.adsorbate_names
-        site_names = self._owner.site_names
-
-        # Convert tuple to dict
-        cvgs_dict = self._cvg_tuple2dict(cvgs_tuple)
-
-        # Enforce explicit maxima, cannot be larger than 1.0, smaller than 0.0
-        for adsorbate_name in adsorbate_names:
-            if cvgs_dict[adsorbate_name] > 1.0:
-                cvgs_dict[adsorbate_name] = self._mpf('1.0')
-            if cvgs_dict[adsorbate_name] < 0.0:
-                cvgs_dict[adsorbate_name] = self._mpf('0.0')
-
-        # Enforce explicit maxima, cannot be larger than site's total number
-        for site_name in site_names:
-            total_cvg = species_definitions[site_name]['total']
-            for adsorbate_name in self._classified_adsorbates[site_name]:
-                if cvgs_dict[adsorbate_name] > total_cvg:
-                    cvgs_dict[adsorbate_name] = self._mpf(total_cvg)
-
-        def constrain_in_total(cvgs_dict, max_cvg):
-            "Make sure sum of cvgs in cvgs_dict is not larger than max_cvg"
-            total_cvg = sum(cvgs_dict.values())
-            if total_cvg > max_cvg:
-                for key in cvgs_dict:
-                    cvgs_dict[key] = cvgs_dict[key]/total_cvg*max_cvg
-            return cvgs_dict
+        nads = len(self._owner.adsorbate_names)
+        if len(cvgs_tuple) != nads:
+            msg = "{} coverages are expected, but {} are provided.".format(nads, len(cvgs_tuple))
+            raise ParameterError(msg)
+
+        cvgs = np.array(tuple(cvgs_tuple), dtype=self._cvg_dtype)
+
+        # Enforce explicit maxima, cannot be larger than 1.0 or site's total number,
+        # smaller than 0.0
+        upper_bounds = self._cvg_upper_bounds
+        constrained_cvgs = np.where(cvgs > upper_bounds, upper_bounds, cvgs)
+        constrained_cvgs = np.where(constrained_cvgs < 0.0, self._mpf('0.0'), constrained_cvgs)
 
         # Sum of cvgs on one type of surface <= site total e.g 1.0
-        for site_name in site_names:
-            max_cvg = species_definitions[site_name]['total']
-            sub_cvgs_dict = {}
-
-            # Add cvgs of the site to sub_cvgs_dict
-            for adsorbate_name in self._classified_adsorbates[site_name]:
-                sub_cvgs_dict.setdefault(adsorbate_name,
-                                         cvgs_dict[adsorbate_name])
-            # Add free site coverage
-            sub_cvgs_dict = constrain_in_total(sub_cvgs_dict, max_cvg)
-            cvgs_dict.update(sub_cvgs_dict)
-        # Convert dict to tuple, and return
-        constrained_cvgs_tuple = self._cvg_dict2tuple(cvgs_dict)
-
-        def compare_cvgs(cvgs1, cvgs2):
-            "Compare two coverage tuples."
-            if len(cvgs1) != len(cvgs2):
-                if self._owner.log_allowed:
-                    self.__logger.warning('coverage length inconsistency is detected.')
-                return False
-            for cvg1, cvg2 in zip(cvgs1, cvgs2):
-                if abs(cvg1 - cvg2) > 10e-20:
-                    return False
-            return True
-
-        consistant = compare_cvgs(constrained_cvgs_tuple, cvgs_tuple)
+        site_cvgs = self._get_site_cvgs(constrained_cvgs)
+        site_totals = self._site_totals
+        exceeded = (site_cvgs > site_totals)[self._adsorbate_sites]
+        if exceeded.any():
+            sites = self._adsorbate_sites[exceeded]
+            constrained_cvgs[exceeded] = (constrained_cvgs[exceeded]/site_cvgs[sites]*
+                                          site_totals[sites])
+
+        constrained_cvgs_tuple = tuple(constrained_cvgs)
+
         # log if constraint has been carried out
-        if not consistant:
+        if (abs(constrained_cvgs - cvgs) > 10e-20).any():
             if self._owner.log_allowed:
                 self.__logger.warning('coverage constraining...\n')
                 self.__logger.debug('    initial coverage: %s', str([float(cvg) for cvg in cvgs_tuple]))
@@ -231,9 +210,14 @@ class SteadyStateSolver(MeanFieldSolver):
         :type relative_energies: dict
         """
         # {{{
+        # Use vectorized mass-action law of reaction network.
+        if self._vectorized:
+            rfs, rrs = self._get_network_rates(cvgs_tuple, relative_energies)
+            return self._get_network().dtheta_dt(rfs, rrs)
+
         # Set theta, kf, kr, p, dtheta_dt
-        # Coverages(theta).
-        theta = self._cvg_tuple2dict(cvgs_tuple)
+        # Coverages(theta) of adsorbates and free sites, list is faster for item access.
+        theta = self._get_cvg_vector(cvgs_tuple).tolist()
 
         # Rate constants(kf, kr).
         kf, kr = self.get_rate_constants(relative_energies=relative_energies)
@@ -245,14 +229,27 @@ class SteadyStateSolver(MeanFieldSolver):
         c = self._c
 
         # Rate of coverage change(dtheta_dt).
-        dtheta_dt = [0.0]*len(self._owner.adsorbate_names)
+        dtheta_dt_kernel = self._get_kernel("dtheta_dt", self._compile_dtheta_dt_kernel)
 
-        dtheta_dt_expressions = '\n'.join(self.get_dtheta_dt_expressions())
-        exec(dtheta_dt_expressions, globals(), locals())
-
-        return tuple(dtheta_dt)
+        return dtheta_dt_kernel(kf, kr, theta, p, c)
         # }}}
 
+    def _compile_dtheta_dt_kernel(self):
+        """
+        Protected helper function to compile dtheta/dt expressions to a function.
+        """
+        def generate():
+            nads = len(self._owner.adsorbate_names)
+            statements = (["dtheta_dt = [0.0]*{}".format(nads)] +
+                          self.get_dtheta_dt_expressions())
+            return kernel_source("dtheta_dt", ["kf", "kr", "theta", "p", "c"],
+                                 statements, "tuple(dtheta_dt)")
+
+        # Source code is cached with other reaction network data.
+        source = self._owner.model_cache.get("dtheta_dt_kernel", generate)
+
+        return load_kernel("dtheta_dt", self._index_coverages(source))
+
     @staticmethod
     def __term_adsorbate_derivation(adsorbate_name, term_expression):
         """
@@ -396,7 +393,9 @@ class SteadyStateSolver(MeanFieldSolver):
         return derivation_expression
         # }}}
 
-    @Memoized
+    # NOTE: the number of derivation expressions is finite, no eviction is needed.
+    @Memoized(maxsize=None,
+              key=lambda self, adsorbate_name, poly_expression: (adsorbate_name, poly_expression))
     def poly_adsorbate_derivation(self, adsorbate_name, poly_expression):
         """
         Expect a polynomial expression of dtheta_dt and an adsorbate_name,
@@ -450,48 +449,34 @@ class SteadyStateSolver(MeanFieldSolver):
         .. note::
             keys ":obj:`Gaf` and G:obj:`Gar` must be in relative energies dict
 
+        .. note::
+            Partial derivatives and the sparsity pattern are precomputed from
+            the reaction network, only arithmetic operations are needed here.
+
         :return: The analytical Jacobian matrix, N x N matrix of float, N is the number of adsorbates.
-        :rtype: numpy.matrix
+        :rtype: numpy.ndarray or mpmath.matrix
         """
         # {{{
         # Check input parameter.
-        dtheta_dt_expressions = self.get_dtheta_dt_expressions()
-        m, n = len(dtheta_dt_expressions), len(cvgs_tuple)
+        m, n = len(self._owner.adsorbate_names), len(cvgs_tuple)
 
         if m != n:
             msg = "{} coverages are expected, but {} are provided.".format(m, n)
             raise ParameterError(msg)
 
-        # Set theta, kf, kr, p, dtheta_dt
-        # Coverages(theta).
-        theta = self._cvg_tuple2dict(cvgs_tuple)
+        # Species vector.
+        x = self._get_network_species(cvgs_tuple)
 
         # Rate constants(kf, kr).
         kf, kr = self.get_rate_constants(relative_energies=relative_energies)
 
-        # Pressure.
-        p = self._p
-
-        # Concentration.
-        c = self._c
-
-        # Generate Jacobian matrix.
-        J = self._matrix(m, n)
-        adsorbate_names = self._owner.adsorbate_names
+        # Fill Jacobian matrix.
+        J = self._get_network().jacobian(kf, kr, x)
 
-        # Fill matrix.
-        for i in range(m):
-            poly_expression = dtheta_dt_expressions[i]
-            for j in range(n):
-                # Get adsorbate_name.
-                adsorbate_name = adsorbate_names[j]
-                # Fill the matrix
-                derivation = self.poly_adsorbate_derivation(adsorbate_name=adsorbate_name,
-                                                            poly_expression=poly_expression)
-                J[i, j] = eval(derivation)
-
-        # Return Jacobian matrix.
-        return J
+        if self._vectorized:
+            return J
+        else:
+            return self._matrix(J.tolist())
         # }}}
 
     ######################################################
@@ -602,19 +587,10 @@ class SteadyStateSolver(MeanFieldSolver):
         :param cvgs_tuple: adsorbate coverages
         :type cvgs_tuple: tuple of float
         """
-        # Get dtheta/dt expressions.
-        dtheta_dt_syms = self.get_dtheta_dt_syms()
-
-        # Get substitution dict.
-        subs_dict = self.get_subs_dict(coverages=cvgs_tuple)
-
-        # Loop to get values of dtheta/dt.
-        dtheta_dts = []
-        for dtheta_dt_sym in dtheta_dt_syms:
-            dtheta_dt = self._mpf(dtheta_dt_sym.evalf(subs=subs_dict))
-            dtheta_dts.append(dtheta_dt)
+        kernel = self._get_sym_kernel("dtheta_dt", self.get_dtheta_dt_syms)
+        dtheta_dts = kernel(*self._get_sym_arguments(cvgs_tuple))
 
-        return tuple(dtheta_dts)
+        return tuple(self._mpf(dtheta_dt) for dtheta_dt in dtheta_dts)
 
     def analytical_jacobian_sym(self):
         """ Function to get the jacobian matrix symbol expressions of the dtheta/dt nonlinear equations.
@@ -624,7 +600,7 @@ class SteadyStateSolver(MeanFieldSolver):
 
         # Allocate memories for jacobian matrix.
         m = n = len(dtheta_dt_syms)
-        sym_jacobian = [[0.0]*m, [0.0]*n]
+        sym_jacobian = [[0.0]*n for i in range(m)]
 
         # dtheta/dt (row).
         for i in range(m):
@@ -638,28 +614,24 @@ class SteadyStateSolver(MeanFieldSolver):
         return sym_jacobian
 
     def analytical_jacobian_by_sym(self, cvgs_tuple):
-        """ Get the jacobian matrix of the dtheta/dt nonlinear equations.
+        """ Get the jacobian matrix of the dtheta/dt nonlinear equations
+        by compiled jacobian symbol expressions.
 
         :param cvgs_tuple: adsorbate coverages
         :type cvgs_tuple: tuple of float
 
         :return: A jacobian matrix(in self._matrix form).
         """
-        # NOTE: precision may lose here.
-
-        # Get substitution dicts.
-        subs_dict = self.get_subs_dict(coverages=cvgs_tuple)
-
-        # Get symbol jacobian matrix.
-        sym_jacobian = self.analytical_jacobian_sym()
+        def get_expressions():
+            return [entry for row in self.analytical_jacobian_sym() for entry in row]
 
-        m = n = len(sym_jacobian)
-        num_jacobian = [[0.0]*m, [0.0]*n]
+        kernel = self._get_sym_kernel("jacobian", get_expressions)
+        entries = kernel(*self._get_sym_arguments(cvgs_tuple))
 
-        for i in range(m):
-            for j in range(n):
-                entry_value = sym_jacobian[i][j].evalf(subs=subs_dict)
-                num_jacobian[i][j] = self._mpf(entry_value)
+        # Reshape to matrix.
+        n = len(cvgs_tuple)
+        num_jacobian = [[self._mpf(entry) for entry in entries[i*n: (i+1)*n]]
+                        for i in range(n)]
 
         return self._matrix(num_jacobian)
 
@@ -723,24 +695,118 @@ class SteadyStateSolver(MeanFieldSolver):
         :rtype: tuple of float, in the order of :obj:`self._owner.adsorbate_names`
         '''
 
-        def get_jacobian(c0, relative_energies=None):
-            # Jacobian matrix.
-            jm = self.analytical_jacobian(c0, relative_energies).tolist()
-            # Convert to floats.
-            jm = [[float(df) for df in dfs] for dfs in jm]
-
-            return jm
-
-        #fprime = lambda x: get_jacobian(c0, relative_energies=relative_energies)
+        # Native float functions.
+        f, J = self._get_float_functions(relative_energies)
 
         # Main hotpot.
         c0 = [float(c) for c in c0]
-        converged_cvgs = fsolve(self.steady_state_function, c0,
-                                (relative_energies, ),
-                                fprime=get_jacobian)
+        converged_cvgs = optimize.fsolve(f, c0, fprime=J)
 
         return converged_cvgs
 
+    def _get_float_functions(self, relative_energies=None):
+        """
+        Protected helper function to get dtheta/dt and Jacobian functions
+        using native floats no matter which numerical representation is used.
+
+        :return: dtheta/dt function and Jacobian function of coverages
+        :rtype: tuple of function
+        """
+        network, kf, kr, species_vector = self.__get_float_data(relative_energies)
+
+        def f(cvgs):
+            rfs, rrs = network.rates(kf, kr, species_vector(cvgs))
+            return network.dtheta_dt(rfs, rrs)
+
+        def J(cvgs):
+            return network.jacobian(kf, kr, species_vector(cvgs))
+
+        return f, J
+
+    def _get_float_residual(self, relative_energies=None):
+        """
+        Protected helper function to get the function of relative residual
+        using native floats, which is the max ratio of absolute dtheta/dt of
+        an adsorbate to the sum of rates of all elementary reactions producing
+        or consuming it.
+
+        .. note::
+            Absolute dtheta/dt can not be lower than the round-off error of the
+            rates in native floats, the relative residual is independent of
+            the magnitude of rates.
+        """
+        network, kf, kr, species_vector = self.__get_float_data(relative_energies)
+        abs_stoichiometry_T = np.abs(network.stoichiometry_matrix.T).astype(float)
+
+        def resid(cvgs):
+            rfs, rrs = network.rates(kf, kr, species_vector(cvgs))
+            gross_rates = abs_stoichiometry_T.dot(rfs + rrs)
+            net_rates = np.abs(network.dtheta_dt(rfs, rrs))
+            nonzero = gross_rates > 0.0
+            if not nonzero.any():
+                return 0.0
+            return float(np.max(net_rates[nonzero]/gross_rates[nonzero]))
+
+        return resid
+
+    def __get_float_data(self, relative_energies=None):
+        """
+        Private helper function to get reaction network, rate constants and
+        species vector function in native floats.
+        """
+        network = self._get_network()
+
+        # Convert all data to native floats.
+        kf, kr = self.get_rate_constants(relative_energies=relative_energies)
+        kf, kr = [np.array([float(k) for k in ks]) for ks in (kf, kr)]
+        p = [float(self._p[gas_name]) for gas_name in network.gas_names]
+        c = [float(self._c[liquid_name]) for liquid_name in network.liquid_names]
+
+        def species_vector(cvgs):
+            cvgs = np.array([float(cvg) for cvg in cvgs])
+            return network.species_vector(cvgs, p, c)
+
+        return network, kf, kr, species_vector
+
+    def __float_newton(self, c0, relative_energies=None):
+        """
+        Private helper function to do Newton iterations with native floats
+        to get coarse steady state coverages in mixed precision mode.
+        """
+        # {{{
+        start = time.time()
+        f, J = self._get_float_functions(relative_energies)
+        norm = lambda x: np.linalg.norm(x, ord=2)
+
+        x = float_matrix([float(c) for c in c0])
+        error = norm(f(x))
+        newton_iterator = MDNewton(f, x, J=J, norm=norm, mpfloat=np.float64,
+                                   matrix=float_matrix, Axb_solver=lapack_solve)
+
+        iterations = 0
+        try:
+            for x1, error1, _ in newton_iterator:
+                iterations += 1
+                if not np.isfinite(error1):
+                    break
+                x, error = x1, error1
+                if (error < self._owner.coarse_tolerance or
+                        iterations >= self._owner.max_rootfinding_iterations):
+                    break
+        except ZeroDivisionError:
+            self.__logger.warning("Singular Jacobian in float64 Newton iterations.")
+
+        self._stage_statistics.append(dict(stage="float64",
+                                           iterations=iterations,
+                                           time=time.time() - start,
+                                           error=float(error)))
+        if self._owner.log_allowed:
+            msg = "float64 Newton iterations: %d, error = %e, time = %.3e s"
+            self.__logger.info(msg, iterations, error, time.time() - start)
+
+        return self.__constrain_coverages(tuple(self._mpf(float(cvg)) for cvg in x))
+        # }}}
+
     def fsolve_steady_state_cvgs(self, c0, relative_energies=None):
         ''' Use scipy.optimize.fsolve to get steady state coverages.
 
@@ -774,25 +840,45 @@ class SteadyStateSolver(MeanFieldSolver):
 
         """
         # {{{
+        self._stage_statistics = []
+
         if c0 is None:
             c0 = self._owner.hybrid_method(self._owner, 0)
         # Intial coverage must have physical meaning.
         c0 = self.__constrain_coverages(c0)
+
+        # Mixed precision: float64 Newton iterations first.
+        if self._owner.mixed_precision:
+            c0 = self.__float_newton(c0, relative_energies)
+
         self.__initial_guess = c0
+        start = time.time()
+        total_iterations = 0
 
         # Start root finding algorithm.
-        f = lambda x: self.steady_state_function(x, relative_energies=relative_energies)
-        f_resid = lambda x: self.get_residual(x, relative_energies=relative_energies)
-        constraint = self.__constrain_coverages
+        # NOTE: evaluations of dtheta/dt are shared by iterator and main loop.
+        f = EvaluationCache(lambda x: self.steady_state_function(x, relative_energies=relative_energies))
+        f_resid = lambda x: max([abs(dtheta_dt) for dtheta_dt in f(x)])
         J = lambda x: self.analytical_jacobian(x, relative_energies=relative_energies)
 
-        ############    Main Loop with changed initial guess   ##############
-        if self._owner.log_allowed:
-            self.__logger.info('Entering main loop...')
         icvg_counter = 1  # initial coverage counter, outer
         cancel = False
 
         converged = False  # Flag for convergence.
+
+        # Solve from multiple initial guesses concurrently.
+        good_guess = f_resid(c0) <= self._owner.tolerance and not single_pt
+        if self._owner.multistart > 1 and not good_guess:
+            c, total_iterations = self.__multistart_search(c0, f, f_resid, J)
+            # Fall back to serial iterations if no valid root is found.
+            if c is not None:
+                c0 = c
+                converged = cancel = True
+
+        ############    Main Loop with changed initial guess   ##############
+        if self._owner.log_allowed and not cancel:
+            self.__logger.info('Entering main loop...')
+
         while not cancel:  # outer loop
             try:
             # {{{
@@ -807,127 +893,30 @@ class SteadyStateSolver(MeanFieldSolver):
                     self.__log_sscvg(c0, self._owner.adsorbate_names)
 
                     # Get error.
-                    fx = self.steady_state_function(c0, relative_energies)  # dtheta/dts
+                    fx = f(c0)  # dtheta/dts
                     norm = self._norm(fx)
-                    resid = self.get_residual(c0)
+                    resid = f_resid(c0)
                     error = min(norm, resid)
                     self._error = error
                     if self._owner.log_allowed:
                         self.__logger.info('error = %e', error)
                     break
 
-                # Instantiate rootfinding iterator
-                # ConstrainedNewton iterator
-                if self._owner.rootfinding == 'ConstrainedNewton':
-                    iterator_parameters = dict(J=J,
-                                               constraint=constraint,
-                                               norm=self._norm,
-                                               mpfloat=self._mpf,
-                                               matrix=self._matrix,
-                                               Axb_solver=self._Axb_solver)
-                    newton_iterator = ConstrainedNewton(f, c0, **iterator_parameters)
-                # MDNewton iterator
-                elif self._owner.rootfinding == 'MDNewton':
-                    iterator_parameters = dict(J=J, verbose=False)
-                    newton_iterator = MDNewton(f, c0, **iterator_parameters)
-                else:
-                    msg='Unrecognized rootfinding iterator name [{}]'.format(self._owner.rootfinding)
-                    raise ParameterError(msg)
-
-                if self._owner.log_allowed:
-                    msg = "{} Iterator instantiation - success!".format(self._owner.rootfinding)
-                    self.__logger.info(msg)
-
-                x = c0
-                old_error = 1e99
-                if c0:
-                    # log initial guess
-                    if self._owner.log_allowed:
-                        self.__logger.info('initial guess coverage - success')
-                        self.__logger.debug(str([float(c) for c in c0]))
-
-                #####    Sub LOOP for a c0    #####
-
-                nt_counter = 0    # newton loop counter, inner
-                if self._owner.log_allowed:
-                    self.__logger.info('entering Newton Iteration( %d )...', icvg_counter)
-                    # log title
-                    self.__logger.info('  %-10s   %5s  %18s  %18s',
-                                       'status', 'N', 'residual', 'norm')
-                    self.__logger.info('-'*60)
-
-                # Setup analysis plugins
-                for ap in self._owner.analysis:
-                    ap.setup(self._owner, icvg_counter)
-
-                for x, error, fx in newton_iterator:  # inner loop
-                    nt_counter += 1
-                    resid = f_resid(x)
-                    if self._owner.log_allowed:
-                        self.__logger.info('%-10s%10d%23.10e%23.10e', 'in_process',
-                                           nt_counter, float(resid), float(error))
-
-                    # Reach the max iteraction time or not.
-                    reach_max_iter = nt_counter > self._owner.max_rootfinding_iterations
-
-                    # Less than tolerance
-                    if ((not reach_max_iter) and (error < self._owner.tolerance)):
-                        if resid < self._owner.tolerance:
-                            # Check whether there is minus value in x
-                            for cvg in x:
-                                if cvg < 0.0:
-                                    lt_zero = True  # less than 0
-                                    break
-                                else:
-                                    lt_zero = False
-                            # check END #
-                            if not lt_zero:
-                                if self._owner.log_allowed:
-                                    self.__logger.info('%-10s%10d%23.10e%23.10e', 'success',
-                                                       nt_counter, float(resid), float(error))
-                                # log steady state coverages
-                                self.__log_sscvg(x, self._owner.adsorbate_names)
-                                self._coverages = x
-                                self._error = error
-                                if self._owner.log_allowed:
-                                    self.__logger.info('error = %e', min(error, resid))
-
-                                # Update flags.
-                                cancel = True
-                                converged = True
-                                break
-                            else:  # bad root, iteration continue...
-                                if self._owner.log_allowed:
-                                    self.__logger.warning('bad root: %s', str([float(i) for i in x]))
-                                    self.__logger.warning('root finding continue...\n')
-                                cancel = False
-                                break
-                        else:
-                            error = f_resid(x)  # use residual as error and continue
-
-                    # Reach the max iteration limit.
-                    elif reach_max_iter:
-                        if self._owner.log_allowed:
-                            self.__logger.info('%-10s%10d%23.10e%23.10e', 'break',
-                                               nt_counter, float(resid), float(error))
-                            self.__logger.warning('Max rootfinding iteration number reached!')
-                            self.__logger.warning('root finding break for this initial guess...\n')
-                        # Jump out of loop for this c0
-                        cancel = False
-                        break
+                status, x, error, nt_counter = self._newton_iterations(c0, f, f_resid, J,
+                                                                       icvg_counter)
+                total_iterations += nt_counter
 
-                    old_error = error  # set old error to be compared in next loop
+                if status == 'success':
+                    # log steady state coverages
+                    self.__log_sscvg(x, self._owner.adsorbate_names)
                     self._coverages = x
                     self._error = error
+                    if self._owner.log_allowed:
+                        self.__logger.info('error = %e', min(error, f_resid(x)))
 
-                    # On-the-fly analysis plugins
-                    for ap in self._owner.analysis:
-                        if nt_counter % ap.interval == 0:
-                            ap.register_step(self._owner,
-                                             nt_counter,
-                                             icvg_counter)
-
-                #####    Sub loop for a c0 END    #####
+                    # Update flags.
+                    cancel = True
+                    converged = True
 
                 # Change the initial guess(c0).
                 if not cancel:
@@ -957,6 +946,11 @@ class SteadyStateSolver(MeanFieldSolver):
 
         ##############    main loop end   #################
 
+        self._stage_statistics.append(dict(stage=self._owner.numerical_representation,
+                                           iterations=total_iterations,
+                                           time=time.time() - start,
+                                           error=float(self._error) if converged else None))
+
         if converged:
             # Archive converged root and error.
             self.archive_data('steady_state_coverages', self._coverages)
@@ -969,6 +963,272 @@ class SteadyStateSolver(MeanFieldSolver):
             return self._coverages
     # }}}
 
+    def __get_rootfinding_iterator(self, f, c0, J):
+        """
+        Private helper function to instantiate the rootfinding iterator.
+        """
+        # {{{
+        constraint = self.__constrain_coverages
+
+        # ConstrainedNewton iterator
+        if self._owner.rootfinding == 'ConstrainedNewton':
+            iterator_parameters = dict(J=J,
+                                       constraint=constraint,
+                                       norm=self._norm,
+                                       mpfloat=self._mpf,
+                                       matrix=self._matrix,
+                                       Axb_solver=self._Axb_solver,
+                                       line_search=self._owner.line_search,
+                                       max_probes=self._owner.max_line_search_probes)
+            return ConstrainedNewton(f, c0, **iterator_parameters)
+        # Broyden iterator
+        elif self._owner.rootfinding == 'Broyden':
+            iterator_parameters = dict(J=J,
+                                       constraint=constraint,
+                                       norm=self._norm,
+                                       mpfloat=self._mpf,
+                                       matrix=self._matrix,
+                                       LU_factor=self._LU_factor,
+                                       LU_solve=self._LU_solve,
+                                       max_probes=self._owner.max_line_search_probes)
+            return Broyden(f, c0, **iterator_parameters)
+        # MDNewton iterator
+        elif self._owner.rootfinding == 'MDNewton':
+            iterator_parameters = dict(J=J,
+                                       norm=self._norm,
+                                       mpfloat=self._mpf,
+                                       matrix=self._matrix,
+                                       Axb_solver=self._Axb_solver,
+                                       verbose=False)
+            return MDNewton(f, c0, **iterator_parameters)
+        else:
+            msg='Unrecognized rootfinding iterator name [{}]'.format(self._owner.rootfinding)
+            raise ParameterError(msg)
+        # }}}
+
+    def _newton_iterations(self, c0, f, f_resid, J, icvg_counter=1, verbose=True):
+        """
+        Protected helper function to do rootfinding iterations for one initial guess.
+
+        :param c0: initial coverages
+        :type c0: tuple of float
+
+        :param f: Function returning dtheta/dt of all adsorbates
+        :param f_resid: Function returning max absolute dtheta/dt
+        :param J: Function returning the Jacobian matrix
+
+        :param icvg_counter: Index of the initial guess, default is 1
+        :type icvg_counter: int
+
+        :param verbose: Log iterations and run analysis plugins or not, default is True
+        :type verbose: bool
+
+        :return: Status ('success', 'bad_root', 'break' or 'stationary'),
+            last coverages, error and number of iterations.
+        :rtype: tuple
+        """
+        # {{{
+        log_allowed = verbose and self._owner.log_allowed
+
+        # Instantiate rootfinding iterator
+        newton_iterator = self.__get_rootfinding_iterator(f, c0, J)
+        if log_allowed:
+            msg = "{} Iterator instantiation - success!".format(self._owner.rootfinding)
+            self.__logger.info(msg)
+
+        x, error = c0, f_resid(c0)
+        if c0:
+            # log initial guess
+            if log_allowed:
+                self.__logger.info('initial guess coverage - success')
+                self.__logger.debug(str([float(c) for c in c0]))
+
+        #####    Sub LOOP for a c0    #####
+
+        nt_counter = 0    # newton loop counter, inner
+        if log_allowed:
+            self.__logger.info('entering Newton Iteration( %d )...', icvg_counter)
+            # log title
+            self.__logger.info('  %-10s   %5s  %18s  %18s',
+                               'status', 'N', 'residual', 'norm')
+            self.__logger.info('-'*60)
+
+        # Setup analysis plugins
+        analysis = self._owner.analysis if verbose else []
+        for ap in analysis:
+            ap.setup(self._owner, icvg_counter)
+
+        status = 'stationary'
+        for x, error, fx in newton_iterator:  # inner loop
+            nt_counter += 1
+            resid = f_resid(x)
+            if log_allowed:
+                self.__logger.info('%-10s%10d%23.10e%23.10e', 'in_process',
+                                   nt_counter, float(resid), float(error))
+
+            # Reach the max iteraction time or not.
+            reach_max_iter = nt_counter > self._owner.max_rootfinding_iterations
+
+            # Less than tolerance
+            if ((not reach_max_iter) and (error < self._owner.tolerance)):
+                if resid < self._owner.tolerance:
+                    # Check whether there is minus value in x
+                    lt_zero = any(cvg < 0.0 for cvg in x)  # less than 0
+                    if not lt_zero:
+                        if log_allowed:
+                            self.__logger.info('%-10s%10d%23.10e%23.10e', 'success',
+                                               nt_counter, float(resid), float(error))
+                        status = 'success'
+                        break
+                    else:  # bad root, iteration continue...
+                        if log_allowed:
+                            self.__logger.warning('bad root: %s', str([float(i) for i in x]))
+                            self.__logger.warning('root finding continue...\n')
+                        status = 'bad_root'
+                        break
+                else:
+                    error = f_resid(x)  # use residual as error and continue
+
+            # Reach the max iteration limit.
+            elif reach_max_iter:
+                if log_allowed:
+                    self.__logger.info('%-10s%10d%23.10e%23.10e', 'break',
+                                       nt_counter, float(resid), float(error))
+                    self.__logger.warning('Max rootfinding iteration number reached!')
+                    self.__logger.warning('root finding break for this initial guess...\n')
+                # Jump out of loop for this c0
+                status = 'break'
+                break
+
+            if verbose:
+                self._coverages = x
+                self._error = error
+
+            # On-the-fly analysis plugins
+            for ap in analysis:
+                if nt_counter % ap.interval == 0:
+                    ap.register_step(self._owner,
+                                     nt_counter,
+                                     icvg_counter)
+
+        #####    Sub loop for a c0 END    #####
+
+        return status, x, error, nt_counter
+        # }}}
+
+    def get_initial_guesses(self, c0, n):
+        """ Function to get candidate initial coverages for multi-start search.
+
+        Candidates are the given initial coverages, previous solutions,
+        Boltzmann coverages, coverages from hybrid method and random samples
+        on the coverage simplex of each site, in order.
+
+        :param c0: initial coverages
+        :type c0: tuple of float
+
+        :param n: Number of candidates
+        :type n: int
+
+        :return: Functions returning candidate initial coverages.
+        :rtype: list of function
+
+        .. note::
+            Candidates are returned as functions, so that expensive ones such as
+            ODE integration in hybrid method are evaluated in worker processes.
+        """
+        # {{{
+        candidates = [lambda: c0]
+
+        # Previous solutions.
+        for attr in ['_coverages', '_good_guess']:
+            if len(candidates) < n and hasattr(self, attr):
+                cvgs = getattr(self, attr)
+                candidates.append(lambda cvgs=cvgs: cvgs)
+
+        # Boltzmann coverages.
+        if len(candidates) < n and self._owner.has_absolute_energy:
+            candidates.append(self.boltzmann_coverages)
+
+        # Coverages from hybrid method.
+        if len(candidates) < n and self._owner.hybrid_method:
+            candidates.append(lambda: self._owner.hybrid_method(self._owner, 1))
+
+        # Random samples uniformly distributed on coverage simplices.
+        while len(candidates) < n:
+            cvgs = [None]*len(self._owner.adsorbate_names)
+            for adsorbate_indices, total_cvg in zip(self._site_adsorbate_indices,
+                                                    self._site_totals):
+                # The last component is the free site.
+                sample = np.random.dirichlet(np.ones(len(adsorbate_indices) + 1))*float(total_cvg)
+                for idx, cvg in zip(adsorbate_indices, sample):
+                    cvgs[idx] = self._mpf(float(cvg))
+            cvgs = tuple(cvgs)
+            candidates.append(lambda cvgs=cvgs: cvgs)
+
+        return candidates
+        # }}}
+
+    def __multistart_search(self, c0, f, f_resid, J):
+        """
+        Private helper function to do rootfinding iterations for multiple
+        initial guesses concurrently, the first physically valid root is
+        accepted and the other iterations are cancelled.
+
+        :return: The initial guess of the root (None if no valid root is
+            found for any candidate) and total number of iterations.
+        """
+        # {{{
+        candidates = self.get_initial_guesses(c0, self._owner.multistart)
+        if self._owner.log_allowed:
+            msg = 'Multi-start search with %d initial guesses...'
+            self.__logger.info(msg, len(candidates))
+
+        def solve(idx):
+            "Rootfinding iterations for a candidate in worker process."
+            try:
+                c = self.__constrain_coverages(candidates[idx]())
+                status, x, error, nt_counter = self._newton_iterations(c, f, f_resid, J,
+                                                                       icvg_counter=idx,
+                                                                       verbose=False)
+                return status, c, x, error, float(f_resid(x)), nt_counter
+            except (ArithmeticError, ValueError):
+                return 'failure', None, None, None, float('inf'), 0
+
+        def is_root(result):
+            "Only converged roots with physically meaningful coverages are accepted."
+            status, _, x, _, _, _ = result
+            return status == 'success' and all(cvg >= 0.0 for cvg in x)
+
+        results = []
+        for idx, result in imap_unordered(solve, range(len(candidates)),
+                                          processes=self._owner.processes):
+            results.append(result)
+            if self._owner.log_allowed:
+                self.__logger.info('initial guess %d: %-10s residual = %e',
+                                   idx, result[0], result[4])
+            if is_root(result):
+                break  # Cancel the rest.
+
+        total_iterations = sum(result[-1] for result in results)
+
+        roots = [result for result in results if is_root(result)]
+        if not roots:
+            if self._owner.log_allowed:
+                self.__logger.warning('No valid root found for all initial guesses.')
+            return None, total_iterations
+
+        _, c, x, error, resid, _ = roots[0]
+
+        # log steady state coverages
+        self.__log_sscvg(x, self._owner.adsorbate_names)
+        self._coverages = x
+        self._error = error
+        if self._owner.log_allowed:
+            self.__logger.info('error = %e', min(error, resid))
+
+        return c, total_iterations
+        # }}}
+
     def __log_sscvg(self, cvgs_tuple, ads_names):
         """
         Private helper function to log steady state coverage of every species.
@@ -1000,7 +1260,7 @@ class SteadyStateSolver(MeanFieldSolver):
         """
         # {{{
         head_str = "\n {:<10s}{:<25s}{:<30s}\n".format("index", "intermediate", "XTRC")
-        head_str = "Degree of Rate Control for {}:\n".format(gas_name) + head_str
+        head_str = "Degree of Thermodynamic Rate Control for {}:\n".format(gas_name) + head_str
         line_str = '-'*60 + '\n'
 
         all_data = ''
@@ -1049,7 +1309,83 @@ class SteadyStateSolver(MeanFieldSolver):
         return all_data
         # }}}
 
-    def get_single_XRC(self, gas_name, epsilon=None, relative_energies=None):
+    def get_tof_sensitivities(self, dlnkf_dp, dlnkr_dp, cvgs_tuple=None,
+                              relative_energies=None):
+        """
+        Function to get derivatives of steady state TOFs of all gas species wrt
+        parameters of rate constants using implicit function theorem.
+
+        :param dlnkf_dp: Derivatives of logarithm of forward rate constants
+            wrt parameters, n_rxns x n_params matrix.
+        :type dlnkf_dp: list of list of float
+
+        :param dlnkr_dp: Derivatives of logarithm of reverse rate constants
+            wrt parameters, n_rxns x n_params matrix.
+        :type dlnkr_dp: list of list of float
+
+        :param cvgs_tuple: Steady state coverages, converged coverages are used if not provided.
+        :type cvgs_tuple: tuple of float
+
+        :param relative_energies: Relative energies for calculation, if not provided, use model's relative energies, default is None
+        :type relative_energies: dict
+
+        :return: dTOF/dp, n_gases x n_params matrix, gases are in order of model's gas_names
+        :rtype: numpy.ndarray
+
+        .. note::
+            The coverages shift as dtheta/dt(theta, p) = 0 is kept, so
+            dTOF/dp = TOF_p - lambda^T F_p with J^T lambda = TOF_theta^T,
+            only one Jacobian factorization and one back substitution for
+            each gas are needed no matter how many parameters there are.
+        """
+        # {{{
+        if cvgs_tuple is None:
+            cvgs_tuple = self.__converged_coverages()
+
+        network = self._get_network()
+        x = self._get_network_species(cvgs_tuple)
+        kf, kr = self.get_rate_constants(relative_energies=relative_energies)
+        rfs, rrs = network.rates(kf, kr, x)
+        dtype = rfs.dtype
+
+        # Net stoichiometry of gases, positive for products, n_rxns x n_gases.
+        tof_matrix = self._get_tof_matrix().astype(dtype)
+        stoichiometry_matrix = network.stoichiometry_matrix.astype(dtype)
+
+        # Partial derivatives of net rates wrt parameters and coverages.
+        dnet_dp = (rfs[:, np.newaxis]*np.asarray(dlnkf_dp, dtype=dtype) -
+                   rrs[:, np.newaxis]*np.asarray(dlnkr_dp, dtype=dtype))
+        dnet_dtheta = network.rates_jacobian(kf, kr, x)
+
+        # Adjoint equations sharing one factorization.
+        J = network.jacobian(kf, kr, x)
+        LU = self._LU_factor(J.T.tolist())
+        n_ads = J.shape[0]
+        dtof_dtheta = tof_matrix.T.dot(dnet_dtheta)
+        multipliers = []
+        for row in dtof_dtheta:
+            multiplier = self._LU_solve(LU, row.tolist())
+            multipliers.append([multiplier[i] for i in range(n_ads)])
+        multipliers = np.array(multipliers, dtype=dtype).reshape(-1, n_ads)
+
+        dF_dp = stoichiometry_matrix.T.dot(dnet_dp)
+
+        return tof_matrix.T.dot(dnet_dp) - multipliers.dot(dF_dp)
+        # }}}
+
+    def __converged_coverages(self):
+        """
+        Private helper function to get converged coverages for sensitivity analysis.
+        """
+        if hasattr(self, "_coverages"):
+            return self._coverages
+        else:
+            msg = ("Converged coverages are needed to calculate XRC, " +
+                   "so try to get steady state coverages first.")
+            raise AttributeError(msg)
+
+    def get_single_XRC(self, gas_name, epsilon=None, relative_energies=None,
+                       method="finite_difference"):
         """
         Function to get XRC for one gas species.
 
@@ -1061,27 +1397,36 @@ class SteadyStateSolver(MeanFieldSolver):
 
         :param relative_energies: Relative energies for calculation, if not provided, use model's relative energies, default is None
         :type relative_energies: dict
+
+        :param method: 'finite_difference' to re-solve steady state for every perturbed
+            elementary reaction, or 'analytical' to use sensitivities at current steady state,
+            default is 'finite_difference'
+        :type method: str
         """
         # {{{
         # Get correct relative energies.
         if relative_energies is None:
             relative_energies = self._owner.relative_energies
 
+        if method not in ["finite_difference", "analytical"]:
+            msg = "Unknown XRC method '{}'".format(method)
+            raise ParameterError(msg)
+
         if self._owner.log_allowed:
             self.__logger.info("Calculating Degree of Rate Control(XRC)...")
             self.__logger.info("-"*55 + "\n")
 
         # Get original TOF for the gas speices.
-        if hasattr(self, "_coverages"):
-            init_guess = self._coverages
-        else:
-            msg = ("Converged coverages are needed to calculate XRC, " +
-                   "so try to get steady state coverages first.")
-            raise AttributeError(msg)
+        init_guess = self.__converged_coverages()
         r = self.get_tof(cvgs=init_guess,
                          gas_name=gas_name,
                          relative_energies=relative_energies)
 
+        if method == "analytical":
+            XRCs = self.__analytical_XRC(gas_name, r, relative_energies)
+            self.__log_single_XRC(XRCs=XRCs, gas_name=gas_name)
+            return XRCs
+
         # Original rate constants.
         kfs, _ = self.get_rate_constants(relative_energies=relative_energies)
 
@@ -1099,10 +1444,11 @@ class SteadyStateSolver(MeanFieldSolver):
             """
             Nested function to calculate XRC for a single elementary reaction.
             """
-            # Add epsilon to relative energies.
-            relative_energies_copy = copy.deepcopy(relative_energies)
-            relative_energies_copy["Gaf"][idx] += epsilon
-            relative_energies_copy["Gar"][idx] += epsilon
+            # Add epsilon to relative energies, only the energy lists changed are copied.
+            relative_energies_copy = dict(relative_energies)
+            for key in ["Gaf", "Gar"]:
+                relative_energies_copy[key] = list(relative_energies[key])
+                relative_energies_copy[key][idx] += epsilon
 
             # Rate constants change.
             k = kfs[idx]
@@ -1110,7 +1456,7 @@ class SteadyStateSolver(MeanFieldSolver):
             k_prime = ks_prime[idx]
             dk = k_prime - k
 
-            # Get steady state coverages.
+            # Get steady state coverages, warm-started from the unperturbed one.
             steady_cvgs = self.get_steady_state_cvgs(c0=init_guess,
                                                      relative_energies=relative_energies_copy)
             r_prime = self.get_tof(cvgs=steady_cvgs,
@@ -1127,18 +1473,21 @@ class SteadyStateSolver(MeanFieldSolver):
 
             return XRCi
 
-        XRCs = [None]*n_rxns
-        for i in range(n_rxns):
-            if self._owner.log_allowed:
-                self.__logger.info("Calculating XRC for {} ...".format(rxn_expressions[i]))
+        # Perturbed steady states are intermediate data and are not archived.
+        error = getattr(self, "_error", None)
+        with self.suppress_archive():
+            # Elementary reactions are distributed over MPI or local processes.
+            XRCs = mpi.task_farm(get_XRCi, range(n_rxns), processes=self._owner.processes)
 
-            # Get XRC for that elementary reaction.
-            XRC = get_XRCi(i)
-            XRCs[i] = XRC
+        # Ouput log info.
+        if self._owner.log_allowed:
+            for rxn_expression, XRC in zip(rxn_expressions, XRCs):
+                self.__logger.info("XRC({}) = {:.2e}".format(rxn_expression, float(XRC)))
+            self.__logger.info("")
 
-            # Ouput log info.
-            if self._owner.log_allowed:
-                self.__logger.info("XRC({}) = {:.2e}\n".format(rxn_expressions[i], float(XRC)))
+        # Restore the unperturbed steady state.
+        self._coverages = init_guess
+        self._error = error
 
         # Ouput log info.
         self.__log_single_XRC(XRCs=XRCs, gas_name=gas_name)
@@ -1146,6 +1495,142 @@ class SteadyStateSolver(MeanFieldSolver):
         return XRCs
         # }}}
 
+    def __analytical_XRC(self, gas_name, r, relative_energies):
+        """
+        Private helper function to get XRC for one gas species using
+        sensitivities of TOF at current steady state.
+        """
+        # {{{
+        if self._owner.log_allowed:
+            self.__logger.info("Using sensitivities at steady state...\n")
+
+        # Transition state energies change with fixed equilibrium constants,
+        # so dlnkf = dlnkr for every elementary reaction.
+        n_rxns = len(self._owner.rxn_expressions)
+        identity = np.eye(n_rxns, dtype=int)
+        sensitivities = self.get_tof_sensitivities(identity, identity,
+                                                   relative_energies=relative_energies)
+        idx = self._owner.gas_names.index(gas_name)
+
+        if r == 0:
+            self.__logger.error("Zero TOF detected when calculating XRC, " +
+                                "the XRC is set to inf")
+            return ['inf']*n_rxns
+
+        return [sensitivity/r for sensitivity in sensitivities[idx]]
+        # }}}
+
+    def get_XTRC(self, epsilon=None):
+        """
+        Function to get degree of thermodynamic rate control (XTRC) of all
+        intermediates and transition states for all gas species.
+
+        :param epsilon: The perturbation size of free energies for derivatives
+            of rate constants, model's perturbation_size is used if not provided.
+        :type epsilon: float
+
+        :return: XTRC matrix, n_gases x n_intermediates, intermediates are
+            in order of adsorbate_names + transition_state_names.
+        :rtype: list of list of float
+
+        .. note::
+            Absolute energies are needed for XTRC calculation, all XTRCs share
+            one steady state and one Jacobian factorization.
+        """
+        # {{{
+        XTRC_matrix = self.__XTRC_matrix(epsilon)
+        self.__log_XTRC(XTRC_matrix)
+
+        return XTRC_matrix
+        # }}}
+
+    def get_single_XTRC(self, gas_name, epsilon=None):
+        """
+        Function to get XTRC of all intermediates and transition states for one gas species.
+
+        :param gas_name: The gas name whose XTRC would be calculated
+        :type gas_name: str
+
+        :param epsilon: The perturbation size of free energies for derivatives
+            of rate constants, model's perturbation_size is used if not provided.
+        :type epsilon: float
+
+        :return: XTRCs in order of adsorbate_names + transition_state_names.
+        :rtype: list of float
+        """
+        # {{{
+        gas_names = self._owner.gas_names
+        if gas_name not in gas_names:
+            msg = "'{}' is not a gas species in model".format(gas_name)
+            raise ParameterError(msg)
+
+        XTRCs = self.__XTRC_matrix(epsilon)[gas_names.index(gas_name)]
+        self.__log_single_XTRC(XTRCs, gas_name)
+
+        return XTRCs
+        # }}}
+
+    def __XTRC_matrix(self, epsilon=None):
+        """
+        Private helper function to get XTRC matrix using sensitivities of TOFs
+        wrt free energies of intermediates and transition states.
+        """
+        # {{{
+        if not self._owner.has_absolute_energy:
+            msg = "Absolute energies are needed to calculate XTRC."
+            raise AttributeError(msg)
+
+        if self._owner.log_allowed:
+            self.__logger.info("Calculating Degree of Thermodynamic Rate Control(XTRC)...")
+            self.__logger.info("-"*55 + "\n")
+
+        cvgs = self.__converged_coverages()
+        parser = self._owner.parser
+        absolute_energies = self._owner.absolute_energies
+        intermediates = (self._owner.adsorbate_names +
+                         self._owner.transition_state_names)
+
+        # Get perturbation size.
+        if epsilon is None:
+            epsilon = self._mpf(self._owner.perturbation_size)
+        if self._owner.perturbation_direction == "left":
+            epsilon = -epsilon
+
+        relative_energies = parser._get_relative_from_absolute()
+        kfs, krs = self.get_rate_constants(relative_energies=relative_energies)
+
+        # Derivatives of logarithm of rate constants wrt free energies,
+        # only rate constants are evaluated for perturbed energies.
+        n_rxns, n_intermediates = len(kfs), len(intermediates)
+        dlnkf_dG = [[0]*n_intermediates for _ in range(n_rxns)]
+        dlnkr_dG = [[0]*n_intermediates for _ in range(n_rxns)]
+        for n, intermediate in enumerate(intermediates):
+            perturbed_energies = dict(absolute_energies)
+            perturbed_energies[intermediate] += epsilon
+            perturbed_relative_energies = parser._get_relative_from_absolute(perturbed_energies)
+            kfs_prime, krs_prime = self.get_rate_constants(relative_energies=perturbed_relative_energies)
+            for j in range(n_rxns):
+                dlnkf_dG[j][n] = self._math.log(kfs_prime[j]/kfs[j])/epsilon
+                dlnkr_dG[j][n] = self._math.log(krs_prime[j]/krs[j])/epsilon
+
+        sensitivities = self.get_tof_sensitivities(dlnkf_dG, dlnkr_dG, cvgs,
+                                                   relative_energies=relative_energies)
+        tofs = self.get_tof(cvgs, relative_energies=relative_energies)
+
+        # XTRC = (1/r)*dr/d(-G/kT)
+        kT = self._mpf(self._owner.kB)*self._mpf(self._owner.temperature)
+        XTRC_matrix = []
+        for tof, row in zip(tofs, sensitivities):
+            if tof == 0:
+                self.__logger.error("Zero TOF detected when calculating XTRC, " +
+                                    "the XTRC is set to inf")
+                XTRC_matrix.append(['inf']*n_intermediates)
+            else:
+                XTRC_matrix.append([-kT/tof*sensitivity for sensitivity in row])
+
+        return XTRC_matrix
+        # }}}
+
     def __log_single_XRC(self, XRCs, gas_name):
         """
         Private helper function to log XRC for a gas species.
@@ -1180,7 +1665,7 @@ class SteadyStateSolver(MeanFieldSolver):
 
         time_span = 10**(-random.randint(0, 5))
 
-        new_cvgs = self.solve_ode(time_end=end_time, time_span=time_span)[-1]
+        new_cvgs = self.solve_ode(algo='BDF', time_end=end_time, time_span=time_span)[-1]
 
         if self._owner.log_allowed:
             self.__logger.info('modify initial coverage - success')
@@ -1194,19 +1679,24 @@ class SteadyStateSolver(MeanFieldSolver):
 
     def solve_ode(self, algo='lsoda', time_start=0.0, time_end=100.0,
                   time_span=0.1, initial_cvgs=None,
-                  relative_energies=None, traj_output=False):
+                  relative_energies=None, traj_output=False,
+                  steady_state_event=True, full_output=False):
         """
         Solve the steady state equations using ODE integration.
 
-        :param algo: algorithm for ODE solving, optional,
-             possible values: 'vode' | 'zvode' | 'lsoda' | 'dopri5' | 'dop853'
+        :param algo: algorithm for ODE solving, optional, default is 'lsoda',
+             possible values: 'BDF' | 'LSODA' | 'Radau' | 'vode' | 'zvode' | 'lsoda' | 'dopri5' | 'dop853'
         :type algo: str
 
         .. note::
-             for more details of integration algorithm, see:
+             'BDF', 'LSODA' and 'Radau' are adaptive stiff integrators of scipy.integrate.solve_ivp,
+             which use native floats and analytical Jacobian, the others are
+             integrators of scipy.integrate.ode stepping with time_span, see:
              https://docs.scipy.org/doc/scipy/reference/generated/scipy.integrate.ode.html
 
-        :param time_span: time span for each step, default to be 0.1
+        :param time_span: time span for each step, default to be 0.1,
+             for solve_ivp integrators it is the first output time of the
+             log-spaced trajectory.
         :type time_span: float
 
         :param time_start: time when begin integration
@@ -1224,17 +1714,42 @@ class SteadyStateSolver(MeanFieldSolver):
         .. note::
             keys ":obj:`Gaf` and G:obj:`Gar` must be in relative energies dict
 
-        :param traj_output: output ODE integration trajectory or not, default value is False.
+        :param traj_output: output ODE integration trajectory to binary file
+            auto_ode_coverages.traj or not, default value is False.
         :type traj_output: bool
 
+        .. note::
+            The trajectory can be loaded by
+            :obj:`scaks.utilities.trajectory_utilities.Trajectory`.
+
+        :param steady_state_event: Stop integration when steady state is detected
+            or not, default value is True.
+        :type steady_state_event: bool
+
+        .. note::
+            Steady state is detected when max absolute dtheta/dt relative to the
+            rates producing or consuming the adsorbate is lower than model's coarse_tolerance,
+            or its relative change is lower than model's
+            ode_steady_state_rtol, during the last time window, which is model's
+            ode_steady_state_window times the integration time (time_end - time_start).
+
+        :param full_output: return information of integration or not, default value is False.
+        :type full_output: bool
+
         :return: the integrated time
         :rtype: float
 
         :return: integrated function values
         :rtype: list of float
 
+        :return: information of integration if full_output is True, with keys
+            "reason" ('time_end', 'residual', 'relative_change' or 'failure'),
+            "residual" (relative to the rates of adsorbates) and "steps".
+        :rtype: dict
+
         Examples::
             >>> m.solver.solve_ode(initial_cvgs=(0.0, 0.0))
+            >>> t, cvgs, info = m.solver.solve_ode(initial_cvgs=(0.0, 0.0), full_output=True)
         """
         # {{{
         # set timr variables
@@ -1252,17 +1767,29 @@ class SteadyStateSolver(MeanFieldSolver):
             except IOError:
                 initial_cvgs = [0.0]*nads
 
+        # Steady state detection using native floats.
+        f_float, J_float = self._get_float_functions(relative_energies)
+        f_resid = self._get_float_residual(relative_energies)
+        if steady_state_event:
+            detect_steady_state = self.__steady_state_detector(t_end - t_start)
+        else:
+            detect_steady_state = lambda t, resid: None
+
+        if algo in self.__ivp_methods:
+            ret = self.__solve_ivp(algo, t_start, t_end, t_step, initial_cvgs,
+                                   f_float, J_float, f_resid, detect_steady_state,
+                                   traj_output)
+            return ret if full_output else ret[:2]
+
         # differential equation, solve over t for initial coverages cvgs_tuple
         def f(t, cvgs_tuple):
             return list(self.steady_state_function(cvgs_tuple, relative_energies))
 
         # ode solver object
-        r = ode(f)
+        r = integrate.ode(f)
         r.set_integrator(algo, method='bdf')
         r.set_initial_value(initial_cvgs, t_start)
 
-        ts, ys = [], []
-
         # integration loop
         if self._owner.log_allowed:
             self.__logger.info('entering {} ODE integration loop...'.format(algo))
@@ -1272,14 +1799,13 @@ class SteadyStateSolver(MeanFieldSolver):
                                'time(s)', *adsorbate_names)
             self.__logger.info('-'*(20*nads + 30))
 
+        reason = 'time_end'
+        resid = None
+
         try:
             # Write file header.
             if traj_output:
-                flush_counter = 0
-                with open("auto_ode_coverages.py", "w") as f:
-                    time_str = "times = []\n\n"
-                    coverages_str = "coverages = []\n\n"
-                    f.write(file_header + time_str + coverages_str)
+                writer = self.__get_trajectory_writer()
 
             nstep = 0
 
@@ -1290,8 +1816,7 @@ class SteadyStateSolver(MeanFieldSolver):
                 # Integrate.
                 r.integrate(r.t + t_step)
                 if traj_output and output_allowed:
-                    ts.append(r.t)
-                    ys.append(r.y.tolist())
+                    writer.append(r.t, r.y)
 
                 # Info output.
                 if (self._owner.log_allowed and
@@ -1300,16 +1825,20 @@ class SteadyStateSolver(MeanFieldSolver):
                     msg = msg.format(r.t/t_end*100, r.t, *r.y)
                     self.__logger.info(msg)
 
-                # Flush time coverages to file.
-                if traj_output and output_allowed:
-                    if ts and ys:
-                        last_time = ts[-1]
-                        last_coverages = ys[-1]
-                    ts, ys = self.__ode_flush(flush_counter, ts, ys)
-                    flush_counter += 1
+                # Stop if steady state is reached.
+                if not r.successful():
+                    reason = 'failure'
+                    break
+                resid = f_resid(r.y)
+                steady_state = detect_steady_state(r.t, resid)
+                if steady_state:
+                    reason = steady_state
+                    if traj_output and not output_allowed:
+                        writer.append(r.t, r.y)
+                    break
 
             if self._owner.log_allowed:
-                self.__logger.info('%10s\n', 'finish')
+                self.__logger.info('%10s: %s\n', 'finish', reason)
 
         finally:
             last_time = r.t
@@ -1317,48 +1846,163 @@ class SteadyStateSolver(MeanFieldSolver):
 
             # Flush all data left.
             if traj_output:
-                self.__ode_flush(flush_counter, ts, ys)
+                writer.close()
+                if self._owner.log_allowed:
+                    self.__logger.info('ODE integration trajectory is written' +
+                                       ' to %s.', writer.filename)
 
-            if self._owner.log_allowed:
-                self.__logger.info('ODE integration trajectory is written' +
-                                   ' to auto_ode_coverages.py.')
+        if full_output:
+            info = dict(reason=reason, residual=resid, steps=nstep)
+            return last_time, last_coverages, info
 
         return last_time, last_coverages
         # }}}
 
-    def __ode_flush(self, flush_counter, times, coverages):
+    def __steady_state_detector(self, duration):
         """
-        Private helper function to flush ode intergration data to file.
+        Private helper function to get a function detecting steady state in
+        ODE integration, which is called with time and relative residual
+        after every integration step and returns the reason of steady state
+        ('residual' or 'relative_change') or None.
+
+        :param duration: The integration time, which the time window is scaled to.
+        :type duration: float
         """
         # {{{
-        # Get times extension strings.
-        var_name = "times_{}".format(flush_counter)
-        list_str = get_list_string(var_name, times)
-        extend_str = "times.extend({})\n\n".format(var_name)
-        times_str = list_str + extend_str
-
-        # Get coverages extesnion strings.
-        var_name = "coverages_{}".format(flush_counter)
-        list_str = get_list_string(var_name, coverages)
-        extend_str = "coverages.extend({})\n\n".format(var_name)
-        coverages_str = list_str + extend_str
-
-        # Get all content to be flushed.
-        comment = ("\n# -------------------- flush {} " +
-                   "---------------------\n").format(flush_counter)
-        content = comment + times_str + coverages_str
-
-        # Flush to file.
-        with open("auto_ode_coverages.py", "a") as f:
-            f.write(content)
-
-        # Free buffer.
-        times = []
-        coverages = []
-
-        return times, coverages
+        window = self._owner.ode_steady_state_window*duration
+        # NOTE: residuals are relative ones evaluated in native floats.
+        tolerance = self._owner.coarse_tolerance
+        rtol = self._owner.ode_steady_state_rtol
+
+        # Time and residual of steps in window, and the last step before window.
+        history = deque()
+
+        def detect(t, resid):
+            history.append((t, resid))
+            while len(history) > 2 and history[1][0] <= t - window:
+                history.popleft()
+
+            # Not integrated long enough.
+            if t - history[0][0] < window:
+                return None
+
+            resids = [r for _, r in history]
+            max_resid, min_resid = max(resids), min(resids)
+            if max_resid < tolerance:
+                return 'residual'
+            if max_resid - min_resid < rtol*max_resid:
+                return 'relative_change'
+
+            return None
+
+        return detect
         # }}}
 
+    # Stiff integrators of scipy.integrate.solve_ivp.
+    __ivp_methods = ("BDF", "LSODA", "Radau")
+
+    # Number of output times per decade in log-spaced trajectory.
+    __ode_points_per_decade = 20
+
+    def __solve_ivp(self, algo, t_start, t_end, t_step, initial_cvgs,
+                    f, J, f_resid, detect_steady_state, traj_output=False):
+        """
+        Private helper function to do ODE integration with adaptive steps of
+        stiff integrators using native floats and analytical Jacobian.
+        """
+        # {{{
+        adsorbate_names = self._owner.adsorbate_names
+        nads = len(adsorbate_names)
+
+        y0 = np.array([float(cvg) for cvg in initial_cvgs])
+
+        # Log-spaced output times resolve both fast transients and slow relaxation.
+        t_eval = np.array([])
+        if traj_output:
+            duration = t_end - t_start
+            if 0.0 < t_step < duration:
+                num = int(self.__ode_points_per_decade*np.log10(duration/t_step)) + 1
+                t_eval = t_start + np.geomspace(t_step, duration, num)
+            else:
+                t_eval = np.array([t_end])
+            t_eval[-1] = t_end
+        if traj_output:
+            writer = self.__get_trajectory_writer()
+            writer.append(t_start, y0)
+
+        if self._owner.log_allowed:
+            self.__logger.info('entering {} ODE integration...'.format(algo))
+            msg = "start = {:.2f}  end = {:.2f}\n".format(t_start, t_end)
+            self.__logger.info(msg)
+
+        start = time.time()
+        integrator = getattr(integrate, algo)(lambda t, y: f(y), t_start, y0, t_end,
+                                              jac=lambda t, y: J(y),
+                                              rtol=1e-6,
+                                              atol=1e-12)
+
+        reason = 'time_end'
+        resid = f_resid(y0)
+        nstep = 0
+        while integrator.status == 'running':
+            t_old = integrator.t
+            message = integrator.step()
+            nstep += 1
+            if integrator.status == 'failed':
+                reason = 'failure'
+                self.__logger.warning('ODE integration failed: %s', message)
+                break
+
+            # Interpolate output times in this step.
+            t_new = integrator.t
+            in_step = t_eval[(t_eval > t_old) & (t_eval <= t_new)]
+            if in_step.size:
+                sol = integrator.dense_output()
+                writer.extend(in_step, sol(in_step).T)
+
+            # Stop if steady state is reached.
+            resid = f_resid(integrator.y)
+            steady_state = detect_steady_state(t_new, resid)
+            if steady_state:
+                reason = steady_state
+                if traj_output and t_new not in in_step:
+                    writer.append(t_new, integrator.y)
+                break
+
+        last_time = float(integrator.t)
+        last_coverages = integrator.y.tolist()
+
+        if self._owner.log_allowed:
+            self.__logger.info('%10s%20s' + '%20s'*nads, 'process',
+                               'time(s)', *adsorbate_names)
+            self.__logger.info('-'*(20*nads + 30))
+            msg = "{:10.2f}%{:20f}" + "{:20.8e}"*nads
+            self.__logger.info(msg.format(last_time/t_end*100, last_time, *last_coverages))
+            self.__logger.info('%10s: %s\n', 'finish', reason)
+            msg = 'steps = %d, evaluations: f = %d, J = %d, LU = %d, time = %.3e s'
+            self.__logger.info(msg, nstep, integrator.nfev, integrator.njev,
+                               integrator.nlu, time.time() - start)
+
+        # Flush all data left.
+        if traj_output:
+            writer.close()
+            if self._owner.log_allowed:
+                self.__logger.info('ODE integration trajectory is written' +
+                                   ' to %s.', writer.filename)
+
+        info = dict(reason=reason, residual=resid, steps=nstep)
+
+        return last_time, last_coverages, info
+        # }}}
+
+    def __get_trajectory_writer(self):
+        """
+        Private helper function to get binary writer of ODE integration trajectory.
+        """
+        return TrajectoryWriter("auto_ode_coverages.traj",
+                                self._owner.adsorbate_names,
+                                buffer_size=self._owner.ode_buffer_size)
+
     @Property
     def error(self):
         """ Query function for converged error.
@@ -1379,3 +2023,11 @@ class SteadyStateSolver(MeanFieldSolver):
         """ Query function for good initial coverages.
         """
         self._good_guess
+
+    @Property
+    def stage_statistics(self):
+        """ Query function for iterations and timings of all stages in last
+        steady state coverages solving, e.g.
+        :obj:`[{"stage": "float64", "iterations": 5, "time": 0.01, "error": 1e-5}, ...]`
+        """
+        return self._stage_statistics
@@ -1,6 +1,8 @@
 import inspect
+import logging
 import os
 from ..compatutil import subprocess
+from ..utilities.archive_utilities import close_archives
 
 abs_path = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
 
@@ -16,9 +18,39 @@ mkm_path = abs_path + "/mkm_inputs"
 mkm_energy = mkm_path + "/rel_energy.py"
 mkm_abs_energy = mkm_path + "/abs_energy.py"
 
+class LogCapture(logging.Handler):
+    ''' Context manager to capture messages of a logger, like assertLogs of
+    unittest.TestCase which is not available in Python 2.
+
+    Example::
+        >>> with LogCapture("model.utilities.ArchiveWriter") as cm:
+        ...     pass
+        >>> cm.output
+    '''
+    def __init__(self, logger_name, level=logging.WARNING):
+        logging.Handler.__init__(self, level)
+        self.logger = logging.getLogger(logger_name)
+        self.output = []
+
+    def emit(self, record):
+        self.output.append("{}:{}:{}".format(record.levelname, record.name,
+                                             record.getMessage()))
+
+    def __enter__(self):
+        self.__logger_level = self.logger.level
+        self.logger.addHandler(self)
+        if self.logger.getEffectiveLevel() > self.level:
+            self.logger.setLevel(self.level)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.logger.removeHandler(self)
+        self.logger.setLevel(self.__logger_level)
+
 def cleanup():
     ''' Remove auto-generated files.
     '''
+    close_archives()
     subprocess.getstatusoutput("for i in `find ./ -name 'auto_*'`; do rm -rf $i; done")
     subprocess.getstatusoutput("for i in `find ./ -name 'out.log'`; do rm -rf $i; done")
     subprocess.getstatusoutput("for i in `find ./ -name 'log'`; do rm -rf $i; done")
@@ -3,8 +3,16 @@ import unittest
 import os
 from copy import deepcopy
 
+import numpy as np
+
+from ...errors.error import ParameterError
+from ...functions import mangled_name
 from ...models.micro_kinetic_model import MicroKineticModel
+from ...mpicommons import MPI_LAUNCHER_VARS
 from ...parsers import *
+from ...utilities.archive_utilities import load_archive
+from ...utilities.checkpoint_utilities import *
+from ...utilities.parallel_utilities import imap_unordered, mpi_initialized
 
 from .. import *
 
@@ -50,6 +58,24 @@ class MicroKineticModelTest(unittest.TestCase):
 
         self.assertTrue(isinstance(model.parser, RelativeEnergyParser))
 
+    def test_default_fork(self):
+        " Make sure processes can be forked with a model in default MPI setting. "
+        env = dict(os.environ)
+        try:
+            for var in MPI_LAUNCHER_VARS + ("SCAKS_MPI", ):
+                os.environ.pop(var, None)
+
+            model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+            model.parser.parse_data(filename=mkm_energy)
+            model.solver.get_data()
+            self.assertFalse(mpi_initialized())
+
+            pids = [pid for _, pid in imap_unordered(lambda x: os.getpid(), range(2), processes=2)]
+            self.assertNotIn(os.getpid(), pids)
+        finally:
+            os.environ.clear()
+            os.environ.update(env)
+
     def test_generate_relative_energies_file(self):
         " Test we can generate relative energies input file correctly. "
         model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
@@ -113,6 +139,38 @@ class MicroKineticModelTest(unittest.TestCase):
         model.set_solver(solver)
         self.assertTrue(isinstance(model.solver, SteadyStateSolver))
 
+    def test_model_cache(self):
+        " Test reaction network data can be loaded from model cache. "
+        setup_dict = deepcopy(self.setup_dict)
+        setup_dict["model_cache_dir"] = "auto_model_cache"
+
+        model = MicroKineticModel(setup_dict=setup_dict, logger_level=logging.WARNING)
+        model.parser.parse_data(filename=mkm_energy)
+        model.solver.get_data()
+        ref_dtheta_dt = model.solver.steady_state_function((0.5, 0.3))
+        ref_site_matrix, _ = model.parser.get_stoichiometry_matrices()
+
+        # Construct model from the same network.
+        model = MicroKineticModel(setup_dict=setup_dict, logger_level=logging.WARNING)
+        for name in ["elementary_rxns", "stoichiometry_matrices", "dtheta_dt_kernel"]:
+            self.assertTrue(name in model.model_cache)
+        self.assertTupleEqual(("CO_s", "O_s"), model.adsorbate_names)
+
+        model.parser.parse_data(filename=mkm_energy)
+        model.solver.get_data()
+        self.assertTupleEqual(ref_dtheta_dt, model.solver.steady_state_function((0.5, 0.3)))
+
+        site_matrix, _ = model.parser.get_stoichiometry_matrices()
+        self.assertTrue(np.array_equal(ref_site_matrix, site_matrix))
+        self.assertFalse(site_matrix.flags.writeable)
+
+        # Different site definitions.
+        filename = model.model_cache.filename
+        setup_dict["species_definitions"]["*_s"]["total"] = 0.5
+        model = MicroKineticModel(setup_dict=setup_dict, logger_level=logging.WARNING)
+        self.assertNotEqual(filename, model.model_cache.filename)
+        self.assertFalse("stoichiometry_matrices" in model.model_cache)
+
     def test_run(self):
         " Test micro kinetic model can run correctly. "
         model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
@@ -121,6 +179,97 @@ class MicroKineticModelTest(unittest.TestCase):
         model.solver.get_data()
         model.run(init_cvgs=init_cvgs)
 
+        # Archived data is written at the end of run.
+        data = load_archive(model.data_file)
+        self.assertListEqual(list(model.steady_state_coverages),
+                             list(data["steady_state_coverages"]))
+
+    def test_sweep(self):
+        " Test micro kinetic model can be solved over a grid of conditions. "
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        model.parser.parse_data(filename=mkm_energy)
+        model.solver.get_data()
+
+        pressures = {"O2_g": [1./3., 0.5, 1.0]}
+        temperatures = [450.0, 500.0]
+        results = model.sweep(pressures=pressures, temperatures=temperatures,
+                              init_cvgs=[0.9, 0.1], processes=1)
+
+        # Check.
+        self.assertListEqual([("O2_g", pressures["O2_g"]), ("temperature", temperatures)],
+                             results["axes"])
+        self.assertTupleEqual((3, 2, 2), results["coverages"].shape)
+        self.assertTupleEqual((3, 2, 3), results["TOFs"].shape)
+        self.assertTupleEqual((3, 2, 3), results["reversibilities"].shape)
+        self.assertTupleEqual((3, 2), results["errors"].shape)
+
+        ref_cvgs = [0.9993009023315728, 0.0006990944289937246]
+        for ref, ret in zip(ref_cvgs, results["coverages"][0, 0]):
+            self.assertAlmostEqual(ref, ret)
+
+        ref_tofs = [6.559739597e-05, -6.559739597e-05, -3.279869798e-05]
+        for ref, ret in zip(ref_tofs, results["TOFs"][0, 0]):
+            self.assertAlmostEqual(ref*1e5, ret*1e5, places=3)
+
+        # Model conditions are restored.
+        self.assertEqual(450.0, model.temperature)
+        self.assertEqual(1./3., model.species_definitions["O2_g"]["pressure"])
+
+        # Points solved in parallel.
+        parallel_results = model.sweep(pressures=pressures, temperatures=temperatures,
+                                       init_cvgs=[0.9, 0.1], processes=2)
+        for key in ["coverages", "TOFs", "reversibilities"]:
+            self.assertTrue(np.allclose(results[key], parallel_results[key], rtol=1e-3))
+
+        # Wrong gas name.
+        self.assertRaises(ParameterError, model.sweep, pressures={"CO_s": [1.0]})
+
+    def test_sweep_checkpoint(self):
+        " Test sweep can be resumed from checkpoint. "
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        model.parser.parse_data(filename=mkm_energy)
+        model.solver.get_data()
+
+        checkpoint = "auto_sweep_checkpoints"
+        pressures = {"O2_g": [1./3., 0.5]}
+        results = model.sweep(pressures=pressures, init_cvgs=[0.9, 0.1],
+                              processes=1, checkpoint=checkpoint)
+        self.assertEqual(2, len(load_checkpoints(checkpoint)))
+
+        # Completed points are not solved again.
+        with CheckpointWriter(checkpoint_filename(checkpoint)) as writer:
+            record = load_checkpoints(checkpoint)[(0.5, )]
+            record["errors"] = -1.0
+            writer.append((0.5, ), record)
+
+        pressures = {"O2_g": [1./3., 0.5, 1.0]}
+        resumed_results = model.sweep(pressures=pressures, init_cvgs=[0.9, 0.1],
+                                      processes=1, checkpoint=checkpoint)
+        self.assertEqual(-1.0, resumed_results["errors"][1])
+        self.assertTrue(np.allclose(results["TOFs"], resumed_results["TOFs"][:2]))
+        self.assertFalse(np.isnan(resumed_results["TOFs"][2]).any())
+        self.assertEqual(3, len(load_checkpoints(checkpoint)))
+
+        # Checkpoint of other conditions is refused.
+        species_definitions = getattr(model, mangled_name(model, "species_definitions"))
+        species_definitions["CO_g"]["pressure"] = 0.5
+        self.assertRaises(ParameterError, model.sweep, pressures=pressures,
+                          init_cvgs=[0.9, 0.1], processes=1, checkpoint=checkpoint)
+        species_definitions["CO_g"]["pressure"] = 1.0
+
+        # Relative energies are identified by contents.
+        checkpoint = "auto_sweep_energies_checkpoints"
+        energies = dict(model.relative_energies)
+        shifted_energies = dict(energies, Gaf=[0.0, 0.0, 1.3], Gar=[0.758, 2.64, 0.976])
+        model.sweep(relative_energies=[energies, shifted_energies],
+                    init_cvgs=[0.9, 0.1], processes=1, checkpoint=checkpoint)
+        results = model.sweep(relative_energies=[shifted_energies],
+                              init_cvgs=[0.9, 0.1], processes=1, checkpoint=checkpoint)
+        records = load_checkpoints(checkpoint)
+        self.assertEqual(2, len(records))
+        self.assertListEqual(records[(fingerprint(shifted_energies), )]["TOFs"],
+                             results["TOFs"][0].tolist())
+
     def tearDown(self):
         cleanup()
 
@@ -1,4 +1,6 @@
+import copy
 import logging
+import pickle
 import re
 import unittest
 
@@ -113,6 +115,25 @@ class ChemFormulaTest(unittest.TestCase):
 
         self.assertRaisesRegexp(ValueError, r"^Site", formula_2.conserve, formula_1)
 
+    def test_interned(self):
+        " Make sure each formula is parsed only once and can not be changed. "
+        formula = ChemFormula("2CO_s")
+        self.assertIs(formula, ChemFormula("2CO_s"))
+        self.assertIs(formula, pickle.loads(pickle.dumps(formula)))
+        self.assertIs(formula, copy.deepcopy(formula))
+
+        # Immutable.
+        self.assertRaises(AttributeError, setattr, formula, "_ChemFormula__stoich", 1)
+        self.assertRaises(AttributeError, setattr, formula, "stoich", 1)
+
+        # Returned dicts are copies.
+        formula.get_elements_dict()["C"] = 3
+        self.assertDictEqual({"C": 2, "O": 2}, formula.get_elements_dict())
+
+        # Invalid formula is not interned.
+        self.assertRaises(ChemFormulaError, ChemFormula, "CO")
+        self.assertFalse("CO" in ChemFormula._interned)
+
     def tearDown(self):
         cleanup()
 
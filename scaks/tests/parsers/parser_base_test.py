@@ -96,17 +96,80 @@ class ParserBaseTest(unittest.TestCase):
         model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
         parser = model.parser
 
-        ref_reapro_matrix = np.matrix([[1.0, -1.0, 0.0],
-                                       [2.0, 0.0, -2.0],
-                                       [-2.0, 1.0, 1.0]])
-        ref_site_matrix = np.matrix([[0.0, 1.0, 0.0],
-                                     [0.0, 0.0, 1.0],
-                                     [-1.0, 0.0, 0.0]])
+        ref_reapro_matrix = np.array([[1.0, -1.0, 0.0],
+                                      [2.0, 0.0, -2.0],
+                                      [-2.0, 1.0, 1.0]])
+        ref_site_matrix = np.array([[0.0, 1.0, 0.0],
+                                    [0.0, 0.0, 1.0],
+                                    [-1.0, 0.0, 0.0]])
         ret_reapro_matrix, ret_site_matrix = parser.get_stoichiometry_matrices()
 
         self.assertTrue(np.allclose(ref_reapro_matrix, ret_reapro_matrix))
         self.assertTrue(np.allclose(ref_site_matrix, ret_site_matrix))
 
+        # Matrices are built only once and are read-only.
+        self.assertIs(ret_site_matrix, parser.get_stoichiometry_matrices()[1])
+        self.assertFalse(ret_site_matrix.flags.writeable)
+
+    def test_reaction_network(self):
+        " Make sure we can get the reaction network correctly. "
+        # Construction.
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        parser = model.parser
+
+        network = parser.get_reaction_network()
+
+        # Species order: adsorbates, free sites, gases, liquids.
+        ref_species_names = ('CO_s', 'O_s', '*_s', 'CO2_g', 'CO_g', 'O2_g')
+        self.assertTupleEqual(ref_species_names, network.species_names)
+
+        ref_forward_orders = [[0, 0, 1, 0, 1, 0],
+                              [0, 0, 2, 0, 0, 1],
+                              [1, 1, 0, 0, 0, 0]]
+        ref_reverse_orders = [[1, 0, 0, 0, 0, 0],
+                              [0, 2, 0, 0, 0, 0],
+                              [0, 0, 2, 1, 0, 0]]
+        self.assertListEqual(ref_forward_orders, network.forward_orders.tolist())
+        self.assertListEqual(ref_reverse_orders, network.reverse_orders.tolist())
+
+        ref_stoichiometry_matrix = [[1, 0], [0, 2], [-1, -1]]
+        self.assertListEqual(ref_stoichiometry_matrix,
+                             network.stoichiometry_matrix.tolist())
+        self.assertListEqual([[1.0, 1.0]], network.site_matrix.tolist())
+        self.assertTupleEqual((3, 2), network.shape)
+
+        # Check vectorized rates.
+        x = network.species_vector((0.5, 0.3), [0.0, 1.0, 0.5], [])
+        self.assertTrue(np.allclose([0.5, 0.3, 0.2, 0.0, 1.0, 0.5], x))
+
+        rfs, rrs = network.rates([1.0, 2.0, 3.0], [4.0, 5.0, 6.0], x)
+        ref_rfs = [1.0*0.2*1.0, 2.0*0.2**2*0.5, 3.0*0.5*0.3]
+        ref_rrs = [4.0*0.5, 5.0*0.3**2, 6.0*0.2**2*0.0]
+        self.assertTrue(np.allclose(ref_rfs, rfs))
+        self.assertTrue(np.allclose(ref_rrs, rrs))
+
+        net_rates = np.array(ref_rfs) - np.array(ref_rrs)
+        ref_dtheta_dt = [net_rates[0] - net_rates[2], 2*net_rates[1] - net_rates[2]]
+        self.assertTrue(np.allclose(ref_dtheta_dt, network.dtheta_dt(rfs, rrs)))
+
+        # Check Jacobian matrix, free site coverage is 1 - theta_CO - theta_O.
+        ref_jacobian = [[-1.0*1.0 - 4.0 - 3.0*0.3 - 6.0*2*0.2*0.0, -1.0*1.0 - 3.0*0.5 - 6.0*2*0.2*0.0],
+                        [-2*2.0*2*0.2*0.5 - 3.0*0.3 - 6.0*2*0.2*0.0,
+                         -2*2.0*2*0.2*0.5 - 2*5.0*2*0.3 - 3.0*0.5 - 6.0*2*0.2*0.0]]
+        self.assertTrue(np.allclose(ref_jacobian, network.jacobian([1.0, 2.0, 3.0], [4.0, 5.0, 6.0], x)))
+        sparse_jacobian = network.jacobian([1.0, 2.0, 3.0], [4.0, 5.0, 6.0], x, dense=False)
+        self.assertTrue(np.allclose(ref_jacobian, sparse_jacobian.toarray()))
+        self.assertTrue(network.jacobian_pattern.all())
+
+        # Check Jacobian matrix of net rates.
+        ref_rates_jacobian = [[-1.0*1.0 - 4.0, -1.0*1.0],
+                              [-2.0*2*0.2*0.5, -2.0*2*0.2*0.5 - 5.0*2*0.3],
+                              [3.0*0.3 - 6.0*2*0.2*0.0, 3.0*0.5 - 6.0*2*0.2*0.0]]
+        rates_jacobian = network.rates_jacobian([1.0, 2.0, 3.0], [4.0, 5.0, 6.0], x)
+        self.assertTrue(np.allclose(ref_rates_jacobian, rates_jacobian))
+        self.assertTrue(np.allclose(network.stoichiometry_matrix.T.dot(rates_jacobian),
+                                    ref_jacobian))
+
     def test_elemtary_rxns_parse(self):
         " Test all elementary reaction equations can be parsed correctly. "
 
@@ -74,6 +74,21 @@ class RxnEquationTest(unittest.TestCase):
 
         self.assertListEqual(ref_gas_names, ret_gas_names)
 
+    def test_interned(self):
+        " Make sure the same equation, states and formulas are shared. "
+        equation = RxnEquation("CO_s + O_s <-> CO-O_2s -> CO2_g + 2*_s")
+        self.assertIs(equation, RxnEquation("CO_s + O_s <-> CO-O_2s -> CO2_g + 2*_s"))
+
+        reverse_equation = equation.revert()
+        self.assertIs(equation.tolist()[0], reverse_equation.tolist()[-1])
+        self.assertIs(equation.to_formula_list()[-1][0], ChemFormula("CO2_g"))
+
+        # Returned lists are copies.
+        equation.tolist().pop()
+        self.assertEqual(3, len(equation.tolist()))
+
+        self.assertRaises(ValueError, RxnEquation, "CO_s + O_s")
+
     def tearDown(self):
         cleanup()
 
@@ -1,17 +1,31 @@
 import logging
+import os
+import pickle
 import re
 import unittest
 
 import numpy as np
 from mpmath import mpf
 
+from ...descriptors.descriptors import Memoized
 from ...models.micro_kinetic_model import MicroKineticModel
 from ...parsers.rxn_parser import *
 from ...solvers import *
+from ...functions import mangled_name
 
 from .. import *
 
 
+class MemoizedValues(object):
+    " Class with memoized method for pickling test. "
+    def __init__(self, offset):
+        self.offset = offset
+
+    @Memoized(maxsize=2, key=lambda self, x: x)
+    def get_value(self, x):
+        return x + self.offset
+
+
 class MeanFieldSolverTest(unittest.TestCase):
 
     def setUp(self):
@@ -150,6 +164,63 @@ class MeanFieldSolverTest(unittest.TestCase):
         self.assertListEqual(ref_reverse_rate_constants, ret_reverse_rate_constants)
         # }}}
 
+    def test_rate_constants_cache(self):
+        " Make sure rate constants are memoized per solver with energies and temperature. "
+        # Construction.
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        parser = model.parser
+        solver = model.solver
+
+        parser.parse_data(filename=mkm_energy)
+        solver.get_data()
+
+        # Repeated calls hit the cache.
+        solver.get_rate_constants.cache_clear()
+        ref_kfs, ref_krs = solver.get_rate_constants()
+        ret_kfs, ret_krs = solver.get_rate_constants()
+        self.assertIs(ref_kfs, ret_kfs)
+        self.assertTupleEqual((1, 1, 256, 1), tuple(solver.get_rate_constants.cache_info()))
+
+        # Another model with the same energies but different temperature.
+        setup_dict = dict(self.setup_dict, temperature=500.0)
+        other_model = MicroKineticModel(setup_dict=setup_dict, logger_level=logging.WARNING)
+        other_model.parser.parse_data(filename=mkm_energy)
+        other_model.solver.get_data()
+        other_kfs, _ = other_model.solver.get_rate_constants()
+        self.assertNotEqual(ref_kfs, other_kfs)
+        self.assertEqual(1, solver.get_rate_constants.cache_info().misses)
+
+        # Temperature modification is detected by the fingerprint.
+        setattr(model, mangled_name(model, "temperature"), 500.0)
+        self.assertListEqual(other_kfs, solver.get_rate_constants()[0])
+        self.assertEqual(2, solver.get_rate_constants.cache_info().misses)
+
+        # Data and energies are identified by versions.
+        solver.get_rate_constants()
+        solver.get_data()
+        solver.get_rate_constants()
+        self.assertEqual(3, solver.get_rate_constants.cache_info().misses)
+        parser.parse_data(filename=mkm_energy)
+        solver.get_rate_constants()
+        self.assertEqual(4, solver.get_rate_constants.cache_info().misses)
+
+        # Invalidation.
+        solver.clear_cache()
+        self.assertTupleEqual((0, 0, 256, 0), tuple(solver.get_rate_constants.cache_info()))
+
+    def test_memoized_pickle(self):
+        " Make sure instances with memoized methods can be pickled. "
+        values = MemoizedValues(1.0)
+        self.assertEqual(3.0, values.get_value(2.0))
+
+        # Cached values are dropped.
+        loaded_values = pickle.loads(pickle.dumps(values))
+        self.assertEqual(1.0, loaded_values.offset)
+        self.assertTupleEqual((0, 0, 2, 0), tuple(loaded_values.get_value.cache_info()))
+        self.assertEqual(3.0, loaded_values.get_value(2.0))
+        self.assertIs(loaded_values, loaded_values.get_value.instance)
+        self.assertTupleEqual((0, 1, 2, 1), tuple(loaded_values.get_value.cache_info()))
+
     def test_boltzmann_coverages(self):
         # {{{
         " Test we can get the Boltzmann converages. "
@@ -291,6 +362,15 @@ class MeanFieldSolverTest(unittest.TestCase):
         ref_tof = mpf('-3750591092544.0')
         ret_tof = solver.get_tof(coverages, gas_name="CO_g")
         self.assertEqual(ref_tof, ret_tof)
+
+        # TOFs of a batch of net rates.
+        net_rates = [solver.get_net_rates(cvgs) for cvgs in [coverages, (0.5, 0.1)]]
+        ret_tofs = solver.get_tofs(net_rates)
+        self.assertTupleEqual((2, 3), ret_tofs.shape)
+        self.assertListEqual(solver.get_tof(coverages), ret_tofs[0].tolist())
+        self.assertListEqual(solver.get_tof((0.5, 0.1)), ret_tofs[1].tolist())
+
+        self.assertRaises(ParameterError, solver.get_tofs, net_rates[0])
         # }}}
 
     # ----------------------------------------------------------------
@@ -692,8 +772,18 @@ class MeanFieldSolverTest(unittest.TestCase):
 
         ret_kfs, ret_krs = solver.get_rate_constants_by_sym()
 
-        self.assertListEqual(ref_kfs, ret_kfs)
-        self.assertListEqual(ref_krs, ret_krs)
+        # Values are evaluated in full decimal precision.
+        self.assertTrue(np.allclose(np.array(ref_kfs, dtype=float),
+                                    np.array(ret_kfs, dtype=float), rtol=1e-9, atol=0.0))
+        self.assertTrue(np.allclose(np.array(ref_krs, dtype=float),
+                                    np.array(ret_krs, dtype=float), rtol=1e-9, atol=0.0))
+
+        # Same as the numerical rate constants.
+        kfs, krs = solver.get_rate_constants()
+        self.assertTrue(np.allclose(np.array(kfs, dtype=float),
+                                    np.array(ret_kfs, dtype=float), rtol=1e-9, atol=0.0))
+        self.assertTrue(np.allclose(np.array(krs, dtype=float),
+                                    np.array(ret_krs, dtype=float), rtol=1e-9, atol=0.0))
 
     def test_get_rates_by_syms(self):
         " Make sure we can get correct rates values by symbol derivation. "
@@ -714,8 +804,59 @@ class MeanFieldSolverTest(unittest.TestCase):
 
         ret_rfs, ret_rrs = solver.get_rates_by_sym(cvgs_tuple=coverages)
 
-        self.assertTupleEqual(ref_rfs, ret_rfs)
-        self.assertTupleEqual(ref_rrs, ret_rrs)
+        self.assertTrue(np.allclose(np.array(ref_rfs, dtype=float),
+                                    np.array(ret_rfs, dtype=float), rtol=1e-9, atol=0.0))
+        self.assertTrue(np.allclose(np.array(ref_rrs, dtype=float),
+                                    np.array(ret_rrs, dtype=float), rtol=1e-9, atol=0.0))
+
+        # Expressions are compiled only once.
+        self.assertTrue(("sym_rates", "mpmath") in solver._kernels)
+        ret_rfs, ret_rrs = solver.get_rates_by_sym(cvgs_tuple=(0.3, 0.5))
+        rfs, rrs = solver.get_rates((0.3, 0.5))
+        self.assertTrue(np.allclose(np.array(rfs, dtype=float),
+                                    np.array(ret_rfs, dtype=float), rtol=1e-9, atol=0.0))
+        self.assertTrue(np.allclose(np.array(rrs, dtype=float),
+                                    np.array(ret_rrs, dtype=float), rtol=1e-9, atol=0.0))
+
+    def test_sym_kernel_store(self):
+        " Make sure generated code of symbolic expressions can be reused by other models. "
+        # No store by default.
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        self.assertEqual("", model.sym_kernel_dir)
+
+        setup_dict = dict(self.setup_dict, sym_kernel_dir="auto_sym_kernels")
+        model = MicroKineticModel(setup_dict=setup_dict, logger_level=logging.WARNING)
+        model.parser.parse_data(filename=mkm_energy)
+        model.solver.get_data()
+        model.solver.get_data_symbols()
+
+        coverages = (0.5, 0.3)
+        ref_tof = model.solver.get_tof_by_sym(coverages)
+        filenames = os.listdir(model.sym_kernel_dir)
+        self.assertEqual(1, len(filenames))
+
+        # Load the stored code without symbol derivation.
+        model = MicroKineticModel(setup_dict=setup_dict, logger_level=logging.WARNING)
+        model.parser.parse_data(filename=mkm_energy)
+        model.solver.get_data()
+        ret_tof = model.solver.get_tof_by_sym(coverages)
+
+        self.assertFalse(model.solver.has_symbols)
+        self.assertTupleEqual(ref_tof, ret_tof)
+
+        # Code stored without the same key is not loaded.
+        filename = os.path.join(model.sym_kernel_dir, filenames[0])
+        with open(filename, "w") as f:
+            f.write("# scaks kernel tofs: None\nraise RuntimeError\n")
+
+        model = MicroKineticModel(setup_dict=setup_dict, logger_level=logging.ERROR)
+        model.parser.parse_data(filename=mkm_energy)
+        model.solver.get_data()
+        ret_tof = model.solver.get_tof_by_sym(coverages)
+
+        self.assertTupleEqual(ref_tof, ret_tof)
+        with open(filename, "r") as f:
+            self.assertNotIn("RuntimeError", f.read())
 
     def test_get_net_rate_syms(self):
         " Make sure we can get correct net rate symbols for all elementary reactions. "
@@ -782,8 +923,8 @@ class MeanFieldSolverTest(unittest.TestCase):
                          mpf('0.01408463956352'))
         ret_net_rates = solver.get_net_rates_by_sym(coverages)
 
-        for ref, ret in zip(ref_net_rates, ret_net_rates):
-            self.assertAlmostEqual(ref, ret, places=4)
+        self.assertTrue(np.allclose(np.array(ref_net_rates, dtype=float),
+                                    np.array(ret_net_rates, dtype=float), rtol=1e-9, atol=0.0))
 
     def test_get_tof_syms(self):
         " Test we can get TOF symbols correctly. "
@@ -851,8 +992,8 @@ class MeanFieldSolverTest(unittest.TestCase):
                    mpf('-125019703287.0'))
         ret_tof = solver.get_tof_by_sym(coverages)
 
-        for ref, ret in zip(ref_tof, ret_tof):
-            self.assertAlmostEqual(ref, ret, places=4)
+        self.assertTrue(np.allclose(np.array(ref_tof, dtype=float),
+                                    np.array(ret_tof, dtype=float), rtol=1e-9, atol=0.0))
 
     def tearDown(self):
         cleanup()
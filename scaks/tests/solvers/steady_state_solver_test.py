@@ -3,12 +3,18 @@ Test case for SteadyStateSolver.
 '''
 
 import logging
+import os
+import time
 import unittest
 
 from mpmath import mpf
+import numpy as np
 
+from ...errors.error import ParameterError
 from ...models.micro_kinetic_model import MicroKineticModel
+from ...mpicommons import mpi
 from ...solvers import SteadyStateSolver
+from ...solvers.rootfinding_iterators import Broyden, ConstrainedNewton, EvaluationCache
 
 from .. import *
 
@@ -153,6 +159,70 @@ class SteadyStateSolverTest(unittest.TestCase):
         for ref, ret in ref_dtheta_dt, ret_dtheta_dt:
             self.assertAlmostEqual(ret, ret)
 
+    def test_compiled_kernels(self):
+        " Make sure the dtheta/dt kernel and reaction network are compiled only once. "
+        # Construction.
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        parser = model.parser
+        solver = model.solver
+
+        parser.parse_data(filename=mkm_energy)
+        solver.get_data()
+
+        coverages = (0.2, 0.4)
+        ref_dtheta_dt = solver.steady_state_function(coverages)
+        kernel = solver._get_kernel("dtheta_dt", None)
+
+        # Kernel is reused for other coverages.
+        solver.steady_state_function((0.3, 0.3))
+        self.assertIs(kernel, solver._get_kernel("dtheta_dt", None))
+        self.assertTupleEqual(ref_dtheta_dt, solver.steady_state_function(coverages))
+
+        # Jacobian uses reaction network.
+        solver.analytical_jacobian(coverages)
+        self.assertTrue(("network", "mpmath") in solver._kernels)
+        self.assertEqual(2, len(solver._kernels))
+
+    def test_coverage_vector(self):
+        " Test coverages of adsorbates and free sites are indexed correctly. "
+        # Construction.
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        solver = model.solver
+
+        coverages = (mpf("0.2"), mpf("0.4"))
+        ref_vector = [mpf("0.2"), mpf("0.4"), 1.0 - (mpf("0.2") + mpf("0.4"))]
+        self.assertListEqual(ref_vector, solver._get_cvg_vector(coverages).tolist())
+
+        # Names are kept in order of the vector.
+        self.assertTupleEqual(("CO_s", "O_s", "*_s"), solver._cvg_names)
+        ref_cvgs_dict = {"CO_s": ref_vector[0], "O_s": ref_vector[1], "*_s": ref_vector[2]}
+        self.assertDictEqual(ref_cvgs_dict, solver._cvg_tuple2dict(coverages))
+
+        # Coverages in kernel source.
+        source = "r = kf[2]*theta['CO_s']*theta['O_s'] - kr[2]*theta['*_s']**2"
+        ref_source = "r = kf[2]*theta[0]*theta[1] - kr[2]*theta[2]**2"
+        self.assertEqual(ref_source, solver._index_coverages(source))
+
+    def test_constrain_coverages(self):
+        " Test coverages are constrained by site totals. "
+        # Construction.
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        solver = model.solver
+        constrain = solver._SteadyStateSolver__constrain_coverages
+
+        # Valid coverages are not changed.
+        coverages = (mpf("0.2"), mpf("0.4"))
+        self.assertTupleEqual(coverages, constrain(coverages))
+
+        # Clipped.
+        self.assertTupleEqual((mpf("0.0"), mpf("1.0")), constrain((mpf("-0.1"), mpf("1.2"))))
+
+        # Renormalized on site.
+        ref_coverages = (mpf("0.6")/mpf("1.5")*1.0, mpf("0.9")/mpf("1.5")*1.0)
+        self.assertTupleEqual(ref_coverages, constrain((mpf("0.6"), mpf("0.9"))))
+
+        self.assertRaises(ParameterError, constrain, (mpf("0.2"), ))
+
     def test_term_adsorbate_derivation(self):
         " Test private function __term_adsorbate_derivation(). "
         # Construction.
@@ -242,6 +312,19 @@ class SteadyStateSolverTest(unittest.TestCase):
         #    for n in range(2):
         #        self.assertAlmostEqual(ref_jacobian[m][n], float(ret_jacobian[m][n]), places=1)
 
+        # Compare with finite differences.
+        coverages = (mpf('0.2'), mpf('0.4'))
+        ret_jacobian = solver.analytical_jacobian(coverages)
+        f0 = solver.steady_state_function(coverages)
+        h = mpf('1e-40')
+        for j in range(2):
+            perturbed_coverages = list(coverages)
+            perturbed_coverages[j] += h
+            f1 = solver.steady_state_function(perturbed_coverages)
+            for i in range(2):
+                ref = (f1[i] - f0[i])/h
+                self.assertAlmostEqual(ref, ret_jacobian[i, j], delta=abs(ref)*1e-30)
+
     def test_get_residual(self):
         " Test we can get correct residual. "
         # Construction.
@@ -292,6 +375,296 @@ class SteadyStateSolverTest(unittest.TestCase):
         for ref, ret in zip(ref_sscvg, ret_sscvg):
             self.assertAlmostEqual(ref, float(ret))
 
+    def test_numpy_representation(self):
+        " Test solver with native float64 numerical representation. "
+        # Construction.
+        self.setup_dict["numerical_representation"] = "numpy"
+        self.setup_dict["tolerance"] = 1e-4
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        parser = model.parser
+        solver = model.solver
+
+        parser.parse_data(filename=mkm_energy)
+        solver.get_data()
+
+        # Check values of dtheta/dt.
+        coverages = (0.2, 0.4)
+        ref_dtheta_dt = [3750591092553.4717, 1000157626302.0253]
+        ret_dtheta_dt = solver.steady_state_function(coverages)
+        for ref, ret in zip(ref_dtheta_dt, ret_dtheta_dt):
+            self.assertTrue(isinstance(ret, float))
+            self.assertAlmostEqual(ref/ret, 1.0, places=10)
+
+        # Check Jacobian matrix type.
+        jacobian = solver.analytical_jacobian(coverages)
+        self.assertTupleEqual(jacobian.shape, (2, 2))
+        self.assertEqual(jacobian.dtype, np.float64)
+
+        # Check steady state coverages.
+        ref_sscvg = [0.9993009023315728, 0.0006990944289937246]
+        ret_sscvg = solver.get_steady_state_cvgs([0.9, 0.1])
+        for ref, ret in zip(ref_sscvg, ret_sscvg):
+            self.assertAlmostEqual(ref, ret, places=3)
+
+    def test_vectorized_rates(self):
+        " Make sure vectorized rates of reaction network are the same as compiled kernels. "
+        # Construction.
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        parser = model.parser
+        solver = model.solver
+
+        parser.parse_data(filename=mkm_energy)
+        solver.get_data()
+
+        coverages = (mpf('0.2'), mpf('0.4'))
+
+        # Arbitrary precision floats.
+        ref_rfs, ref_rrs = solver.get_rates(coverages)
+        ret_rfs, ret_rrs = solver._get_network_rates(coverages)
+        for ref, ret in zip(ref_rfs + ref_rrs, list(ret_rfs) + list(ret_rrs)):
+            self.assertEqual(type(ret), type(ref))
+            self.assertAlmostEqual(ref, ret, delta=abs(ref)*1e-90)
+
+        ref_dtheta_dt = solver.steady_state_function(coverages)
+        ret_dtheta_dt = solver._get_network().dtheta_dt(ret_rfs, ret_rrs)
+        for ref, ret in zip(ref_dtheta_dt, ret_dtheta_dt):
+            self.assertAlmostEqual(ref, ret, delta=abs(ref)*1e-90)
+
+    def test_mixed_precision(self):
+        " Test steady state coverages can be solved in mixed precision mode. "
+        # Construction.
+        self.setup_dict["mixed_precision"] = True
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        parser = model.parser
+        solver = model.solver
+
+        parser.parse_data(filename=mkm_energy)
+        solver.get_data()
+
+        # Check.
+        coverages = [0.9, 0.1]
+        ref_sscvg = [0.9993009023315728, 0.0006990944289937246]
+        ret_sscvg = solver.get_steady_state_cvgs(coverages)
+        for ref, ret in zip(ref_sscvg, ret_sscvg):
+            self.assertAlmostEqual(ref, float(ret))
+        self.assertTrue(solver.error < 1e-20)
+
+        # Check statistics of stages.
+        stages = [stage["stage"] for stage in solver.stage_statistics]
+        self.assertListEqual(["float64", "mpmath"], stages)
+        for stage in solver.stage_statistics:
+            self.assertTrue(stage["iterations"] > 0)
+            self.assertTrue(stage["time"] >= 0.0)
+
+    def test_backtracking_line_search(self):
+        " Test steady state coverages with backtracking line search. "
+        # Construction.
+        self.setup_dict["line_search"] = "backtracking"
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        parser = model.parser
+        solver = model.solver
+
+        parser.parse_data(filename=mkm_energy)
+        solver.get_data()
+
+        # Check.
+        coverages = [0.9, 0.1]
+        ref_sscvg = [0.9993009023315728, 0.0006990944289937246]
+        ret_sscvg = solver.get_steady_state_cvgs(coverages)
+        for ref, ret in zip(ref_sscvg, ret_sscvg):
+            self.assertAlmostEqual(ref, float(ret))
+
+        # Evaluations are shared through the cache.
+        f = EvaluationCache(solver.steady_state_function)
+        self.assertIs(f(ret_sscvg), f(list(ret_sscvg)))
+        self.assertTupleEqual((1, 1), (f.hits, f.misses))
+
+    def test_line_search_evaluations(self):
+        " Make sure backtracking line search needs fewer evaluations than golden. "
+        # Construction.
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        parser = model.parser
+        solver = model.solver
+
+        parser.parse_data(filename=mkm_energy)
+        solver.get_data()
+
+        def solve(line_search):
+            f = EvaluationCache(solver.steady_state_function)
+            iterator = ConstrainedNewton(f, (0.9, 0.1),
+                                         J=solver.analytical_jacobian,
+                                         constraint=lambda x: x,
+                                         norm=solver._norm,
+                                         mpfloat=solver._mpf,
+                                         matrix=solver._matrix,
+                                         Axb_solver=solver._Axb_solver,
+                                         line_search=line_search)
+            for i, (x, fxnorm, fx) in enumerate(iterator):
+                if fxnorm < model.tolerance or i >= 20:
+                    break
+            return x, fxnorm, f.misses
+
+        ref_sscvg = [0.9993009023315728, 0.0006990944289937246]
+        golden_x, golden_norm, golden_evaluations = solve("golden")
+        backtracking_x, backtracking_norm, backtracking_evaluations = solve("backtracking")
+
+        # Both converge to the same root.
+        for x in [golden_x, backtracking_x]:
+            for ref, ret in zip(ref_sscvg, x):
+                self.assertAlmostEqual(ref, float(ret))
+        self.assertTrue(golden_norm < model.tolerance)
+        self.assertTrue(backtracking_norm < model.tolerance)
+
+        # Golden section search evaluates dtheta/dt tens of times per step.
+        self.assertTrue(5*backtracking_evaluations < golden_evaluations)
+
+    def test_broyden(self):
+        " Test steady state coverages with Broyden iterator. "
+        # Construction.
+        self.setup_dict["rootfinding"] = "Broyden"
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        parser = model.parser
+        solver = model.solver
+
+        parser.parse_data(filename=mkm_energy)
+        solver.get_data()
+
+        # Check.
+        coverages = [0.9, 0.1]
+        ref_sscvg = [0.9993009023315728, 0.0006990944289937246]
+        ret_sscvg = solver.get_steady_state_cvgs(coverages)
+        for ref, ret in zip(ref_sscvg, ret_sscvg):
+            self.assertAlmostEqual(ref, float(ret))
+
+        # Jacobian is reused near the root.
+        iterator = Broyden(solver.steady_state_function, (0.9993, 0.0007),
+                           J=solver.analytical_jacobian,
+                           constraint=lambda x: x,
+                           norm=solver._norm,
+                           mpfloat=solver._mpf,
+                           matrix=solver._matrix,
+                           LU_factor=solver._LU_factor,
+                           LU_solve=solver._LU_solve)
+        iterations = 0
+        for x, error, fx in iterator:
+            iterations += 1
+            if error < 1e-20:
+                break
+        self.assertTrue(error < 1e-20)
+        self.assertTrue(iterator.jacobian_evaluations < iterations)
+
+    def test_multistart(self):
+        " Test steady state coverages with multi-start search. "
+        # Construction.
+        self.setup_dict["multistart"] = 4
+        self.setup_dict["processes"] = 2
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        parser = model.parser
+        solver = model.solver
+
+        parser.parse_data(filename=mkm_energy)
+        solver.get_data()
+
+        # Candidate initial guesses.
+        coverages = (solver._mpf(0.5), solver._mpf(0.5))
+        candidates = solver.get_initial_guesses(coverages, 4)
+        self.assertEqual(4, len(candidates))
+        self.assertTupleEqual(coverages, candidates[0]())
+        for candidate in candidates:
+            self.assertTrue(sum(candidate()) <= 1.0)
+
+        # Check.
+        ref_sscvg = [0.9993009023315728, 0.0006990944289937246]
+        ret_sscvg = solver.get_steady_state_cvgs(coverages)
+        for ref, ret in zip(ref_sscvg, ret_sscvg):
+            self.assertAlmostEqual(ref, float(ret))
+        self.assertTrue(solver.stage_statistics[-1]["iterations"] > 0)
+
+    def test_multistart_fallback(self):
+        " Make sure non-converged candidates of multi-start search are not accepted. "
+        # Construction.
+        self.setup_dict["multistart"] = 4
+        self.setup_dict["processes"] = 2
+        self.setup_dict["rootfinding"] = "MDNewton"
+        self.setup_dict["max_rootfinding_iterations"] = 2
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.ERROR)
+        parser = model.parser
+        solver = model.solver
+
+        parser.parse_data(filename=mkm_energy)
+        solver.get_data()
+
+        # Check.
+        ref_sscvg = [0.9993009023315728, 0.0006990944289937246]
+        coverages = (solver._mpf(0.5), solver._mpf(0.5))
+        ret_sscvg = solver.get_steady_state_cvgs(coverages)
+        self.assertTrue(solver.error <= model.tolerance)
+        for ref, ret in zip(ref_sscvg, ret_sscvg):
+            self.assertAlmostEqual(ref, float(ret))
+
+    def test_solve_ode(self):
+        " Test ODE integration with analytical Jacobian. "
+        # Construction.
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        parser = model.parser
+        solver = model.solver
+
+        parser.parse_data(filename=mkm_energy)
+        solver.get_data()
+
+        # Check.
+        ref_cvgs = [0.89308072, 0.10691928]
+        for algo in ["BDF", "LSODA", "Radau"]:
+            t, ret_cvgs = solver.solve_ode(algo=algo, time_end=10, initial_cvgs=(0.0, 0.0))
+            self.assertEqual(10.0, t)
+            for ref, ret in zip(ref_cvgs, ret_cvgs):
+                self.assertAlmostEqual(ref, ret, places=5)
+
+    def test_steady_state_event(self):
+        " Test ODE integration can be stopped when steady state is reached. "
+        # Construction.
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        parser = model.parser
+        solver = model.solver
+
+        parser.parse_data(filename=mkm_energy)
+        solver.get_data()
+
+        # Check.
+        ref_sscvg = [0.9993009023315728, 0.0006990944289937246]
+        t, ret_sscvg, info = solver.solve_ode(algo="BDF",
+                                              time_end=1e6,
+                                              initial_cvgs=(0.0, 0.0),
+                                              full_output=True)
+        self.assertTrue(t < 1e6)
+        self.assertTrue(info["reason"] in ["residual", "relative_change"])
+        for ref, ret in zip(ref_sscvg, ret_sscvg):
+            self.assertAlmostEqual(ref, ret)
+
+        # Integrate to the end without event.
+        t, ret_sscvg, info = solver.solve_ode(algo="BDF",
+                                              time_end=1e6,
+                                              initial_cvgs=(0.0, 0.0),
+                                              steady_state_event=False,
+                                              full_output=True)
+        self.assertEqual(1e6, t)
+        self.assertEqual("time_end", info["reason"])
+
+        # Stop by residual in native floats, the time window is scaled to integration time.
+        self.setup_dict["ode_steady_state_rtol"] = 0.0
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        model.parser.parse_data(filename=mkm_energy)
+        model.solver.get_data()
+        t, ret_sscvg, info = model.solver.solve_ode(algo="BDF",
+                                                    time_end=1e3,
+                                                    initial_cvgs=(0.0, 0.0),
+                                                    full_output=True)
+        self.assertEqual("residual", info["reason"])
+        self.assertTrue(info["residual"] < model.coarse_tolerance)
+        self.assertTrue(10.0 <= t < 1e3)
+        for ref, ret in zip(ref_sscvg, ret_sscvg):
+            self.assertAlmostEqual(ref, ret)
+
     def test_get_single_XRC(self):
         " Test function get_single_XRC(). "
         # Construction.
@@ -313,6 +686,99 @@ class SteadyStateSolverTest(unittest.TestCase):
         for ref, ret in zip(ref_XRC, ret_XRC):
             self.assertAlmostEqual(ref, float(ret), places=4)
 
+    def test_parallel_XRC(self):
+        " Test finite difference XRC with perturbations solved in parallel. "
+        # Construction.
+        self.setup_dict["processes"] = 2
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        parser = model.parser
+        solver = model.solver
+
+        parser.parse_data(filename=mkm_energy)
+        solver.get_data()
+
+        # Get steady state converages first.
+        coverages = [0.9, 0.1]
+        sscvgs = solver.get_steady_state_cvgs(coverages)
+
+        # Check.
+        gas_name = "CO2_g"
+        ref_XRC = [-0.00000, 0.9986, 0.00139]
+        with LogCapture("model.utilities.parallel_utilities", level=logging.INFO) as cm:
+            ret_XRC = solver.get_single_XRC(gas_name, epsilon=1e-5)
+        for ref, ret in zip(ref_XRC, ret_XRC):
+            self.assertAlmostEqual(ref, float(ret), places=4)
+
+        # Perturbations are not mapped serially.
+        self.assertListEqual([], cm.output)
+
+        # Perturbed steady states are neither kept nor archived.
+        self.assertTupleEqual(tuple(sscvgs), tuple(solver.coverages))
+        archived_cvgs = solver._archived_data_dict["steady_state_coverages"]
+        self.assertTupleEqual(tuple(sscvgs), tuple(archived_cvgs))
+
+        # Worker processes are forked after archiving steady state data.
+        solver.get_steady_state_cvgs(coverages)
+        pids = mpi.task_farm(lambda x: time.sleep(0.1) or os.getpid(), range(4),
+                             processes=model.processes)
+        self.assertNotIn(os.getpid(), pids)
+        self.assertEqual(model.processes, len(set(pids)))
+
+    def test_analytical_XRC(self):
+        " Test XRC can be calculated using sensitivities at steady state. "
+        # Construction.
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        parser = model.parser
+        solver = model.solver
+
+        parser.parse_data(filename=mkm_energy)
+        solver.get_data()
+
+        # Get steady state converages first.
+        coverages = [0.9, 0.1]
+        solver.get_steady_state_cvgs(coverages)
+
+        # Check.
+        gas_name = "CO2_g"
+        ref_XRC = [-0.00000, 0.9986, 0.00139]
+        ret_XRC = solver.get_single_XRC(gas_name, method="analytical")
+        for ref, ret in zip(ref_XRC, ret_XRC):
+            self.assertAlmostEqual(ref, float(ret), places=4)
+
+        # Sum of XRCs is 1.
+        self.assertAlmostEqual(1.0, float(sum(ret_XRC)), places=10)
+
+        self.assertRaises(ParameterError, solver.get_single_XRC, gas_name, method="exact")
+
+    def test_get_XTRC(self):
+        " Test XTRC can be calculated for all gas species. "
+        # Construction.
+        self.setup_dict["parser"] = "AbsoluteEnergyParser"
+        model = MicroKineticModel(setup_dict=self.setup_dict, logger_level=logging.WARNING)
+        parser = model.parser
+        solver = model.solver
+
+        parser.parse_data(filename=mkm_abs_energy)
+        solver.get_data()
+
+        # Get steady state converages first.
+        coverages = [0.9, 0.1]
+        solver.get_steady_state_cvgs(coverages)
+
+        # Check, intermediates: CO_s, O_s, CO-O_2s.
+        ref_XTRC = [-1.99860, -0.00139, 0.00139]
+        ret_XTRC_matrix = solver.get_XTRC()
+        self.assertEqual(len(model.gas_names), len(ret_XTRC_matrix))
+        for ret_XTRC in ret_XTRC_matrix:
+            for ref, ret in zip(ref_XTRC, ret_XTRC):
+                self.assertAlmostEqual(ref, float(ret), places=4)
+
+        ret_XTRC = solver.get_single_XTRC("CO2_g")
+        for ref, ret in zip(ref_XTRC, ret_XTRC):
+            self.assertAlmostEqual(ref, float(ret), places=4)
+
+        self.assertRaises(ParameterError, solver.get_single_XTRC, "H2_g")
+
     def test_get_elementary_dtheta_dt_sym(self):
         " Test we can get correct dtheta/dt expression for an elementary reaction. "
         # Construction.
@@ -377,7 +843,8 @@ class SteadyStateSolverTest(unittest.TestCase):
                          mpf('125019703287.740081787109375'))
         ret_dtheta_dt = solver.steady_state_function_by_sym(coverages)
 
-        self.assertTupleEqual(ref_dtheta_dt, ret_dtheta_dt)
+        self.assertTrue(np.allclose(np.array(ref_dtheta_dt, dtype=float),
+                                    np.array(ret_dtheta_dt, dtype=float), rtol=1e-12, atol=0.0))
 
     def test_analytical_jacobian_sym(self):
         " Make sure we can get anlytical jacobian matrix correctly. "
@@ -401,7 +868,8 @@ class SteadyStateSolverTest(unittest.TestCase):
                         [mpf('-1250197032877.56982421875'), mpf('-1250197032877.588623046875')]]
         ret_jacobian = solver.analytical_jacobian_by_sym(coverages).tolist()
 
-        self.assertListEqual(ref_jacobian, ret_jacobian)
+        self.assertTrue(np.allclose(np.array(ref_jacobian, dtype=float),
+                                    np.array(ret_jacobian, dtype=float), rtol=1e-12, atol=0.0))
 
     def tearDown(self):
         cleanup()
@@ -0,0 +1,166 @@
+import glob
+import logging
+import os
+import threading
+import time
+import unittest
+
+from ...compatutil import pickle
+from ...errors.error import *
+from ...utilities.archive_utilities import *
+
+from .. import LogCapture
+
+
+class ArchiveUtilitiesTest(unittest.TestCase):
+
+    def setUp(self):
+        # Test case setting.
+        self.maxDiff = None
+        self.filename = "test_archive.pkl"
+
+    def tearDown(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def test_snapshot(self):
+        " Test latest values of data are archived in snapshot mode. "
+        writer = ArchiveWriter(self.filename, interval=0.0)
+        writer.update("tofs", [1.0, 2.0])
+        writer.update("tofs", [3.0, 4.0])
+        writer.update("error", 1e-10)
+
+        # Updates are buffered.
+        self.assertFalse(os.path.exists(self.filename))
+
+        writer.flush()
+        ref_data = {"tofs": [3.0, 4.0], "error": 1e-10}
+        self.assertDictEqual(ref_data, load_archive(self.filename))
+        self.assertDictEqual(ref_data, writer.data)
+
+        # File is replaced.
+        writer.update("error", 1e-12)
+        writer.close()
+        self.assertEqual(1, len(load_archive_records(self.filename)))
+        self.assertListEqual([], glob.glob(self.filename + ".*.tmp"))
+        self.assertRaises(ValueError, writer.update, "error", 1e-12)
+
+        # Data file of single dict.
+        with open(self.filename, "wb") as f:
+            pickle.dump(ref_data, f)
+        self.assertDictEqual(ref_data, load_archive(self.filename))
+
+        self.assertRaises(ParameterError, ArchiveWriter, self.filename, mode="overwrite")
+
+    def test_append(self):
+        " Test all values of data are archived in append mode. "
+        writer = ArchiveWriter(self.filename, mode="append", interval=0.0, count=2)
+        writer.update("tofs", [1.0, 2.0])
+        self.assertFalse(os.path.exists(self.filename))
+
+        # Flush when enough updates are buffered.
+        writer.update("tofs", [3.0, 4.0])
+        self.assertEqual(2, len(load_archive_records(self.filename)))
+
+        writer.update("tofs", [5.0, 6.0])
+        writer.close()
+
+        ref_records = [{"tofs": [1.0, 2.0]}, {"tofs": [3.0, 4.0]}, {"tofs": [5.0, 6.0]}]
+        self.assertListEqual(ref_records, load_archive_records(self.filename))
+        self.assertDictEqual({"tofs": [5.0, 6.0]}, load_archive(self.filename))
+
+    def test_background_flush(self):
+        " Test buffered updates are flushed in background thread. "
+        writer = ArchiveWriter(self.filename, interval=0.05)
+        writer.update("error", 1e-10)
+
+        for _ in range(100):
+            if os.path.exists(self.filename):
+                break
+            time.sleep(0.01)
+        self.assertDictEqual({"error": 1e-10}, load_archive(self.filename))
+
+        writer.update("error", 1e-12)
+        writer.close()
+        self.assertDictEqual({"error": 1e-12}, load_archive(self.filename))
+
+    def test_background_flush_failure(self):
+        " Make sure failed background flushes are logged and retried. "
+        writer = ArchiveWriter(self.filename, interval=0.02)
+        with LogCapture("model.utilities.ArchiveWriter", level=logging.WARNING) as cm:
+            # Unpicklable data.
+            writer.update("f", lambda x: x)
+            for _ in range(100):
+                if cm.output:
+                    break
+                time.sleep(0.01)
+        self.assertIn("failed to flush archive", cm.output[0])
+        self.assertFalse(os.path.exists(self.filename))
+        self.assertListEqual([], glob.glob(self.filename + ".*.tmp"))
+
+        # Updates are kept and written in next flush.
+        writer.update("f", 1.0)
+        writer.close()
+        self.assertDictEqual({"f": 1.0}, load_archive(self.filename))
+
+    def test_drop_failed_updates(self):
+        " Make sure updates failing in successive flushes are dropped. "
+        writer = ArchiveWriter(self.filename, interval=0.01, max_failures=2)
+        with LogCapture("model.utilities.ArchiveWriter", level=logging.ERROR) as cm:
+            # Unpicklable data.
+            writer.update("f", lambda x: x)
+            writer.update("error", 1e-10)
+            for _ in range(100):
+                if os.path.exists(self.filename):
+                    break
+                time.sleep(0.01)
+        self.assertEqual(1, len(cm.output))
+        self.assertIn("1 buffered updates are dropped", cm.output[0])
+
+        # Other updates are written.
+        self.assertDictEqual({"error": 1e-10}, load_archive(self.filename))
+        self.assertDictEqual({"error": 1e-10}, writer.data)
+        writer.close()
+
+    def test_pause(self):
+        " Test background flush can be stopped and restarted. "
+        nthreads = threading.active_count()
+        writer = ArchiveWriter(self.filename, interval=10.0)
+        writer.update("error", 1e-10)
+        self.assertEqual(nthreads + 1, threading.active_count())
+
+        # Buffered updates are written and thread is stopped.
+        writer.pause()
+        self.assertEqual(nthreads, threading.active_count())
+        self.assertDictEqual({"error": 1e-10}, load_archive(self.filename))
+
+        # Thread is restarted by next update.
+        writer.update("error", 1e-12)
+        self.assertEqual(nthreads + 1, threading.active_count())
+        pause_archives()
+        self.assertEqual(nthreads, threading.active_count())
+        self.assertDictEqual({"error": 1e-12}, load_archive(self.filename))
+        writer.close()
+
+    def test_concurrent_writers(self):
+        " Make sure writers of the same archive use different temporary files. "
+        writers = [ArchiveWriter(self.filename, interval=0.0) for _ in range(4)]
+
+        def write(writer):
+            for i in range(20):
+                writer.update("i", i)
+                writer.flush()
+
+        threads = [threading.Thread(target=write, args=(w,)) for w in writers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertDictEqual({"i": 19}, load_archive(self.filename))
+        self.assertListEqual([], glob.glob(self.filename + ".*.tmp"))
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(ArchiveUtilitiesTest)
+    unittest.TextTestRunner(verbosity=2).run(suite)
+
@@ -0,0 +1,78 @@
+import os
+import shutil
+import unittest
+
+from ...utilities.cache_utilities import *
+
+
+class CacheUtilitiesTest(unittest.TestCase):
+
+    def setUp(self):
+        # Test case setting.
+        self.maxDiff = None
+        self.dirname = "test_model_cache"
+        self.key = ("0.1.0", ("CO_g + *_s -> CO_s", ))
+
+    def tearDown(self):
+        if os.path.exists(self.dirname):
+            shutil.rmtree(self.dirname)
+
+    def test_get(self):
+        " Test data can be cached and loaded by other cache with the same key. "
+        calls = []
+
+        def builder():
+            calls.append(1)
+            return [0.1, 0.2]
+
+        cache = ModelCache(self.dirname, self.key)
+        self.assertListEqual([0.1, 0.2], cache.get("data", builder))
+        self.assertListEqual([0.1, 0.2], cache.get("data", builder))
+        self.assertEqual(1, len(calls))
+        self.assertTrue(os.path.exists(cache.filename))
+
+        # Load from file.
+        cache = ModelCache(self.dirname, self.key)
+        self.assertTrue("data" in cache)
+        self.assertListEqual([0.1, 0.2], cache.get("data", builder))
+        self.assertEqual(1, len(calls))
+
+        # Entries written by other caches are kept.
+        ModelCache(self.dirname, self.key).get("other", lambda: "other")
+        self.assertTrue("other" in ModelCache(self.dirname, self.key))
+
+        # Different key.
+        cache = ModelCache(self.dirname, ("0.1.0", ("O2_g + 2*_s -> 2O_s", )))
+        self.assertFalse("data" in cache)
+        self.assertListEqual([0.1, 0.2], cache.get("data", builder))
+        self.assertEqual(2, len(calls))
+
+    def test_no_cache(self):
+        " Test data are built every time without cache directory. "
+        calls = []
+
+        def builder():
+            calls.append(1)
+            return {}
+
+        cache = ModelCache("", self.key)
+        self.assertIsNone(cache.filename)
+        cache.get("data", builder)
+        cache.get("data", builder)
+        self.assertEqual(2, len(calls))
+        self.assertFalse("data" in cache)
+
+    def test_corrupted_file(self):
+        " Test corrupted cache file is ignored. "
+        cache = ModelCache(self.dirname, self.key)
+        cache.get("data", lambda: 1)
+        with open(cache.filename, "wb") as f:
+            f.write(b"corrupted")
+
+        cache = ModelCache(self.dirname, self.key)
+        self.assertEqual(2, cache.get("data", lambda: 2))
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(CacheUtilitiesTest)
+    unittest.TextTestRunner(verbosity=2).run(suite)
+
@@ -0,0 +1,92 @@
+import os
+import shutil
+import unittest
+
+from ...errors.error import *
+from ...utilities.checkpoint_utilities import *
+
+
+class CheckpointUtilitiesTest(unittest.TestCase):
+
+    def setUp(self):
+        # Test case setting.
+        self.maxDiff = None
+        self.dirname = "test_checkpoints"
+        os.mkdir(self.dirname)
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_write_load(self):
+        " Test checkpoint records can be written and loaded correctly. "
+        filename = checkpoint_filename(self.dirname, rank=1)
+        self.assertTrue(os.path.basename(filename).startswith("rank1_"))
+
+        writer = CheckpointWriter(filename, batch_size=3)
+        for i in range(4):
+            writer.append((i, 0.5), {"coverages": [0.1*i]})
+
+        # Only full batches are written before close.
+        self.assertEqual(3, len(load_checkpoint(filename)))
+
+        writer.close()
+        self.assertRaises(ValueError, writer.append, (4, 0.5), {})
+
+        # Check.
+        records = load_checkpoint(filename)
+        self.assertDictEqual({(i, 0.5): {"coverages": [0.1*i]} for i in range(4)}, records)
+
+        # Records are appended to existing file.
+        with CheckpointWriter(filename) as writer:
+            writer.append((0, 0.5), {"coverages": [1.0]})
+        self.assertListEqual([1.0], load_checkpoint(filename)[(0, 0.5)]["coverages"])
+
+        # Records of all files in the directory.
+        with CheckpointWriter(os.path.join(self.dirname, "rank0_0.ckpt")) as writer:
+            writer.append((5, 0.5), {"coverages": [0.5]})
+        self.assertEqual(5, len(load_checkpoints(self.dirname)))
+        self.assertDictEqual({}, load_checkpoints("no_checkpoints"))
+
+        self.assertRaises(ParameterError, CheckpointWriter, filename, batch_size=0)
+
+    def test_partial_record(self):
+        " Test records partially written are ignored. "
+        filename = checkpoint_filename(self.dirname)
+        with CheckpointWriter(filename) as writer:
+            writer.append(0, [0.1])
+            writer.append(1, [0.2])
+
+        with open(filename, "rb") as f:
+            content = f.read()
+        with open(filename, "wb") as f:
+            f.write(content[:-3])
+
+        self.assertDictEqual({0: [0.1]}, load_checkpoint(filename))
+
+    def test_header(self):
+        " Test records are matched with model and conditions by checkpoint header. "
+        header = {"temperature": 450.0, "rxn_expressions": ["CO_g + *_s -> CO_s"]}
+        self.assertTrue(match_checkpoint_header(self.dirname, header))
+
+        write_checkpoint_header(self.dirname, header)
+        self.assertTrue(match_checkpoint_header(self.dirname, dict(header)))
+        self.assertFalse(match_checkpoint_header(self.dirname, dict(header, temperature=500.0)))
+
+        # Records without header.
+        os.remove(os.path.join(self.dirname, header_filename))
+        with CheckpointWriter(checkpoint_filename(self.dirname)) as writer:
+            writer.append(0, [0.1])
+        self.assertFalse(match_checkpoint_header(self.dirname, header))
+
+    def test_fingerprint(self):
+        " Test fingerprints are identical for equal contents. "
+        energies = {"Gaf": [0.0, 1.25], "Gar": [0.758, 0.926]}
+        self.assertEqual(fingerprint(energies),
+                         fingerprint({"Gar": (0.758, 0.926), "Gaf": [0.0, 1.25]}))
+        self.assertNotEqual(fingerprint(energies),
+                            fingerprint({"Gaf": [0.0, 1.25], "Gar": [0.758, 0.927]}))
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(CheckpointUtilitiesTest)
+    unittest.TextTestRunner(verbosity=2).run(suite)
+
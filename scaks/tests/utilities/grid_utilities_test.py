@@ -0,0 +1,36 @@
+import unittest
+
+from ...utilities.grid_utilities import *
+
+
+class GridUtilitiesTest(unittest.TestCase):
+
+    def setUp(self):
+        # Test case setting.
+        self.maxDiff = None
+
+    def test_snake_path(self):
+        " Test all grid points are walked through along a snake path. "
+        ref_path = [(0, 0), (0, 1), (0, 2), (1, 2), (1, 1), (1, 0)]
+        self.assertListEqual(ref_path, snake_path((2, 3)))
+
+        self.assertListEqual([()], snake_path(()))
+
+        # Successive points are neighbours.
+        path = snake_path((3, 2, 4))
+        self.assertEqual(24, len(set(path)))
+        for idx1, idx2 in zip(path[:-1], path[1:]):
+            self.assertEqual(1, sum(abs(i - j) for i, j in zip(idx1, idx2)))
+
+    def test_split_path(self):
+        " Test path can be split into contiguous segments. "
+        path = list(range(5))
+        self.assertListEqual([[0, 1, 2], [3, 4]], split_path(path, 2))
+        self.assertListEqual([[0], [1], [2], [3], [4]], split_path(path, 8))
+        self.assertListEqual([path], split_path(path, 0))
+        self.assertListEqual([], split_path([], 2))
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(GridUtilitiesTest)
+    unittest.TextTestRunner(verbosity=2).run(suite)
+
@@ -0,0 +1,72 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+import unittest
+
+from ...utilities.import_utilities import *
+
+from .. import abs_path, LogCapture
+
+# Script to import the model module in a new interpreter.
+import_script = """
+import json, sys
+import scaks.models.micro_kinetic_model
+heavy_modules = ["sympy", "scipy", "mpi4py", "KMCLib", "matplotlib"]
+print(json.dumps(dict(imported=[m for m in heavy_modules if m in sys.modules])))
+"""
+
+
+class ImportUtilitiesTest(unittest.TestCase):
+
+    def setUp(self):
+        # Test case setting.
+        self.maxDiff = None
+
+    def test_lazy_module(self):
+        " Test module is imported at first attribute access. "
+        lazy_json = LazyModule("json")
+        self.assertIn("not imported", repr(lazy_json))
+
+        self.assertEqual('{"a": 1}', lazy_json.dumps({"a": 1}))
+        self.assertIn("(imported)", repr(lazy_json))
+        self.assertIs(json.dumps, lazy_json.dumps)
+
+        # Module not installed.
+        self.assertRaises(ImportError, getattr, LazyModule("scaks_missing_module"), "f")
+
+    def test_import_optional(self):
+        " Test missing optional module is warned only once. "
+        self.assertIs(json, import_optional("json", "json output"))
+
+        logger_name = "model.utilities.import_utilities"
+        with LogCapture(logger_name, level=logging.WARNING) as cm:
+            self.assertIsNone(import_optional("scaks_missing_module", "nothing"))
+            self.assertIsNone(import_optional("scaks_missing_module", "nothing"))
+            logging.getLogger(logger_name).warning("end")
+        self.assertEqual(2, len(cm.output))
+        self.assertIn("scaks_missing_module is not installed", cm.output[0])
+
+    def test_import_time(self):
+        " Make sure heavy optional packages are not imported with the model. "
+        root = os.path.dirname(os.path.dirname(abs_path))
+        env = dict(os.environ)
+        env.pop("SCAKS_MPI", None)
+        proc = subprocess.Popen([sys.executable, "-c", import_script], cwd=root, env=env,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                universal_newlines=True)
+        stdout, stderr = proc.communicate()
+        self.assertEqual(0, proc.returncode, stderr)
+
+        # Nothing but the result is printed.
+        lines = stdout.strip().splitlines()
+        self.assertEqual(1, len(lines))
+
+        result = json.loads(lines[0])
+        self.assertListEqual([], result["imported"])
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(ImportUtilitiesTest)
+    unittest.TextTestRunner(verbosity=2).run(suite)
+
@@ -0,0 +1,83 @@
+import os
+import unittest
+
+from ...mpicommons import mpi, mpi_requested, MPIUtil, MPI_LAUNCHER_VARS
+from ...utilities.parallel_utilities import mpi_initialized
+
+
+class MPICommonsTest(unittest.TestCase):
+
+    def setUp(self):
+        # Test case setting.
+        self.maxDiff = None
+
+    def test_split_seq(self):
+        " Test sequence can be split for processes. "
+        sequence = list(range(7))
+        self.assertListEqual(sequence, mpi.split_seq(sequence))
+        self.assertListEqual([], mpi.split_seq([]))
+
+    def test_task_farm(self):
+        " Test tasks can be mapped with results in input order. "
+        tasks = list(range(20))
+        ref_results = [task**2 for task in tasks]
+
+        results = mpi.task_farm(lambda x: x**2, tasks, processes=2)
+        self.assertListEqual(ref_results, results)
+
+        # Timing information.
+        results, info = mpi.task_farm(lambda x: x**2, tasks, chunk_size=3,
+                                      processes=2, full_output=True)
+        self.assertListEqual(ref_results, results)
+        self.assertEqual(len(tasks), len(info["times"]))
+        self.assertListEqual([mpi.rank]*len(tasks), info["ranks"])
+        self.assertTrue(all(t >= 0.0 for t in info["times"]))
+
+        # Exception in task.
+        def func(x):
+            if x == 5:
+                raise ValueError("Bad task.")
+            return x
+
+        self.assertRaises(ValueError, mpi.task_farm, func, tasks, processes=1)
+        self.assertRaises(ValueError, mpi.task_farm, func, tasks, chunk_size=0)
+
+    def test_mpi_requested(self):
+        " Test MPI is requested only by MPI launcher or environment variable. "
+        env = dict(os.environ)
+        try:
+            for var in MPI_LAUNCHER_VARS + ("SCAKS_MPI", ):
+                os.environ.pop(var, None)
+            self.assertFalse(mpi_requested())
+
+            os.environ["OMPI_COMM_WORLD_SIZE"] = "2"
+            self.assertTrue(mpi_requested())
+
+            os.environ["SCAKS_MPI"] = "0"
+            self.assertFalse(mpi_requested())
+
+            del os.environ["OMPI_COMM_WORLD_SIZE"]
+            os.environ["SCAKS_MPI"] = "1"
+            self.assertTrue(mpi_requested())
+        finally:
+            os.environ.clear()
+            os.environ.update(env)
+
+    def test_mpi_not_requested(self):
+        " Make sure MPI is not initialized if it is not requested. "
+        env = dict(os.environ)
+        try:
+            for var in MPI_LAUNCHER_VARS + ("SCAKS_MPI", ):
+                os.environ.pop(var, None)
+            mpi_util = MPIUtil()
+            self.assertIsNone(mpi_util.MPI)
+            self.assertEqual(1, mpi_util.size)
+            self.assertFalse(mpi_initialized())
+        finally:
+            os.environ.clear()
+            os.environ.update(env)
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(MPICommonsTest)
+    unittest.TextTestRunner(verbosity=2).run(suite)
+
@@ -0,0 +1,64 @@
+import logging
+import os
+import threading
+import unittest
+
+from ...utilities.parallel_utilities import *
+
+from .. import LogCapture
+
+
+class ParallelUtilitiesTest(unittest.TestCase):
+
+    def setUp(self):
+        # Test case setting.
+        self.maxDiff = None
+
+    def test_imap_unordered(self):
+        " Test closures can be mapped in worker processes. "
+        offset = 10
+        f = lambda x: x + offset
+
+        results = dict(imap_unordered(f, [1, 2, 3, 4], processes=2))
+        self.assertDictEqual({0: 11, 1: 12, 2: 13, 3: 14}, results)
+
+        # Serial mapping.
+        results = dict(imap_unordered(f, [1, 2], processes=1))
+        self.assertDictEqual({0: 11, 1: 12}, results)
+
+    def test_no_fork_with_threads(self):
+        " Make sure processes are not forked when other threads are running. "
+        pid = os.getpid()
+
+        stop = threading.Event()
+        thread = threading.Thread(target=stop.wait)
+        thread.start()
+        try:
+            self.assertFalse(fork_available())
+            logger_name = "model.utilities.parallel_utilities"
+            with LogCapture(logger_name, level=logging.INFO) as cm:
+                results = dict(imap_unordered(lambda x: os.getpid(), [1, 2], processes=2))
+            self.assertDictEqual({0: pid, 1: pid}, results)
+
+            # Serial mapping is logged.
+            self.assertEqual(1, len(cm.output))
+            self.assertIn("2 threads are running", cm.output[0])
+        finally:
+            stop.set()
+            thread.join()
+
+    def test_cancel(self):
+        " Test pending items are cancelled when generator is closed. "
+        results = imap_unordered(lambda x: x, range(100), processes=2)
+        idx, result = next(results)
+        self.assertEqual(idx, result)
+        results.close()
+
+    def test_get_processes(self):
+        " Test number of processes can be got correctly. "
+        self.assertEqual(3, get_processes(3))
+        self.assertTrue(get_processes(0) >= 1)
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(ParallelUtilitiesTest)
+    unittest.TextTestRunner(verbosity=2).run(suite)
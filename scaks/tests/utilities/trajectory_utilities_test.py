@@ -0,0 +1,71 @@
+import os
+import unittest
+
+import numpy as np
+
+from ...errors.error import *
+from ...utilities.trajectory_utilities import *
+
+
+class TrajectoryUtilitiesTest(unittest.TestCase):
+
+    def setUp(self):
+        # Test case setting.
+        self.maxDiff = None
+        self.filename = "test_trajectory.traj"
+
+    def tearDown(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def test_write_read(self):
+        " Test trajectory can be written and read back correctly. "
+        names = ["CO_s", "O_s"]
+        times = np.linspace(0.0, 1.0, 11)
+        values = np.random.random((11, 2))
+
+        writer = TrajectoryWriter(self.filename, names, buffer_size=4)
+        writer.append(times[0], values[0])
+        writer.extend(times[1:], values[1:])
+
+        # Only full buffers are written before close.
+        traj = Trajectory(self.filename)
+        self.assertEqual(8, len(traj))
+
+        writer.close()
+        self.assertRaises(ValueError, writer.append, 1.1, [0.0, 0.0])
+
+        # Check.
+        traj = Trajectory(self.filename)
+        self.assertTupleEqual(tuple(names), traj.names)
+        self.assertEqual(11, len(traj))
+        self.assertTrue(np.array_equal(times, traj.times))
+        self.assertTrue(np.array_equal(values, traj.values))
+        self.assertTrue(np.array_equal(values[:, 1], traj.column("O_s")))
+        self.assertTrue(np.array_equal(values[::5], traj[::5, 1:]))
+        self.assertRaises(ParameterError, traj.column, "CO2_s")
+
+        ret_names, ret_times, ret_values = load_trajectory(self.filename, mmap=False)
+        self.assertTrue(np.array_equal(values, ret_values))
+
+    def test_partial_row(self):
+        " Test rows partially written are ignored. "
+        with TrajectoryWriter(self.filename, ["CO_s"]) as writer:
+            writer.append(0.0, [0.1])
+            writer.append(1.0, [0.2])
+        with open(self.filename, "ab") as f:
+            f.write(b"\0"*4)
+
+        traj = Trajectory(self.filename)
+        self.assertEqual(2, len(traj))
+        self.assertListEqual([0.1, 0.2], traj.values[:, 0].tolist())
+
+    def test_invalid_file(self):
+        " Test non-trajectory file is rejected. "
+        with open(self.filename, "wb") as f:
+            f.write(b"times = []\n")
+        self.assertRaises(IOError, Trajectory, self.filename)
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TrajectoryUtilitiesTest)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -1,8 +1,18 @@
 import unittest
 
+from .archive_utilities_test import ArchiveUtilitiesTest
+from .cache_utilities_test import CacheUtilitiesTest
+from .checkpoint_utilities_test import CheckpointUtilitiesTest
 from .coordinates_utilities_test import CoordinatesUtilitiesTest
+from .grid_utilities_test import GridUtilitiesTest
+from .import_utilities_test import ImportUtilitiesTest
+from .mpicommons_test import MPICommonsTest
+from .parallel_utilities_test import ParallelUtilitiesTest
+from .trajectory_utilities_test import TrajectoryUtilitiesTest
 
-util_test_cases = [CoordinatesUtilitiesTest]
+util_test_cases = [ArchiveUtilitiesTest, CacheUtilitiesTest, CheckpointUtilitiesTest,
+                   CoordinatesUtilitiesTest, GridUtilitiesTest, ImportUtilitiesTest,
+                   MPICommonsTest, ParallelUtilitiesTest, TrajectoryUtilitiesTest]
 
 def suite():
     suite = unittest.TestSuite(
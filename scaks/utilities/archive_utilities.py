@@ -0,0 +1,314 @@
+""" Module providing buffered archive of model data.
+
+An archive file is a sequence of pickled dicts. In 'snapshot' mode the file holds
+one dict of the latest values of all data and is replaced atomically on every flush,
+in 'append' mode every update is appended as a one-item dict so that all archived
+values are kept without rewriting the previous ones.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import weakref
+
+from ..compatutil import pickle, replace
+from ..errors.error import *
+
+# Writers to be closed at exit.
+_writers = weakref.WeakSet()
+
+
+class ArchiveWriter(object):
+    ''' Writer of archive with buffered updates, the updates are flushed to file
+    in a background thread periodically, or once enough updates are buffered.
+
+    :param filename: The archive file name
+    :type filename: str
+
+    :param mode: 'snapshot' to keep only the latest values or 'append' to keep
+        all values, default is 'snapshot'
+    :type mode: str
+
+    :param interval: Flush interval in seconds of the background thread, 0 for
+        no background flush, default is 1.0
+    :type interval: float
+
+    :param count: Number of buffered updates to trigger a flush, 0 for no
+        limit, default is 0
+    :type count: int
+
+    :param max_failures: Number of successive failed background flushes after
+        which buffered updates are dropped, default is 3
+    :type max_failures: int
+
+    .. note::
+        If interval is 0, flushes triggered by count are done in the thread
+        calling :obj:`update`. Buffered updates are always flushed when the
+        writer is closed or paused, or the interpreter exits.
+
+    Example::
+        >>> writer = ArchiveWriter("data.pkl", interval=5.0)
+        >>> writer.update("steady_state_coverages", [0.9, 0.1])
+        >>> writer.close()
+    '''
+    def __init__(self, filename, mode="snapshot", interval=1.0, count=0, max_failures=3):
+        if mode not in ("snapshot", "append"):
+            raise ParameterError("Unknown archive mode '{}'".format(mode))
+
+        self.filename = filename
+        self.mode = mode
+        self.interval = interval
+        self.count = count
+        self.max_failures = max_failures
+
+        self.__data = {}
+        self.__pending = []
+        self.__closed = False
+        self.__paused = False
+        self.__failures = 0
+
+        # Lock for buffers and lock for file writing.
+        self.__lock = threading.Lock()
+        self.__write_lock = threading.Lock()
+
+        self.__event = threading.Event()
+        self.__thread = None
+
+        # Set logger.
+        self.__logger = logging.getLogger("model.utilities.ArchiveWriter")
+
+        _writers.add(self)
+
+    def update(self, name, data):
+        """ Update data in archive.
+
+        :param name: Name of the data
+        :type name: str
+
+        :param data: The data to be archived, must be picklable
+        :type data: any
+        """
+        if self.__closed:
+            raise ValueError("Update closed archive {}.".format(self.filename))
+
+        with self.__lock:
+            self.__data[name] = data
+            self.__pending.append((name, data))
+            npending = len(self.__pending)
+
+            if self.interval > 0 and self.__thread is None:
+                self.__thread = threading.Thread(target=self.__flush_periodically)
+                self.__thread.daemon = True
+                self.__thread.start()
+
+        if self.count and npending >= self.count:
+            if self.interval > 0:
+                self.__event.set()
+            else:
+                self.flush()
+
+    def __flush_periodically(self):
+        """
+        Private helper function to flush buffered updates in background thread,
+        the thread exits once no update is buffered or the writer is paused.
+        """
+        try:
+            while True:
+                self.__event.wait(self.interval)
+                self.__event.clear()
+                self.__try_flush()
+
+                with self.__lock:
+                    if self.__closed or self.__paused or not self.__pending:
+                        self.__thread = None
+                        return
+        finally:
+            # Let next update start a new thread if this one died.
+            with self.__lock:
+                if self.__thread is threading.current_thread():
+                    self.__thread = None
+
+    def __try_flush(self):
+        """
+        Private helper function to flush buffered updates and log failures,
+        failed updates are kept and written in next flush, but dropped after
+        max_failures successive failures.
+        """
+        try:
+            self.flush()
+        except Exception as e:
+            self.__failures += 1
+            if self.__failures < self.max_failures:
+                self.__logger.warning("failed to flush archive %s: %s", self.filename, e)
+                return
+
+            self.__failures = 0
+            with self.__lock:
+                # Drop unpicklable updates, or all updates if they are not the cause.
+                pending = self.__pending
+                self.__pending = [(name, value) for name, value in pending
+                                  if _picklable(value)]
+                if len(self.__pending) == len(pending):
+                    self.__pending = []
+                ndropped = len(pending) - len(self.__pending)
+
+                # Unpicklable values would fail every following snapshot.
+                for name in set(name for name, _ in pending):
+                    if not _picklable(self.__data[name]):
+                        del self.__data[name]
+
+            self.__logger.error("failed to flush archive %s %d times, %d buffered " +
+                                "updates are dropped: %s",
+                                self.filename, self.max_failures, ndropped, e)
+        else:
+            self.__failures = 0
+
+    def flush(self):
+        """ Write buffered updates to file.
+        """
+        with self.__write_lock:
+            with self.__lock:
+                pending, self.__pending = self.__pending, []
+                data = dict(self.__data)
+
+            if not pending:
+                return
+
+            try:
+                self.__write(data, pending)
+            except:
+                # Keep the updates for next flush.
+                with self.__lock:
+                    self.__pending[:0] = pending
+                raise
+
+    def __write(self, data, pending):
+        """
+        Private helper function to write data or pending updates to file.
+        """
+        if self.mode == "snapshot":
+            # Write to a temporary file unique to this writer then replace the archive.
+            tmp_filename = "{}.{}.{}.tmp".format(self.filename, os.getpid(), id(self))
+            try:
+                with open(tmp_filename, "wb") as f:
+                    pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                    f.flush()
+                    os.fsync(f.fileno())
+                replace(tmp_filename, self.filename)
+            except:
+                if os.path.exists(tmp_filename):
+                    os.remove(tmp_filename)
+                raise
+        else:
+            with open(self.filename, "ab") as f:
+                for name, value in pending:
+                    pickle.dump({name: value}, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def close(self):
+        """ Stop background flush and write all buffered updates.
+        """
+        if self.__closed:
+            return
+
+        with self.__lock:
+            self.__closed = True
+            thread = self.__thread
+
+        if thread is not None:
+            self.__event.set()
+            thread.join()
+        self.flush()
+
+    def pause(self):
+        """ Stop background flush and write buffered updates, e.g. before
+        forking processes, the background thread is restarted by next update.
+        """
+        with self.__lock:
+            self.__paused = True
+            thread = self.__thread
+
+        try:
+            if thread is not None:
+                self.__event.set()
+                thread.join()
+        finally:
+            with self.__lock:
+                self.__paused = False
+        self.__try_flush()
+
+    @property
+    def data(self):
+        """ Query function for latest values of all archived data.
+        """
+        with self.__lock:
+            return dict(self.__data)
+
+
+def _picklable(value):
+    """
+    Private helper function to check if a value can be archived.
+    """
+    try:
+        pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return False
+    return True
+
+
+def close_archives():
+    """
+    Function to close all alive archive writers, called at exit.
+    """
+    for writer in list(_writers):
+        writer.close()
+
+atexit.register(close_archives)
+
+
+def pause_archives():
+    """
+    Function to stop background flush of all alive archive writers, so no
+    thread of writers is running when processes are forked.
+    """
+    for writer in list(_writers):
+        writer.pause()
+
+
+def load_archive_records(filename):
+    ''' Function to load all records in an archive file, the record partially
+    written at the end of file is ignored.
+
+    :param filename: The archive file name
+    :type filename: str
+
+    :return: Archived dicts in order of writing
+    :rtype: list of dict
+    '''
+    records = []
+    with open(filename, "rb") as f:
+        while True:
+            try:
+                records.append(pickle.load(f))
+            except (EOFError, pickle.UnpicklingError, ValueError):
+                break
+
+    return records
+
+
+def load_archive(filename):
+    ''' Function to load latest values of all data in an archive file.
+
+    :param filename: The archive file name
+    :type filename: str
+
+    :return: Latest values of data
+    :rtype: dict
+    '''
+    data = {}
+    for record in load_archive_records(filename):
+        data.update(record)
+
+    return data
@@ -0,0 +1,124 @@
+""" Module providing content-addressed on-disk cache of model data.
+
+A cache file is a pickled dict of all data derived from a reaction network,
+e.g. the parsed elementary reactions and the stoichiometry matrices. The file
+is named by the digest of a key which identifies everything the data depends
+on, so models constructed from the same network share the same file.
+"""
+
+import hashlib
+import logging
+import os
+
+from ..compatutil import pickle, makedirs, replace
+
+
+class ModelCache(object):
+    ''' On-disk cache of data derived from the reaction network of a model.
+
+    :param dirname: The cache directory, empty string for no on-disk cache
+    :type dirname: str
+
+    :param key: The key identifying everything the cached data depends on,
+        must have a stable repr
+    :type key: any
+
+    .. note::
+        If dirname is empty, data are built every time they are requested,
+        the callers are responsible for memoization.
+
+    Example::
+        >>> cache = ModelCache("./model_cache", ("0.1.0", ("CO_g + *_s -> CO_s", )))
+        >>> matrices = cache.get("stoichiometry_matrices", build_matrices)
+    '''
+    def __init__(self, dirname, key):
+        self.dirname = dirname
+        self.key = key
+
+        self.__entries = None
+
+        # Set logger.
+        self.__logger = logging.getLogger("model.utilities.ModelCache")
+
+    @property
+    def filename(self):
+        """ Query function for the cache file name, None if no on-disk cache.
+        """
+        if not self.dirname:
+            return None
+
+        digest = hashlib.sha1(repr(self.key).encode("utf-8")).hexdigest()
+        return os.path.join(self.dirname, "model_{}.pkl".format(digest))
+
+    def __load(self):
+        """
+        Private helper function to load all entries in cache file.
+        """
+        filename = self.filename
+        if not os.path.exists(filename):
+            return {}
+
+        try:
+            with open(filename, "rb") as f:
+                entries = pickle.load(f)
+        except Exception as e:
+            self.__logger.warning("failed to load model cache %s: %s", filename, e)
+            return {}
+
+        # Make sure the file is not a hash collision.
+        if entries.pop("__key__", None) != self.key:
+            self.__logger.warning("key of model cache %s mismatch, ignored.", filename)
+            return {}
+
+        return entries
+
+    def __save(self, name, value):
+        """
+        Private helper function to add an entry to cache file.
+        """
+        filename = self.filename
+
+        # Merge entries written by other processes.
+        entries = self.__load()
+        entries[name] = value
+        entries["__key__"] = self.key
+
+        # Write to a temporary file then rename it, other processes may write the same file.
+        try:
+            if not os.path.exists(self.dirname):
+                makedirs(self.dirname)
+            tmp_filename = "{}.{}.tmp".format(filename, os.getpid())
+            with open(tmp_filename, "wb") as f:
+                pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+            replace(tmp_filename, filename)
+        except (OSError, pickle.PicklingError) as e:
+            self.__logger.warning("failed to write model cache %s: %s", filename, e)
+
+    def get(self, name, builder):
+        """ Get cached data, build and cache it if not found.
+
+        :param name: The name of the data
+        :type name: str
+
+        :param builder: The function without argument to build the data
+        :type builder: function
+        """
+        if not self.dirname:
+            return builder()
+
+        if self.__entries is None:
+            self.__entries = self.__load()
+
+        try:
+            return self.__entries[name]
+        except KeyError:
+            self.__logger.debug("building %s for model cache", name)
+            value = builder()
+            self.__entries[name] = value
+            self.__save(name, value)
+            return value
+
+    def __contains__(self, name):
+        if self.__entries is None:
+            self.__entries = self.__load() if self.dirname else {}
+        return name in self.__entries
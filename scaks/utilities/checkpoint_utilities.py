@@ -0,0 +1,206 @@
+""" Module providing append-only checkpoint stores of completed calculations.
+
+A checkpoint file is a sequence of pickled :obj:`(key, record)` pairs, records are
+appended in batches and synced to disk, so a file is always readable up to the
+last complete batch even if the process is killed while writing. A checkpoint
+directory also holds a header describing the model and conditions shared by
+all records in it.
+"""
+
+import glob
+import hashlib
+import os
+
+import numpy as np
+
+from ..compatutil import pickle
+from ..errors.error import *
+
+
+class CheckpointWriter(object):
+    ''' Writer of checkpoint records with a batch buffer, records are appended
+    to file when the buffer is full or when flushed.
+
+    :param filename: The checkpoint file name, records are appended if it exists
+    :type filename: str
+
+    :param batch_size: Max number of records held in memory, default is 20
+    :type batch_size: int
+
+    Example::
+        >>> with CheckpointWriter("./checkpoints/rank0_1234.ckpt") as writer:
+        ...     writer.append((0.5, 450.0), {"coverages": [0.9, 0.1]})
+    '''
+    def __init__(self, filename, batch_size=20):
+        if batch_size < 1:
+            raise ParameterError("Batch size of checkpoint must be positive.")
+
+        self.filename = filename
+        self.batch_size = batch_size
+        self.__batch = []
+        self.__closed = False
+
+    def append(self, key, record):
+        """ Append a record to checkpoint.
+
+        :param key: The key of the record, must be hashable and picklable
+        :type key: any
+
+        :param record: The record of a completed calculation
+        :type record: any
+        """
+        if self.__closed:
+            raise ValueError("Append to closed checkpoint {}.".format(self.filename))
+
+        self.__batch.append((key, record))
+        if len(self.__batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """ Write all buffered records to file and sync it to disk.
+        """
+        if self.__batch:
+            with open(self.filename, "ab") as f:
+                for key_record in self.__batch:
+                    pickle.dump(key_record, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            self.__batch = []
+
+    def close(self):
+        """ Flush the buffer and close the writer.
+        """
+        if not self.__closed:
+            self.flush()
+            self.__closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def load_checkpoint(filename):
+    ''' Function to load records in a checkpoint file, the record partially
+    written at the end of file is ignored.
+
+    :param filename: The checkpoint file name
+    :type filename: str
+
+    :return: Records in the file, later records override earlier ones with the same key
+    :rtype: dict
+    '''
+    records = {}
+    with open(filename, "rb") as f:
+        while True:
+            try:
+                key, record = pickle.load(f)
+            except (EOFError, pickle.UnpicklingError, ValueError):
+                break
+            records[key] = record
+
+    return records
+
+
+def load_checkpoints(dirname):
+    ''' Function to load records in all checkpoint files in a directory.
+
+    :param dirname: The checkpoint directory name
+    :type dirname: str
+
+    :return: Records in all files, empty if the directory does not exist
+    :rtype: dict
+    '''
+    records = {}
+    for filename in sorted(glob.glob(os.path.join(dirname, "*.ckpt"))):
+        records.update(load_checkpoint(filename))
+
+    return records
+
+
+def checkpoint_filename(dirname, rank=0):
+    ''' Function to get the checkpoint file name of current process.
+
+    :param dirname: The checkpoint directory name
+    :type dirname: str
+
+    :param rank: The MPI rank of current process, default is 0
+    :type rank: int
+    '''
+    return os.path.join(dirname, "rank{}_{}.ckpt".format(rank, os.getpid()))
+
+
+# File name of checkpoint header in checkpoint directory.
+header_filename = "header.pkl"
+
+
+def _canonical_repr(obj):
+    """
+    Private helper function to get a representation of object independent of
+    dict ordering and numeric types.
+    """
+    if isinstance(obj, dict):
+        items = sorted("{}: {}".format(_canonical_repr(key), _canonical_repr(value))
+                       for key, value in obj.items())
+        return "{" + ", ".join(items) + "}"
+    elif isinstance(obj, (list, tuple, np.ndarray)):
+        return "[" + ", ".join(_canonical_repr(item) for item in obj) + "]"
+    elif isinstance(obj, (float, np.floating)):
+        return repr(float(obj))
+    else:
+        return repr(obj)
+
+
+def fingerprint(obj):
+    ''' Function to get the fingerprint of an object of nested dicts, lists
+    and numbers, which are identical for equal contents.
+
+    :param obj: The object
+    :type obj: any
+
+    :return: The SHA1 hex digest
+    :rtype: str
+
+    Example::
+        >>> fingerprint({"Gaf": [0.0, 1.25], "Gar": [0.758, 0.926]})
+    '''
+    return hashlib.sha1(_canonical_repr(obj).encode("utf-8")).hexdigest()
+
+
+def write_checkpoint_header(dirname, header):
+    ''' Function to write the header of a checkpoint directory.
+
+    :param dirname: The checkpoint directory name
+    :type dirname: str
+
+    :param header: Description of the model and conditions shared by all records
+    :type header: dict
+    '''
+    with open(os.path.join(dirname, header_filename), "wb") as f:
+        pickle.dump(dict(fingerprint=fingerprint(header), header=header), f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def match_checkpoint_header(dirname, header):
+    ''' Function to check whether records in a checkpoint directory are
+    computed for the model and conditions described by the header.
+
+    :param dirname: The checkpoint directory name
+    :type dirname: str
+
+    :param header: Description of the model and conditions shared by all records
+    :type header: dict
+
+    :return: True if the header of directory matches, or the directory has no
+        header and no records
+    :rtype: bool
+    '''
+    filename = os.path.join(dirname, header_filename)
+    if not os.path.exists(filename):
+        return not glob.glob(os.path.join(dirname, "*.ckpt"))
+
+    with open(filename, "rb") as f:
+        stored = pickle.load(f)
+
+    return stored["fingerprint"] == fingerprint(header)
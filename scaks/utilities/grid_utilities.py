@@ -0,0 +1,59 @@
+""" Module providing utilities for walking through grids of conditions.
+"""
+
+
+def snake_path(shape):
+    """ Function to get all indices of a grid along a snake (boustrophedon)
+    path, two successive indices differ by one in only one dimension.
+
+    :param shape: The shape of the grid
+    :type shape: tuple of int
+
+    :return: Indices of all grid points in order of the path
+    :rtype: list of tuple of int
+
+    Example::
+        >>> snake_path((2, 3))
+        [(0, 0), (0, 1), (0, 2), (1, 2), (1, 1), (1, 0)]
+    """
+    if not shape:
+        return [()]
+
+    inner_path = snake_path(shape[1:])
+    path = []
+    for i in range(shape[0]):
+        # Go back along the inner path in odd rows.
+        inner = inner_path if i % 2 == 0 else inner_path[::-1]
+        path.extend((i, ) + idx for idx in inner)
+
+    return path
+
+
+def split_path(path, n):
+    """ Function to split a path into at most n contiguous segments
+    with almost equal lengths.
+
+    :param path: The path to be split
+    :type path: list
+
+    :param n: The number of segments
+    :type n: int
+
+    :return: Non-empty segments of the path
+    :rtype: list of list
+
+    Example::
+        >>> split_path(list(range(5)), 2)
+        [[0, 1, 2], [3, 4]]
+    """
+    n = max(1, min(n, len(path)))
+    size, remainder = divmod(len(path), n)
+
+    segments = []
+    start = 0
+    for i in range(n):
+        end = start + size + (1 if i < remainder else 0)
+        segments.append(path[start: end])
+        start = end
+
+    return [segment for segment in segments if segment]
@@ -0,0 +1,63 @@
+""" Module providing deferred imports of heavy or optional dependencies.
+
+Heavy packages such as sympy are only needed by part of the API, a
+:obj:`LazyModule` proxy imports them at the first attribute access so that
+importing scaks stays cheap. Optional packages such as KMCLib are imported
+by :obj:`import_optional` when the feature using them is requested.
+"""
+
+import importlib
+import logging
+
+# Names of missing optional modules which have been warned.
+_warned_modules = set()
+
+
+class LazyModule(object):
+    ''' Proxy of a module which is imported at the first attribute access.
+
+    :param name: The full name of the module
+    :type name: str
+
+    Example::
+        >>> sym = LazyModule("sympy")  # sympy is not imported yet
+        >>> x = sym.Symbol("x")        # sympy is imported here
+    '''
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        # Only called for attributes not found in proxy.
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        status = "imported" if self._module is not None else "not imported"
+        return "<lazy module '{}' ({})>".format(self._name, status)
+
+
+def import_optional(name, feature, package=None):
+    ''' Function to import an optional module, a warning is logged only once
+    if the module is not installed.
+
+    :param name: The name of the module, relative name if package is given
+    :type name: str
+
+    :param feature: Description of the feature depending on the module
+    :type feature: str
+
+    :param package: The anchor package of relative name, default is None
+    :type package: str
+
+    :return: The module, None if it is not installed
+    '''
+    try:
+        return importlib.import_module(name, package)
+    except ImportError:
+        if name not in _warned_modules:
+            _warned_modules.add(name)
+            logger = logging.getLogger("model.utilities.import_utilities")
+            logger.warning("%s is not installed, %s will be disabled.", name, feature)
+        return None
@@ -0,0 +1,137 @@
+""" Module providing utilities for process-level parallelism on a single node.
+"""
+
+import logging
+import multiprocessing
+import sys
+import threading
+
+from ..compatutil import cpu_count, fork_context
+from .archive_utilities import pause_archives
+
+# Function shared with forked worker processes.
+_shared_function = None
+
+
+def mpi_initialized():
+    """ Function to check whether MPI has been initialized in current process.
+
+    .. note::
+        mpi4py is not imported here, only a loaded mpi4py.MPI is checked.
+    """
+    MPI = sys.modules.get("mpi4py.MPI")
+    if MPI is None:
+        return False
+    return MPI.Is_initialized() and not MPI.Is_finalized()
+
+
+def fork_available():
+    """ Function to check whether worker processes can be forked here.
+
+    .. note::
+        Daemonic processes (workers of another pool) are not allowed to have
+        children, and platforms without `fork` can not share closures.
+        Processes with MPI initialized or other threads running are never
+        forked, since the children would inherit MPI resources and locks held
+        by other threads. Background threads of archive writers are stopped
+        by :obj:`imap_unordered` before the check.
+    """
+    return _fork_blocker() is None
+
+
+def _fork_blocker():
+    """
+    Private helper function to get the reason why worker processes can not
+    be forked, None if they can be forked.
+    """
+    if fork_context() is None:
+        return "fork is not supported"
+    if multiprocessing.current_process().daemon:
+        return "current process is a daemonic worker"
+    if mpi_initialized():
+        return "MPI is initialized"
+    if threading.active_count() > 1:
+        return "{} threads are running".format(threading.active_count())
+    return None
+
+
+def get_processes(processes=0):
+    """ Function to get the number of worker processes.
+
+    :param processes: Number of processes wanted, 0 for the number of CPUs.
+    :type processes: int
+    """
+    if processes > 0:
+        return processes
+    return cpu_count()
+
+
+def _call_shared_function(args):
+    """
+    Private helper function to call the shared function in a worker process.
+    """
+    idx, item = args
+    return idx, _shared_function(item)
+
+
+def imap_unordered(func, iterable, processes=0):
+    """ Generator to map a function over items in a pool of forked processes,
+    results are yielded as soon as they are available.
+
+    :param func: The function to be mapped, closures and lambdas are allowed
+        since workers are forked from current process.
+    :type func: function
+
+    :param iterable: Items passed to the function, must be picklable.
+    :type iterable: iterable
+
+    :param processes: Number of worker processes, 0 for the number of CPUs.
+    :type processes: int
+
+    :return: Pairs of item index and result, in order of completion.
+
+    .. note::
+        Closing the generator (e.g. break in a for loop) terminates the pool
+        and cancels all pending items. Items are mapped serially if only one
+        process is used or processes can not be forked, see :obj:`fork_available`,
+        the reason is logged at info level in the latter case.
+
+    Example::
+        >>> for idx, result in imap_unordered(lambda x: x**2, range(4)):
+        ...     if result > 3:
+        ...         break
+    """
+    global _shared_function
+
+    items = list(iterable)
+    processes = min(get_processes(processes), len(items))
+
+    # Background threads of archive writers would prevent forking.
+    if processes > 1:
+        pause_archives()
+
+    blocker = _fork_blocker() if processes > 1 else None
+    if blocker is not None:
+        logger = logging.getLogger("model.utilities.parallel_utilities")
+        logger.info("%d processes are requested but items are mapped serially: %s.",
+                    processes, blocker)
+
+    if processes <= 1 or blocker is not None:
+        for idx, item in enumerate(items):
+            yield idx, func(item)
+        return
+
+    # Workers are forked at pool creation and inherit the shared function,
+    # so the previous one can be restored at once for nested usage.
+    previous_function, _shared_function = _shared_function, func
+    try:
+        pool = fork_context().Pool(processes)
+    finally:
+        _shared_function = previous_function
+
+    try:
+        for idx, result in pool.imap_unordered(_call_shared_function, enumerate(items)):
+            yield idx, result
+    finally:
+        pool.terminate()
+        pool.join()
@@ -0,0 +1,206 @@
+""" Module providing binary append-only trajectory store.
+
+A trajectory file consists of a small header and float64 rows of
+:obj:`[time, value_1, ..., value_n]`::
+
+    | magic (8 bytes) | header length (uint32) | JSON header | padding | rows ... |
+
+The JSON header holds names of the columns after time, the data is padded
+to 8 bytes boundary so that it can be memory-mapped directly.
+"""
+
+import json
+import os
+import struct
+
+import numpy as np
+
+from ..errors.error import *
+
+MAGIC = b"SCAKSTRJ"
+VERSION = 1
+DTYPE = np.dtype("<f8")
+
+
+class TrajectoryWriter(object):
+    ''' Writer of binary trajectory with bounded buffer, rows are appended
+    to file when the buffer is full or when flushed.
+
+    :param filename: The trajectory file name
+    :type filename: str
+
+    :param names: Names of values in each row, e.g. adsorbate names
+    :type names: list of str
+
+    :param buffer_size: Max number of rows held in memory, default is 500
+    :type buffer_size: int
+
+    Example::
+        >>> with TrajectoryWriter("auto_ode_coverages.traj", ["CO_s", "O_s"]) as writer:
+        ...     writer.append(0.1, [0.5, 0.2])
+    '''
+    def __init__(self, filename, names, buffer_size=500):
+        if buffer_size < 1:
+            raise ParameterError("Buffer size of trajectory must be positive.")
+
+        self.filename = filename
+        self.names = tuple(names)
+        self.__buffer = np.empty((buffer_size, len(self.names) + 1), dtype=DTYPE)
+        self.__nbuffered = 0
+        self.__closed = False
+
+        # Write header, overwrite existing file.
+        header = json.dumps(dict(version=VERSION, names=self.names, dtype=DTYPE.str))
+        header = header.encode("utf-8")
+        offset = len(MAGIC) + 4 + len(header)
+        header += b" "*(-offset % DTYPE.itemsize)
+        with open(filename, "wb") as f:
+            f.write(MAGIC + struct.pack("<I", len(header)) + header)
+
+    def append(self, time, values):
+        """ Append a row to trajectory.
+
+        :param time: The time
+        :type time: float
+
+        :param values: Values in order of names
+        :type values: list of float
+        """
+        if self.__closed:
+            raise ValueError("Append to closed trajectory {}.".format(self.filename))
+
+        row = self.__buffer[self.__nbuffered]
+        row[0] = time
+        row[1:] = [float(value) for value in values]
+        self.__nbuffered += 1
+
+        if self.__nbuffered == len(self.__buffer):
+            self.flush()
+
+    def extend(self, times, values):
+        """ Append multiple rows to trajectory.
+
+        :param times: Times of rows
+        :type times: list of float
+
+        :param values: Values of rows
+        :type values: list of list of float
+        """
+        for time, row_values in zip(times, values):
+            self.append(time, row_values)
+
+    def flush(self):
+        """ Write all buffered rows to file.
+        """
+        if self.__nbuffered:
+            with open(self.filename, "ab") as f:
+                f.write(self.__buffer[:self.__nbuffered].tobytes())
+            self.__nbuffered = 0
+
+    def close(self):
+        """ Flush the buffer and close the writer.
+        """
+        if not self.__closed:
+            self.flush()
+            self.__closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class Trajectory(object):
+    ''' Reader of binary trajectory, the data is memory-mapped and only the
+    rows sliced are loaded into memory.
+
+    :param filename: The trajectory file name
+    :type filename: str
+
+    :param mmap: Memory-map the data or load it all, default is True
+    :type mmap: bool
+
+    Example::
+        >>> traj = Trajectory("auto_ode_coverages.traj")
+        >>> traj.times[-1], traj.values[-1]
+        >>> traj.column("CO_s")[::1000]
+    '''
+    def __init__(self, filename, mmap=True):
+        self.filename = filename
+
+        with open(filename, "rb") as f:
+            magic = f.read(len(MAGIC))
+            if magic != MAGIC:
+                raise IOError("{} is not a trajectory file.".format(filename))
+            header_length, = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(header_length).decode("utf-8"))
+
+        self.names = tuple(header["names"])
+        dtype = np.dtype(header["dtype"])
+        ncols = len(self.names) + 1
+        offset = len(MAGIC) + 4 + header_length
+
+        # Rows partially written are ignored.
+        nrows = (os.path.getsize(filename) - offset)//(dtype.itemsize*ncols)
+
+        if nrows == 0:
+            self.__data = np.empty((0, ncols), dtype=dtype)
+        elif mmap:
+            self.__data = np.memmap(filename, dtype=dtype, mode="r",
+                                    offset=offset, shape=(nrows, ncols))
+        else:
+            with open(filename, "rb") as f:
+                f.seek(offset)
+                self.__data = np.fromfile(f, dtype=dtype, count=nrows*ncols)
+            self.__data = self.__data.reshape(nrows, ncols)
+
+    def __len__(self):
+        return self.__data.shape[0]
+
+    def __getitem__(self, index):
+        return self.__data[index]
+
+    @property
+    def data(self):
+        """ Query function for all rows, n x (1 + len(names)) array.
+        """
+        return self.__data
+
+    @property
+    def times(self):
+        """ Query function for times of all rows.
+        """
+        return self.__data[:, 0]
+
+    @property
+    def values(self):
+        """ Query function for values of all rows, n x len(names) array.
+        """
+        return self.__data[:, 1:]
+
+    def column(self, name):
+        """ Function to get values of a name in all rows.
+
+        :param name: The name of the column
+        :type name: str
+        """
+        if name not in self.names:
+            raise ParameterError("{} is not in trajectory {}.".format(name, self.filename))
+        return self.__data[:, self.names.index(name) + 1]
+
+
+def load_trajectory(filename, mmap=True):
+    ''' Function to load times and values of a binary trajectory.
+
+    :param filename: The trajectory file name
+    :type filename: str
+
+    :param mmap: Memory-map the data or load it all, default is True
+    :type mmap: bool
+
+    :return: Names, times and values
+    :rtype: tuple
+    '''
+    traj = Trajectory(filename, mmap=mmap)
+    return traj.names, traj.times, traj.values
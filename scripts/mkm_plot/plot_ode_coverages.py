@@ -1,5 +1,5 @@
 '''
-    Module to plot ODE trajectory data in auto_ode_coverages.py
+    Module to plot ODE trajectory data in auto_ode_coverages.traj
 '''
 
 import sys
@@ -7,25 +7,28 @@ import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+from scaks.utilities.trajectory_utilities import Trajectory
+
 if len(sys.argv) > 1:
     adsorbate_names = sys.argv[1: ]
 else:
     adsorbate_names = []
 
-globs, locs = {}, {}
-exec(open('auto_ode_coverages.py', "rb").read(), globs, locs)
-times, coverages = locs['times'], locs['coverages']
+traj = Trajectory('auto_ode_coverages.traj')
 
-# check args number
-if adsorbate_names and len(adsorbate_names) != len(coverages[0]):
-    print("args do not match coverges in auto_ode_coverages.py")
+# check args
+if adsorbate_names and not set(adsorbate_names).issubset(traj.names):
+    print("args do not match adsorbates in auto_ode_coverages.traj")
     sys.exit(1)
 
+# At most 10000 points are plotted.
+stride = max(len(traj)//10000, 1)
+times, coverages = traj.times[::stride], traj.values[::stride]
+
 # plot
 fig = plt.figure()
 ax = fig.add_subplot(111)
 
-coverages = np.array(coverages)
 CO_cvgs = coverages[:, 0]
 O_cvgs = coverages[:, 1]
 Vac_cvgs = np.ones(len(coverages)) - CO_cvgs - O_cvgs
@@ -46,7 +46,8 @@ if "__main__" == __name__:
         solver.get_data()
 
         # Initial coverages guess.
-        trajectory = solver.solve_ode(time_span=OdeInterval,
+        trajectory = solver.solve_ode(algo="BDF",
+                                      time_span=OdeInterval,
                                       time_end=OdeEnd,
                                       traj_output=OdeOutput)
         init_guess = trajectory[-1]